@@ -0,0 +1,158 @@
+"""
+Benchmark of the canvas with large designs. For every number of components it measures:
+    - how long adding the components takes
+    - how long painting the view takes, zoomed in on a part of the design and zoomed out to all of it
+    - how long finding the items under a point takes
+    - how long a step of dragging a component past the edge of the design takes
+
+with the components added one at a time and the default scene tuning against the components added
+in one bulk operation and the large-design tuning.
+
+Run from the base directory of the repository:
+    $ python benchmarks/canvas_benchmark.py
+
+Without a display, run it with `QT_QPA_PLATFORM=offscreen`. Other numbers of components can be given as arguments:
+    $ python benchmarks/canvas_benchmark.py 1000 20000
+
+A canvas of 100k resistors takes a few gigabytes of memory.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from PyQt6.QtGui import QImage, QPainter  # noqa: E402
+from PyQt6.QtCore import QEvent, QPointF  # noqa: E402
+
+# spacing of the components on the canvas
+SPACING = 100
+# number of points looked up for the hit-test time
+HIT_TESTS = 2000
+# number of paints averaged for the paint time
+PAINTS = 3
+# number of steps averaged for the drag time
+DRAG_STEPS = 50
+# numbers of components measured, unless others are given on the command line
+ITEM_COUNTS = [int(count) for count in sys.argv[1:]] or [1_000, 10_000, 100_000]
+
+
+def createCanvas(itemCount: int, largeDesign: bool):
+    """
+    A function that creates a canvas with the given number of resistors laid out in a square grid.
+
+    Params:
+        itemCount: int - the number of resistors
+        largeDesign: bool - True to add the resistors in one bulk operation and tune the canvas for large designs.
+            they are added one at a time, with the default tuning, otherwise
+
+    Returns:
+        A tuple of the canvas and the time taken to add the resistors, in seconds
+    """
+    from MainWindow.canvas import Canvas
+    from components import getComponentSpec
+
+    canvas = Canvas()
+    canvas.resize(1200, 800)
+    resistor = getComponentSpec("Resistor").loadClass()
+    columns = int(itemCount ** 0.5) + 1
+
+    def addResistors():
+        for count in range(itemCount):
+            component = resistor(compCount=count)
+            component.setPos((count % columns) * SPACING, (count // columns) * SPACING)
+            canvas.scene().addItem(component)
+            canvas.components[component.uniqueID] = component
+
+    start = time.perf_counter()
+    if largeDesign:
+        with canvas.bulkOperation():
+            addResistors()
+        canvas.setLargeDesignMode(True)
+    else:
+        addResistors()
+    # let the scene handle the changes the way the event loop of the app would, then build the index with a first lookup
+    QApplication.processEvents()
+    canvas.scene().items(QPointF(0, 0))
+    return canvas, time.perf_counter() - start
+
+
+def paintTime(canvas) -> float:
+    """
+    A function that returns the average time painting the view takes, in milliseconds
+    """
+    image = QImage(canvas.viewport().size(), QImage.Format.Format_ARGB32_Premultiplied)
+    start = time.perf_counter()
+    for _ in range(PAINTS):
+        painter = QPainter(image)
+        canvas.render(painter)
+        painter.end()
+    return (time.perf_counter() - start) / PAINTS * 1e3
+
+
+def hitTestTime(canvas, itemCount: int) -> float:
+    """
+    A function that returns the average time finding the items under a random point of the design takes, in microseconds
+    """
+    scene = canvas.scene()
+    side = (int(itemCount ** 0.5) + 1) * SPACING
+    randomGenerator = random.Random(0)
+    points = [
+        QPointF(randomGenerator.uniform(0, side), randomGenerator.uniform(0, side))
+        for _ in range(HIT_TESTS)
+    ]
+    start = time.perf_counter()
+    for point in points:
+        scene.items(point)
+    return (time.perf_counter() - start) / HIT_TESTS * 1e6
+
+
+def dragTime(canvas) -> float:
+    """
+    A function that returns the average time a step of dragging a component past the edge of the design takes,
+    with the lookup of the items under the mouse that follows it, in milliseconds
+    """
+    scene = canvas.scene()
+    component = next(iter(canvas.components.values()))
+    start = time.perf_counter()
+    for step in range(1, DRAG_STEPS + 1):
+        position = QPointF(-step * SPACING, -step * SPACING)
+        canvas.setComponentPosition(component.uniqueID, position)
+        QApplication.processEvents()
+        scene.items(position)
+    return (time.perf_counter() - start) / DRAG_STEPS * 1e3
+
+
+def main():
+    app = QApplication(sys.argv[:1])
+
+    print(
+        f"{'items':>8} {'mode':>8} {'add (s)':>9} {'paint 1:1 (ms)':>15} "
+        f"{'paint all (ms)':>15} {'hit test (us)':>14} {'drag (ms)':>10}"
+    )
+    for itemCount in ITEM_COUNTS:
+        for largeDesign in (False, True):
+            canvas, addTime = createCanvas(itemCount, largeDesign)
+            hitTest = hitTestTime(canvas, itemCount)
+            canvas.centerOn(canvas.scene().itemsBoundingRect().center())
+            paintZoomedIn = paintTime(canvas)
+            canvas.zoomToFit()
+            paintAll = paintTime(canvas)
+            drag = dragTime(canvas)
+            print(
+                f"{itemCount:>8} {'large' if largeDesign else 'default':>8} {addTime:>9.2f} "
+                f"{paintZoomedIn:>15.1f} {paintAll:>15.1f} {hitTest:>14.1f} {drag:>10.2f}"
+            )
+            # free the items before the next canvas is created
+            canvas.shutdown()
+            canvas.components.clear()
+            canvas.scene().clear()
+            canvas.deleteLater()
+            app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+if __name__ == "__main__":
+    main()
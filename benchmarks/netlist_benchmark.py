@@ -0,0 +1,210 @@
+"""
+Benchmark of the two ways the simulator can build the SPICE netlist of a circuit:
+    - building a PySpice `Circuit` element by element and serialising it
+    - writing the netlist text straight from the components information
+
+and of a chain of voltage dividers written as flat resistors against the same chain written as block instances,
+and of how far the chain of dividers shrinks when the circuit is reduced before it's solved,
+and of the memory the components information takes against the columnar netlist table of the same ladder.
+
+Run from the base directory of the repository:
+    $ python benchmarks/netlist_benchmark.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from SimulationBackend.circuit_simulator import CircuitSimulator  # noqa: E402
+from SimulationBackend.circuit_reducer import CircuitReducer  # noqa: E402
+from SimulationBackend.netlist_table import NetlistTable  # noqa: E402
+
+
+def createLadderComponentsInfo(resistorCount: int):
+    """
+    A function that creates the components information of a resistor ladder driven by a single voltage source.
+
+    Params:
+        resistorCount: int - the number of resistors in the ladder
+
+    Returns:
+        A tuple of the components information and the ground nodes
+    """
+    componentsInfo = {
+        "VoltageSource-0": {
+            "type": "VoltageSource",
+            "data": {"V": ["10.00", "V"]},
+            "node1": "CircuitNode-1",
+            "node2": "CircuitNode-0",
+        }
+    }
+    for i in range(resistorCount):
+        componentsInfo[f"Resistor-{i}"] = {
+            "type": "Resistor",
+            "data": {"R": [f"{(i % 100) + 1:.2f}", "kOhm"]},
+            "node1": f"CircuitNode-{i + 1}",
+            "node2": f"CircuitNode-{i + 2}" if i % 2 == 0 else "CircuitNode-0",
+        }
+    return componentsInfo, ["CircuitNode-0"]
+
+
+def createDividerChainComponentsInfo(dividerCount: int, blocks: bool):
+    """
+    A function that creates the components information of a chain of voltage dividers driven by a single voltage source.
+
+    Params:
+        dividerCount: int - the number of dividers in the chain
+        blocks: bool - use instances of the VoltageDivider block when True, two resistors per divider otherwise
+
+    Returns:
+        A tuple of the components information and the ground nodes
+    """
+    componentsInfo = {
+        "VoltageSource-0": {
+            "type": "VoltageSource",
+            "data": {"V": ["10.00", "V"]},
+            "node1": "CircuitNode-1",
+            "node2": "CircuitNode-0",
+        }
+    }
+    for i in range(dividerCount):
+        inputNode, outputNode = f"CircuitNode-{i + 1}", f"CircuitNode-{i + 2}"
+        if blocks:
+            componentsInfo[f"VoltageDivider-{i}"] = {
+                "type": "VoltageDivider",
+                "data": {},
+                "node1": inputNode,
+                "node2": outputNode,
+                "node3": "CircuitNode-0",
+            }
+            continue
+        componentsInfo[f"Resistor-{2 * i}"] = {
+            "type": "Resistor",
+            "data": {"R": ["10.00", "kOhm"]},
+            "node1": inputNode,
+            "node2": outputNode,
+        }
+        componentsInfo[f"Resistor-{2 * i + 1}"] = {
+            "type": "Resistor",
+            "data": {"R": ["10.00", "kOhm"]},
+            "node1": outputNode,
+            "node2": "CircuitNode-0",
+        }
+    return componentsInfo, ["CircuitNode-0"]
+
+
+def allocatedBy(function) -> float:
+    """
+    A function that returns the megabytes still allocated by what the given function returns
+    """
+    tracemalloc.start()
+    result = function()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return allocated / 1e6
+
+
+def timeIt(function, repeat: int = 3) -> float:
+    """
+    A function that returns the best wall clock time of a few calls of the given function
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'resistors':>10} {'PySpice (s)':>12} {'writer (s)':>12} {'speedup':>8}")
+    for resistorCount in (100, 1_000, 10_000, 50_000):
+        componentsInfo, GNDNodes = createLadderComponentsInfo(resistorCount)
+        for currentProbes in (True, False):
+            simulator = CircuitSimulator.fromComponentsInfo(
+                componentsInfo, GNDNodes, currentProbes=currentProbes
+            )
+            pySpiceNetlist = str(simulator.createPySpiceCircuit())
+            writerNetlist = (
+                "\n".join(simulator.createNetlist().iterCircuitLines()) + "\n"
+            )
+            # both paths must hand the exact same circuit to ngspice
+            assert pySpiceNetlist == writerNetlist, "netlists differ"
+
+        simulator = CircuitSimulator.fromComponentsInfo(componentsInfo, GNDNodes)
+
+        pySpiceTime = timeIt(lambda: str(simulator.createPySpiceCircuit()))
+        writerTime = timeIt(lambda: simulator.createNetlist().toString())
+        print(
+            f"{resistorCount:>10} {pySpiceTime:>12.4f} {writerTime:>12.4f} "
+            f"{pySpiceTime / writerTime:>7.1f}x"
+        )
+
+    print()
+    print(
+        f"{'dividers':>10} {'flat lines':>12} {'block lines':>12} "
+        f"{'flat (s)':>10} {'block (s)':>10}"
+    )
+    for dividerCount in (100, 1_000, 10_000, 50_000):
+        # number of netlist lines of the flat and the block versions of the chain
+        netlists = {}
+        times = {}
+        for blocks in (False, True):
+            componentsInfo, GNDNodes = createDividerChainComponentsInfo(
+                dividerCount, blocks
+            )
+            simulator = CircuitSimulator.fromComponentsInfo(
+                componentsInfo, GNDNodes, currentProbes=False
+            )
+            netlists[blocks] = simulator.createNetlist().toString().count("\n")
+            times[blocks] = timeIt(lambda: simulator.createNetlist().toString())
+        print(
+            f"{dividerCount:>10} {netlists[False]:>12} {netlists[True]:>12} "
+            f"{times[False]:>10.4f} {times[True]:>10.4f}"
+        )
+
+    print()
+    print(
+        f"{'dividers':>10} {'elements':>10} {'reduced':>8} "
+        f"{'reduce (s)':>11} {'rebuild (s)':>12}"
+    )
+    for dividerCount in (100, 1_000, 10_000, 50_000):
+        componentsInfo, GNDNodes = createDividerChainComponentsInfo(dividerCount, False)
+        reduction = CircuitReducer(componentsInfo, GNDNodes).reduce()
+        reduceTime = timeIt(lambda: CircuitReducer(componentsInfo, GNDNodes).reduce())
+        # the reduced chain is a single resistor across the source
+        solvedVoltages = {"CircuitNode-1": 10.0}
+        rebuildTime = timeIt(lambda: reduction.reconstruct(solvedVoltages, {}))
+        print(
+            f"{dividerCount:>10} {len(componentsInfo):>10} {len(reduction.componentsInfo):>8} "
+            f"{reduceTime:>11.4f} {rebuildTime:>12.4f}"
+        )
+
+    print()
+    print(
+        f"{'resistors':>10} {'dicts (MB)':>11} {'table (MB)':>11} "
+        f"{'load (s)':>9} {'mmap (s)':>9}"
+    )
+    for resistorCount in (10_000, 100_000):
+        dictsMemory = allocatedBy(lambda: createLadderComponentsInfo(resistorCount))
+        componentsInfo, GNDNodes = createLadderComponentsInfo(resistorCount)
+        tableMemory = allocatedBy(
+            lambda: NetlistTable.fromComponentsInfo(componentsInfo, GNDNodes)
+        )
+        with tempfile.TemporaryDirectory() as path:
+            NetlistTable.fromComponentsInfo(componentsInfo, GNDNodes).save(path)
+            loadTime = timeIt(lambda: NetlistTable.load(path, mmap=False))
+            mmapTime = timeIt(lambda: NetlistTable.load(path, mmap=True))
+        print(
+            f"{resistorCount:>10} {dictsMemory:>11.1f} {tableMemory:>11.1f} "
+            f"{loadTime:>9.4f} {mmapTime:>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the waveform store: how fast points are streamed to disk as a simulation produces them,
+how much memory writing takes, and how long reading a short window of a long waveform takes
+against loading the whole waveform.
+
+Run from the base directory of the repository:
+    $ python benchmarks/waveform_benchmark.py
+"""
+
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from SimulationBackend.waveform_store import WaveformStore, WaveformWriter  # noqa: E402
+
+VECTOR_COUNT = 20
+
+
+def writeWaveforms(path: str, pointCount: int) -> None:
+    """
+    A function that streams the given number of points of `VECTOR_COUNT` vectors to the store, one point at a time,
+    the way ngspice sends them.
+    """
+    names = [f"V(CircuitNode-{i})" for i in range(VECTOR_COUNT)]
+    with WaveformWriter(path) as writer:
+        for point in range(pointCount):
+            time_ = point * 1e-9
+            values = {"time": time_}
+            for i, name in enumerate(names):
+                values[name] = math.sin(time_ * 1e6 + i)
+            writer.append(values)
+
+
+def peakWriteMemory(path: str, pointCount: int) -> float:
+    """
+    A function that returns the peak memory allocated while writing the waveforms, in megabytes
+    """
+    tracemalloc.start()
+    writeWaveforms(path, pointCount)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    print(
+        f"{'points':>10} {'write (s)':>10} {'points/s':>10} {'peak (MB)':>10} "
+        f"{'on disk (MB)':>12} {'window (ms)':>12} {'full load (ms)':>15}"
+    )
+    for pointCount in (10_000, 100_000, 500_000):
+        with tempfile.TemporaryDirectory() as path:
+            start = time.perf_counter()
+            writeWaveforms(path, pointCount)
+            writeTime = time.perf_counter() - start
+            # writing holds one chunk in memory, however many points there are
+            with tempfile.TemporaryDirectory() as memoryPath:
+                peak = peakWriteMemory(memoryPath, pointCount)
+            size = (
+                sum(
+                    os.path.getsize(os.path.join(path, name))
+                    for name in os.listdir(path)
+                )
+                / 1e6
+            )
+
+            # a 1% window from the middle of the waveform
+            store = WaveformStore(path)
+            middle = pointCount * 1e-9 / 2
+            start = time.perf_counter()
+            times, values = store.window(
+                "circuitnode-3", middle, middle + pointCount * 1e-11
+            )
+            float(np.max(values))
+            windowTime = time.perf_counter() - start
+            store.close()
+
+            start = time.perf_counter()
+            np.load(os.path.join(path, WaveformStore(path).files["circuitnode-3"]))
+            fullTime = time.perf_counter() - start
+            print(
+                f"{pointCount:>10} {writeTime:>10.2f} {pointCount / writeTime:>10.0f} {peak:>10.2f} "
+                f"{size:>12.1f} {windowTime * 1e3:>12.3f} {fullTime * 1e3:>15.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-from .main_window import MainWindow
\ No newline at end of file
+from .main_window import MainWindow
@@ -1,4 +1,4 @@
-from typing import Union, List
+from typing import Optional, Union, Dict, List, Tuple, Type
 
 from PyQt6.QtWidgets import (
     QWidget,
@@ -11,322 +11,450 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QLineEdit,
     QComboBox,
+    QStackedWidget,
 )
-from PyQt6.QtCore import Qt, QObject, pyqtSignal
-from PyQt6.QtGui import QFont, QDoubleValidator, QCursor, QIcon
+from PyQt6.QtCore import Qt, QObject, QTimer, QRegularExpression, pyqtSignal
+from PyQt6.QtGui import QFont, QRegularExpressionValidator, QValidator, QCursor
 
+from components import getComponentSpec
+from components.types import Quantity
+from components.types.quantity import QUANTITY_PATTERN, formatNumberText
 from components.general import GeneralComponent
 from utils.components import QHLine
+from utils.resources import loadStyleSheet, loadIcon
+from utils.subscriptions import SignalSubscriptions
 
 
-class AttributesPane(QWidget):
-    class Signals(QObject):
-        """
-        A Qbject class to organise all signals that would be emitted from the Attributes pane
-        """
+class ComponentEditor(QWidget):
+    """
+    The widgets of the attributes pane for one component type.
 
+    The widgets are built once, the first time a component of the type is selected,
+    and bound to whichever component of the type is selected after that.
+    """
+
+    class Signals(QObject):
         deleteComponent = pyqtSignal(str)
+        # sends (uniqueID, property, Quantity) of the bound component.
+        # an object so the quantity is not converted to a plain list on the way
+        componentDataChange = pyqtSignal(str, str, object)
+
+    def __init__(
+        self, componentClass: Type[GeneralComponent], validator: QValidator, parent=None
+    ):
+        super(ComponentEditor, self).__init__(parent)
+        self.componentClass = componentClass
+        self.validator = validator
+        self.signals = self.Signals()
 
-    def __init__(self, parent=None):
-        super(AttributesPane, self).__init__(parent)
-        self.initUI()
+        # the component the editor is currently showing
+        self.component: Union[GeneralComponent, None] = None
 
-    def initUI(self):
-        # load QSS stylesheet and set that as the stylesheet of the attributes pane
-        with open("src/styles/attributes_pane.stylesheet.qss", "r") as f:
-            styleSheet = f.read()
-            self.setStyleSheet(styleSheet)
+        # property to (input box, unit drop down) pairs
+        self.propertyInputs: Dict[str, Tuple[QLineEdit, QComboBox]] = {}
+        # simulation result to (value box, unit label, row widget) pairs
+        self.resultRows: Dict[str, Tuple[QLineEdit, QLabel, QWidget]] = {}
 
-        # the attributes pane should not be smaller than 250 pixels.
-        # makes the whole app look better
-        self.setMinimumWidth(250)
+        self.initUI()
 
-        # vertical box layout to arrange everything vertically
+    def initUI(self):
         self.layout = QVBoxLayout()
-        self.layout.setContentsMargins(5, 5, 5, 5)
-        # self.layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
-
-        # using the vertical box layout
+        self.layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(self.layout)
 
-        # creating an instance of the signals class above as an attribute of the AtrributesPane
-        self.signals = self.Signals()
-
-        # Keep track of the selected component; the component whose details would be displayed.
-        self.selectedComponent: Union[GeneralComponent, None] = None
-
-    def clearLayout(self, layout=None):
-        """
-        A utility function that applies recursion to clear the whole attributes pane
+        self.createPreviewSection()
+        self.layout.addWidget(QHLine())
+        self.createIDSection()
+        self.layout.addWidget(QHLine())
+        self.createAttributesSection()
+        self.createSimulationResultsSection()
 
-        The function goes through the contents of the layout and deletes all widgets.
-        If it encounters a sub layout, it uses recursion to call itself on this layout and clear its inner widgets as well
-        """
-        if layout is None:
-            layout = self.layout
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                layout.removeWidget(widget)
-                widget.deleteLater()
-            else:
-                sub_layout = item.layout()
-                if layout is not None:
-                    self.clearLayout(sub_layout)
+        # adding stretch to the bottom to push all components up
+        self.layout.addStretch()
 
-    def createPreviewComponent(self):
+    def createPreviewComponent(self) -> GeneralComponent:
         """
-        A function that creates and returns a clone of the selected component to be used in the preview section of the attributes pane.
+        A function that creates and returns an instance of the component type to be used in the preview section of the editor.
 
-        It gets the class of which the selected compnent is an instance of and creates a new instance of it.
-        it then tweaks some flags to prevent the user from being able to select this preview component or move it around.
+        It tweaks some flags to prevent the user from being able to select this preview component or move it around.
         It also makes sure that the preview component does not accept hover events in order to prevent unnessary re-rendering of the preview component.
         """
-        previewComponent = type(self.selectedComponent)(compCount="X")
+        previewComponent = self.componentClass(compCount="X")
         previewComponent.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
         previewComponent.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
         previewComponent.setAcceptHoverEvents(False)
-        # set the preview component's data to match the selected component's data
-        for property, value in self.selectedComponent.data.items():
-            previewComponent.setComponentData(property, value)
         return previewComponent
 
-    def createPreviewSection(self) -> QVBoxLayout:
+    def createPreviewSection(self):
         """
-        A function that creates and returns a layout containing the whole preview section of the attributes pane.
-
-        It usese a vertical box layout to make sure everything is arranged vertically.
-        It uses a label as the heading of the preview section.
-
-        Underneath this, it adds a QGraphicsView with a QGraphicsScene that'd contain the preview component.
-        A graphics scene is needed because the components are graphics itens.
-
-        It calls the createPreviewComponent() above to get the preview component.
+        A function that creates the preview section of the editor.
 
-        It then sets some fixed dimensions of the preview graphics view and scene.
+        It uses a label as the heading of the preview section and, underneath this,
+        a QGraphicsView with a QGraphicsScene that holds the preview component for as long as the editor lives.
         """
-        layout = QVBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        # layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
         # heading of the preview section
         previewLabel = QLabel("Component Preview", self)
         previewLabel.setFont(QFont("Verdana", 15, 200))
-        layout.addWidget(previewLabel)
-        layout.setAlignment(previewLabel, Qt.AlignmentFlag.AlignTop)
-
-        # creating a graphics view and scene to add the preview item to
-        # create a graphics scene
-        graphicsScene = QGraphicsScene(self)
-        # create a graphics view
-        graphicsView = QGraphicsView(graphicsScene)
-        graphicsView.setBackgroundBrush(Qt.GlobalColor.black)
-        # add the graphics view to the layout
-        layout.addWidget(graphicsView)
-        layout.setAlignment(graphicsView, Qt.AlignmentFlag.AlignTop)
-        # create a preview instance of selected component
-        self.previewComponent = self.createPreviewComponent()
+        self.layout.addWidget(previewLabel)
 
-        # add preview component to the scene
-        graphicsScene.addItem(self.previewComponent)
+        # graphics scene and view to hold the preview component
+        self.previewScene = QGraphicsScene(self)
+        self.previewView = QGraphicsView(self.previewScene, self)
+        self.previewView.setBackgroundBrush(Qt.GlobalColor.black)
+        self.layout.addWidget(self.previewView)
+
+        self.previewComponent = self.createPreviewComponent()
+        self.previewScene.addItem(self.previewComponent)
         # set the scene rect to match the item size
-        graphicsScene.setSceneRect(self.previewComponent.boundingRect())
+        self.previewScene.setSceneRect(self.previewComponent.boundingRect())
         # set the fixed size of the view to match the scene's rect
-        graphicsView.setFixedHeight(int(3 * graphicsScene.sceneRect().size().height()))
-        return layout
+        self.previewView.setFixedHeight(
+            int(3 * self.previewScene.sceneRect().size().height())
+        )
 
-    def createIDSection(self) -> QHBoxLayout:
+    def createIDSection(self):
         """
-        This function creates and returns a layout containing the component ID section of the attributes pane.
-
-        The ID section has the ID of the selected components and a delete button.
-        It uses the horizontal box layout to make sure that they are side by side.
+        A function that creates the ID section of the editor: the ID of the bound component and a delete button side by side.
         """
         layout = QHBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
 
-        # uniqueID label
-        uniqueIDLabel = QLabel(self.selectedComponent.uniqueID, self)
-        uniqueIDLabel.setFont(QFont("Verdana", 15))
-        uniqueIDLabel.setMargin(0)
-        layout.addWidget(uniqueIDLabel)
+        # uniqueID label. the text is set when a component is bound
+        self.uniqueIDLabel = QLabel(self)
+        self.uniqueIDLabel.setFont(QFont("Verdana", 15))
+        self.uniqueIDLabel.setMargin(0)
+        layout.addWidget(self.uniqueIDLabel)
 
         # delete component button
-        deleteButton = QPushButton("Delete", self)
-        deleteButton.setFont(QFont("Verdana", 15))
-        deleteButton.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        deleteButton.setStatusTip(f"Delete {self.selectedComponent.uniqueID}")
-        deleteButton.setProperty("class", "delete-btn")
-        deleteButton.setIcon(QIcon("./assets/bin-icon.png"))
-        deleteButton.clicked.connect(self.onDeleteButtonClick)
-        layout.addWidget(deleteButton)
-        return layout
+        self.deleteButton = QPushButton("Delete", self)
+        self.deleteButton.setFont(QFont("Verdana", 15))
+        self.deleteButton.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.deleteButton.setProperty("class", "delete-btn")
+        self.deleteButton.setIcon(loadIcon("bin-icon"))
+        self.deleteButton.clicked.connect(self.onDeleteButtonClick)
+        layout.addWidget(self.deleteButton)
 
-    def onDeleteButtonClick(self):
-        """
-        When the delete button on the ID sectinon is clicked,
-        this function emits the deleteComponent signal which would be routed to a function on the canvas that deletes the selected component.
-        The function also clears the attributes pane to make sure that selected compoent is still not being displayed even after deletion
-        """
-        self.signals.deleteComponent.emit(self.selectedComponent.uniqueID)
-        self.clearLayout()
+        self.layout.addLayout(layout)
 
-    def createAttributesSection(self) -> QVBoxLayout:
+    def createAttributesSection(self):
         """
-        This function creates and returns a layout containing the actual attributes section of the attributes pane - where user can specify the attributes of selected component.
-
-        It first makes a copy of the data coming in from the selected component.
-        For each attribute in the component's data, it creates a horizontal box layout with the attribute's name, its value and its unit.
-        It uses a QLineEdit for the attribute's value and a drop down for the unit, allowing the user to tweak the values inside the data attribute.
+        A function that creates an editable row for each property declared for the component type in the registry.
 
-        It then combines all the HBoxLayouts for the attributes into a VBoxLayout that
+        Each row has the property's name, a QLineEdit for its value and a drop down for its unit.
         """
-        # getting component data
-        data = self.selectedComponent.data.copy()
-
-        # creating the initial layout
-        layout = QVBoxLayout()
+        spec = getComponentSpec(self.componentClass.name)
+        parameters = spec.parameters if spec else ()
 
         # create attributes heading if there are attributes
-        if len(data):
+        if len(parameters):
             attributesHeading = QLabel("Attributes", self)
             attributesHeading.setFont(QFont("Verdana", 15))
-            layout.addWidget(attributesHeading)
-
-        # float validator
-        # Create a QDoubleValidator
-        floatValidator = QDoubleValidator()
-        floatValidator.setNotation(QDoubleValidator.Notation.StandardNotation)
-        floatValidator.setDecimals(4)
+            self.layout.addWidget(attributesHeading)
 
-        # creating editable sections for each property
-        for property, value in zip(data.keys(), data.values()):
+        for parameter in parameters:
             # property name, value and unit will be side by side
             subLayout = QHBoxLayout()
 
             # property name
-            propertyLabel = QLabel(f"{property} =")
+            propertyLabel = QLabel(f"{parameter.key} =", self)
             propertyLabel.setFont(QFont("Verdana", 15))
             subLayout.addWidget(propertyLabel)
 
             # line input box to enable user edit value of property
-            propertyInputBox = QLineEdit(value[0], self)
-            propertyInputBox.setValidator(floatValidator)
+            propertyInputBox = QLineEdit(self)
+            propertyInputBox.setValidator(self.validator)
             subLayout.addWidget(propertyInputBox)
 
             # using a drop down menu for property units
             propertyUnitDropDown = QComboBox(self)
-            propertyUnitDropDown.addItems(self.getPropertyUnits(property))
-            propertyUnitDropDown.setCurrentText(value[1])
+            propertyUnitDropDown.addItems(list(parameter.units))
             subLayout.addWidget(propertyUnitDropDown)
 
-            # connecting signals to slots
-            propertyChangeHandler = lambda: self.handlePropertyInputSubmit(
-                property,
-                [
-                    propertyInputBox.text().strip(),
-                    propertyUnitDropDown.currentText().strip(),
-                ],
+            # connecting signals to slots. the key is bound as a default argument so each row keeps its own
+            propertyChangeHandler = lambda *_, key=parameter.key: self.onPropertyChange(
+                key
             )
             propertyInputBox.textChanged.connect(propertyChangeHandler)
             propertyUnitDropDown.currentTextChanged.connect(propertyChangeHandler)
 
-            layout.addLayout(subLayout)
-
-        simulationResults = self.selectedComponent.simulationResults.copy()
-        # create attributes heading if there are attributes
-        if len(simulationResults):
-            simulationResultsHeading = QLabel("Simulation Results", self)
-            simulationResultsHeading.setFont(QFont("Verdana", 15))
-            layout.addWidget(simulationResultsHeading)
+            self.propertyInputs[parameter.key] = (
+                propertyInputBox,
+                propertyUnitDropDown,
+            )
+            self.layout.addLayout(subLayout)
 
-        for result, value in zip(simulationResults.keys(), simulationResults.values()):
-            subLayout = QHBoxLayout()
+    def createSimulationResultsSection(self):
+        """
+        A function that creates the simulation results section of the editor.
+        The rows are added the first time a component of the type has a particular result.
+        """
+        self.simulationResultsHeading = QLabel("Simulation Results", self)
+        self.simulationResultsHeading.setFont(QFont("Verdana", 15))
+        self.simulationResultsHeading.hide()
+        self.layout.addWidget(self.simulationResultsHeading)
 
-            # result label
-            resultLabel = QLabel(f"{result} =", self)
-            resultLabel.setFont(QFont("Verdana", 15))
-            subLayout.addWidget(resultLabel)
+        self.simulationResultsLayout = QVBoxLayout()
+        self.simulationResultsLayout.setContentsMargins(0, 0, 0, 0)
+        self.layout.addLayout(self.simulationResultsLayout)
 
-            # an inactive lineinput box to enable user edit value of property
-            resultValue = QLineEdit(value[0], self)
-            resultValue.setDisabled(True)
-            subLayout.addWidget(resultValue)
+    def createResultRow(self, result: str) -> Tuple[QLineEdit, QLabel, QWidget]:
+        """
+        A function that creates and returns the row widgets of a simulation result
+        """
+        row = QWidget(self)
+        subLayout = QHBoxLayout()
+        subLayout.setContentsMargins(0, 0, 0, 0)
+        row.setLayout(subLayout)
+
+        # result label
+        resultLabel = QLabel(f"{result} =", row)
+        resultLabel.setFont(QFont("Verdana", 15))
+        subLayout.addWidget(resultLabel)
+
+        # an inactive line input box to show the value of the result
+        resultValue = QLineEdit(row)
+        resultValue.setDisabled(True)
+        subLayout.addWidget(resultValue)
+
+        # using QLabel for results unit
+        resultUnit = QLabel(row)
+        subLayout.addWidget(resultUnit)
+
+        self.simulationResultsLayout.addWidget(row)
+        self.resultRows[result] = (resultValue, resultUnit, row)
+        return self.resultRows[result]
+
+    def bind(self, component: GeneralComponent):
+        """
+        A function that points the editor at the given component and fills its widgets with the component's data.
 
-            # using QLabel for results unit
-            resultUnit = QLabel(f"{value[1]}", self)
-            subLayout.addWidget(resultUnit)
+        Signals of the input widgets are blocked while they are filled so rebinding does not write the data back to the component.
+        """
+        self.component = component
+
+        self.uniqueIDLabel.setText(component.uniqueID)
+        self.deleteButton.setStatusTip(f"Delete {component.uniqueID}")
+
+        for (
+            property,
+            (propertyInputBox, propertyUnitDropDown),
+        ) in self.propertyInputs.items():
+            value = component.data.get(property)
+            if value is None:
+                continue
+            propertyInputBox.blockSignals(True)
+            propertyUnitDropDown.blockSignals(True)
+            # leave the text alone if it already reads as the value, so a value being typed is not reformatted
+            if self.formatValue(propertyInputBox.text()) != value[0]:
+                propertyInputBox.setText(value[0])
+            propertyUnitDropDown.setCurrentText(value[1])
+            propertyInputBox.blockSignals(False)
+            propertyUnitDropDown.blockSignals(False)
 
-            layout.addLayout(subLayout)
+        # set the preview component's data to match the bound component's data
+        for property, value in component.data.items():
+            if self.previewComponent.data.get(property) != value:
+                self.previewComponent.setComponentData(property, value)
 
-        return layout
+        self.refreshSimulationResults()
 
-    def getPropertyUnits(self, property: str) -> List[str]:
+    def refreshSimulationResults(self):
         """
-        A utility function that takes in a particular property of the component and returns a list of all the units available for the user to use.
+        A function that shows the simulation results of the bound component, hiding rows of results it doesn't have
         """
-        if property == "V":
-            return ["V", "kV"]
-        if property == "R":
-            return ["Ohm", "kOhm"]
+        simulationResults = self.component.simulationResults if self.component else {}
+        for result, value in simulationResults.items():
+            resultRow = self.resultRows.get(result) or self.createResultRow(result)
+            resultValue, resultUnit, _ = resultRow
+            resultValue.setText(value[0])
+            resultUnit.setText(f"{value[1]}")
+        for result, (_, _, row) in self.resultRows.items():
+            row.setVisible(result in simulationResults)
+        self.simulationResultsHeading.setVisible(bool(len(simulationResults)))
+
+    def unbind(self):
+        self.component = None
+
+    def formatValue(self, text: str) -> Optional[str]:
+        """
+        A function that formats the text of a property input box the way the value is stored in the component data.
+        eg: "100" -> "100.00", "4k7" -> "4k7"
+
+        Returns:
+            The formatted text, or `None` if the text is not a number yet. eg: "2.2e" while it's being typed
+        """
+        try:
+            return formatNumberText(text)
+        except ValueError:
+            return None
 
-    def handlePropertyInputSubmit(self, property: str, value: List[str]):
+    def onPropertyChange(self, property: str):
         """
         This function takes the current value and unit of a property on the attributes section whenever there's a change.
-        It sets the new values as the componenets updated data. It also updates the components data for the preview componet too to make them sync.
+        The value is parsed into a `Quantity` here, once, and sent out to be set as the bound component's data,
+        along with any other selected component of the type. Text that is not a number yet is not sent.
+        It also updates the data of the preview component to keep them in sync.
         """
-        if value[0]:
-            value[0] = f"{float(value[0]):.2f}"
-        else:
-            value[0] = f"{0:.2f}"
-        self.selectedComponent.setComponentData(property, value)
+        if self.component is None:
+            return
+        propertyInputBox, propertyUnitDropDown = self.propertyInputs[property]
+        text = self.formatValue(propertyInputBox.text())
+        if text is None:
+            return
+        value = Quantity(text, propertyUnitDropDown.currentText().strip())
+        self.signals.componentDataChange.emit(self.component.uniqueID, property, value)
         self.previewComponent.setComponentData(property, value)
 
-    def componentDeselected(self):
+    def onDeleteButtonClick(self):
+        """
+        When the delete button on the ID section is clicked,
+        this function emits the deleteComponent signal which would be routed to a function on the canvas that deletes the bound component.
+        """
+        if self.component is not None:
+            self.signals.deleteComponent.emit(self.component.uniqueID)
+
+
+class AttributesPane(QWidget):
+    class Signals(QObject):
+        """
+        A Qbject class to organise all signals that would be emitted from the Attributes pane
+        """
+
+        deleteComponent = pyqtSignal(str)
+        # sends (uniqueID, property, Quantity) when a property of the selected component is edited
+        componentDataChange = pyqtSignal(str, str, object)
+
+    def __init__(self, parent=None):
+        super(AttributesPane, self).__init__(parent)
+        self.initUI()
+
+    def initUI(self):
+        # load QSS stylesheet and set that as the stylesheet of the attributes pane
+        self.setStyleSheet(loadStyleSheet("attributes_pane"))
+
+        # the attributes pane should not be smaller than 250 pixels.
+        # makes the whole app look better
+        self.setMinimumWidth(250)
+
+        # vertical box layout to arrange everything vertically
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(5, 5, 5, 5)
+
+        # using the vertical box layout
+        self.setLayout(self.layout)
+
+        # the editors are stacked on top of each other, only the one of the selected component type is shown.
+        # the first page is left empty for when nothing is selected
+        self.editorStack = QStackedWidget(self)
+        self.emptyPage = QWidget(self.editorStack)
+        self.editorStack.addWidget(self.emptyPage)
+        self.layout.addWidget(self.editorStack)
+
+        # creating an instance of the signals class above as an attribute of the AtrributesPane
+        self.signals = self.Signals()
+        # keep track of the signals of the selected component the pane is connected to
+        self.subscriptions = SignalSubscriptions()
+
+        # Keep track of the selected component; the component whose details would be displayed.
+        self.selectedComponent: Union[GeneralComponent, None] = None
+
+        # component type name to editor pairs. editors are created the first time they are needed and kept
+        self.editors: Dict[str, ComponentEditor] = {}
+
+        # one validator shared by the property inputs of every editor.
+        # accepts plain numbers and numbers with an SI prefix or an exponent. eg: "100", "4k7", "2.2u" or "1e3"
+        self.quantityValidator = QRegularExpressionValidator(
+            QRegularExpression(QUANTITY_PATTERN), self
+        )
+
+        # selection changes are applied once the event loop is free,
+        # so selecting many components at once only refreshes the pane for the last one
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setSingleShot(True)
+        self.refreshTimer.setInterval(0)
+        self.refreshTimer.timeout.connect(self.refresh)
+
+    def getEditor(self, component: GeneralComponent) -> ComponentEditor:
+        """
+        A function that returns the editor for the type of the given component, creating it the first time it's needed
+        """
+        editor = self.editors.get(component.name)
+        if editor is None:
+            editor = ComponentEditor(type(component), self.quantityValidator, self)
+            editor.signals.deleteComponent.connect(self.onDeleteComponent)
+            editor.signals.componentDataChange.connect(
+                self.signals.componentDataChange.emit
+            )
+            self.editorStack.addWidget(editor)
+            self.editors[component.name] = editor
+        return editor
+
+    def refresh(self):
+        """
+        A function that shows the editor of the selected component bound to it, or the empty page if nothing is selected
+        """
+        currentEditor = self.editorStack.currentWidget()
+        if isinstance(currentEditor, ComponentEditor):
+            currentEditor.unbind()
+
+        if self.selectedComponent is None:
+            self.editorStack.setCurrentWidget(self.emptyPage)
+            return
+
+        editor = self.getEditor(self.selectedComponent)
+        editor.bind(self.selectedComponent)
+        self.editorStack.setCurrentWidget(editor)
+
+    def onDeleteComponent(self, uniqueID: str):
+        """
+        This function passes on the deleteComponent signal of an editor and clears the attributes pane
+        to make sure that the deleted component is not still being displayed.
+        """
+        self.signals.deleteComponent.emit(uniqueID)
+        self.componentDeselected(uniqueID)
+
+    def onComponentsDataChanged(self, componentIDs: List[str]):
+        """
+        This is a slot to handle changes to the data of components on the canvas, like the ones made by undo and redo.
+        It schedules a refresh if the selected component is one of them.
+        """
+        if (
+            self.selectedComponent is not None
+            and self.selectedComponent.uniqueID in componentIDs
+        ):
+            self.refreshTimer.start()
+
+    def componentDeselected(self, uniqueID: str):
         """
         This is a slot to handle component deselection on the canvas.
-        It clears the layout of the attributes pane and sets the selected component back to None.
+        It sets the selected component back to None and schedules a refresh that clears the attributes pane.
         """
-        self.clearLayout()
+        if (
+            self.selectedComponent is None
+            or self.selectedComponent.uniqueID != uniqueID
+        ):
+            return
+        self.subscriptions.unsubscribe("componentDeselected")
         self.selectedComponent = None
+        self.refreshTimer.start()
 
     def onCanvasComponentSelect(self, selectedComponent: GeneralComponent):
         """
         This is the slot that handles what happens on the attributes pane when a component is selected on the canvas.
 
-        It takes in the selected components and first sets it as an attribute of the AtrributesPane.
-        It then connects the component deselected signal to the slot that handles component deselection.
-        It clears the layout in case any previous components were selected.
-        It creates the various sections of the attributes pane and add them all to the main layout of the attributes pane in the right order.
-        It finally adds a stretch at the bottom to make sure that everything is aligned and shifted to the top.
+        It takes in the selected component and sets it as an attribute of the AtrributesPane.
+        It then connects the component deselected signal to the slot that handles component deselection
+        and schedules a refresh that binds the editor of the component type to it.
         """
         # set selected component
         self.selectedComponent = selectedComponent
 
-        # connect component deselected signal
-        self.selectedComponent.signals.componentDeselected.connect(
-            self.componentDeselected
+        # connect component deselected signal. replaces the connection to any previously selected component
+        self.subscriptions.subscribe(
+            "componentDeselected",
+            self.selectedComponent.signals,
+            "componentDeselected",
+            self.componentDeselected,
         )
 
-        # clear current content of the attributes pane
-        self.clearLayout()
-
-        # create the preview section
-        previewSection = self.createPreviewSection()
-        self.layout.addLayout(previewSection)
-        self.layout.setAlignment(previewSection, Qt.AlignmentFlag.AlignTop)
-        self.layout.addWidget(QHLine())
-
-        # create the ID section
-        IDSection = self.createIDSection()
-        self.layout.addLayout(IDSection)
-        self.layout.setAlignment(IDSection, Qt.AlignmentFlag.AlignTop)
-        self.layout.addWidget(QHLine())
-
-        # create attributes section
-        attributesSection = self.createAttributesSection()
-        self.layout.addLayout(attributesSection)
-        self.layout.setAlignment(attributesSection, Qt.AlignmentFlag.AlignTop)
-
-        # adding stretch to the bottom to push all components up
-        self.layout.addStretch()
+        self.refreshTimer.start()
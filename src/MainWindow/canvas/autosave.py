@@ -0,0 +1,214 @@
+import glob
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from PyQt6.QtCore import QObject, QLockFile, QStandardPaths, QTimer
+
+import constants
+from logger import logger
+from model import DesignJournal, designRecordType
+
+if TYPE_CHECKING:
+    from .canvas import Canvas
+
+JOURNAL_PREFIX = "autosave-"
+JOURNAL_EXTENSION = ".jsonl"
+
+
+def autosaveDirectory() -> str:
+    """
+    A function that returns the directory the autosave journals are kept in. eg: ~/.local/share/simit/autosave
+    """
+    dataDirectory = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericDataLocation
+    )
+    return os.path.join(dataDirectory, "simit", "autosave")
+
+
+class Autosave(QObject):
+    """
+    Saves the changes made to the design on the canvas to a journal, so the design can be recovered after a crash.
+
+    The canvas sends the uniqueIDs of the components, wires and nodes every edit touches. Every `AUTOSAVE_INTERVAL`
+    the ones touched since the last save are copied into immutable records, on the app's thread, and the records
+    are written to the journal on a background thread. Only the changes are copied and written, so saving a small edit
+    costs the same whatever the size of the design. The journal is compacted on the background thread every
+    `AUTOSAVE_COMPACT_ENTRIES` entries.
+
+    Every session writes its own journal and holds a lock on it while it runs. A journal left without a lock
+    belongs to a session that did not close, and can be recovered. The journal is deleted when the app closes.
+    """
+
+    def __init__(self, canvas: "Canvas", directory: Optional[str] = None) -> None:
+        super(Autosave, self).__init__(canvas)
+        self.canvas = canvas
+        self.directory = directory or autosaveDirectory()
+        self.journal = DesignJournal(
+            os.path.join(
+                self.directory, f"{JOURNAL_PREFIX}{os.getpid()}{JOURNAL_EXTENSION}"
+            )
+        )
+        self.lock = QLockFile(f"{self.journal.path}.lock")
+        # the uniqueIDs touched since the last save, in the order they were first touched
+        self.changedIDs: Dict[str, None] = {}
+        # the journal is only ever written by this one thread, so the entries are written in order
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pendingWrite: Optional[Future] = None
+        # the locks taken on the journals of other sessions, until they are recovered or discarded
+        self.recoveryLocks: Dict[str, QLockFile] = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(constants.AUTOSAVE_INTERVAL)
+        self.timer.timeout.connect(self.save)
+
+        canvas.signals.designChanged.connect(self.markChanged)
+
+    def isActive(self) -> bool:
+        return self.executor is not None
+
+    def start(self) -> None:
+        """
+        A function that starts saving the design. The design already on the canvas is part of the first save
+        """
+        if self.isActive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if not self.lock.tryLock(0):
+            logger.error(
+                f"Autosave journal {self.journal.path} is locked. The design is not autosaved"
+            )
+            return
+        if os.path.exists(self.journal.path):
+            # left by a session that did not close and had the same process id. kept aside to be recovered
+            os.replace(
+                self.journal.path,
+                self.journal.path.replace(
+                    JOURNAL_PREFIX, f"{JOURNAL_PREFIX}{time.time_ns()}-"
+                ),
+            )
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self.markChanged(
+            [*self.canvas.components, *self.canvas.wires, *self.canvas.circuitNodes]
+        )
+        self.timer.start()
+
+    def markChanged(self, uniqueIDs: List[str]) -> None:
+        """
+        Slot that records the uniqueIDs of the components, wires and nodes an edit touched, until the next save.
+        The nodes of the touched components are recorded too, since moving a component off the end of a wire
+        disconnects it from the node without the node being part of the edit.
+        """
+        if not self.isActive():
+            return
+        canvas = self.canvas
+        for uniqueID in uniqueIDs:
+            self.changedIDs[uniqueID] = None
+            component = canvas.components.get(uniqueID)
+            if component is not None:
+                for node in component.terminalNodes.values():
+                    self.changedIDs[node.uniqueID] = None
+                for netID in canvas.connectivity.netsOf(uniqueID).values():
+                    self.changedIDs[netID] = None
+
+    def captureChanges(self) -> Tuple[Tuple[designRecordType, ...], Tuple[str, ...]]:
+        """
+        A function that copies the state of everything touched since the last save into immutable records
+        and starts recording the next changes
+
+        Returns:
+            The records of the touched components, wires and nodes still on the canvas,
+            and the uniqueIDs of the ones no longer on it
+        """
+        canvas = self.canvas
+        records: List[designRecordType] = []
+        deleted: List[str] = []
+        for uniqueID in self.changedIDs:
+            item = (
+                canvas.components.get(uniqueID)
+                or canvas.wires.get(uniqueID)
+                or canvas.circuitNodes.get(uniqueID)
+            )
+            if item is None:
+                deleted.append(uniqueID)
+            else:
+                records.append(item.record())
+        self.changedIDs = {}
+        return tuple(records), tuple(deleted)
+
+    def save(self) -> None:
+        """
+        Slot that saves the changes made since the last save, on the background thread
+        """
+        if not self.isActive() or not self.changedIDs:
+            return
+        records, deleted = self.captureChanges()
+        self.pendingWrite = self.executor.submit(self._write, records, deleted)
+
+    def _write(
+        self, records: Iterable[designRecordType], deleted: Iterable[str]
+    ) -> None:
+        # runs on the background thread
+        try:
+            self.journal.append(records, deleted)
+            if self.journal.entryCount >= constants.AUTOSAVE_COMPACT_ENTRIES:
+                self.journal.compact()
+        except Exception:
+            logger.exception("Design not autosaved")
+
+    def flush(self) -> None:
+        """
+        A function that saves the changes not saved yet and waits for the journal to be written
+        """
+        self.save()
+        if self.pendingWrite is not None:
+            self.pendingWrite.result()
+            self.pendingWrite = None
+
+    def stop(self) -> None:
+        """
+        A function that stops saving the design and deletes the journal. Called when the app closes
+        """
+        # the journals of other sessions not recovered or discarded are offered again next time
+        for lock in self.recoveryLocks.values():
+            lock.unlock()
+        self.recoveryLocks = {}
+        if not self.isActive():
+            return
+        self.timer.stop()
+        self.executor.shutdown(wait=True)
+        self.executor = None
+        self.pendingWrite = None
+        self.changedIDs = {}
+        self.journal.remove()
+        self.lock.unlock()
+
+    def recoverableJournals(self) -> List[str]:
+        """
+        A function that returns the journals of the sessions that did not close, newest first.
+        They are locked until they are discarded, so another session can not recover them too.
+        """
+        paths = []
+        for path in glob.glob(
+            os.path.join(self.directory, f"{JOURNAL_PREFIX}*{JOURNAL_EXTENSION}")
+        ):
+            if path == self.journal.path or path in self.recoveryLocks:
+                continue
+            lock = QLockFile(f"{path}.lock")
+            # the lock of a session that's still running is never stale, however old it is
+            lock.setStaleLockTime(0)
+            if lock.tryLock(0):
+                self.recoveryLocks[path] = lock
+                paths.append(path)
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def discardJournals(self, paths: List[str]) -> None:
+        """
+        A function that deletes the journals of other sessions, once they are recovered or not wanted
+        """
+        for path in paths:
+            DesignJournal(path).remove()
+            lock = self.recoveryLocks.pop(path, None)
+            if lock is not None:
+                lock.unlock()
@@ -1,24 +1,57 @@
-from typing import Type, Dict, List, Tuple
+import os
+import shutil
+import tempfile
+from collections import ChainMap
+from contextlib import contextmanager
+from typing import Container, Type, Dict, List, Optional, Tuple, Iterable, TYPE_CHECKING
 from PyQt6 import QtGui
+from PyQt6.QtGui import QUndoStack
 
 from PyQt6.QtWidgets import QGraphicsView
 from PyQt6.QtCore import Qt, pyqtSignal, QObject, QPointF
 
 from .grid_scene import GridScene
+from .autosave import Autosave
+from .circuit_snapshot import CircuitSnapshot
+from .netlist_layout import NetlistLayout
+from .commands import (
+    CircuitEditCommand,
+    MoveComponentCommand,
+    RotateComponentsCommand,
+    SetComponentsDataCommand,
+)
 from components.general import GeneralComponent
 from components.general.component_and_terminal_index import ComponentAndTerminalIndex
 from components.wire import Wire
+from components import getComponentSpec
+from components.types import Quantity
 
 from SimulationBackend.middleware import CircuitNode
 from SimulationBackend.circuit_simulator import CircuitSimulator
+from SimulationBackend.netlist_reader import NetlistReader
+from SimulationBackend.simulation_worker import SimulationWorker
+from model import CircuitModel, ConnectivityIndex, DesignState, WireRecord
 
 import constants
 from logger import logger
+from utils.subscriptions import signalFanOut
+
+if TYPE_CHECKING:
+    from SimulationBackend.shared_results import SharedResults
+    from SimulationBackend.waveform_store import WaveformStore
 
 
 class Canvas(QGraphicsView):
     class Signals(QObject):
         componentSelected = pyqtSignal(GeneralComponent)
+        # sends the uniqueIDs of all components whose data changed in one edit
+        componentsDataChanged = pyqtSignal(list)
+        # sends the uniqueID of the circuit node of a selected wire
+        nodeSelected = pyqtSignal(str)
+        # sends the waveforms of a finished transient analysis
+        waveformsReady = pyqtSignal(object)
+        # sends the uniqueIDs of the components, wires and nodes an edit added, changed or removed
+        designChanged = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super(Canvas, self).__init__(parent)
@@ -32,6 +65,8 @@ class Canvas(QGraphicsView):
 
         self.components: Dict[str, GeneralComponent] = {}
         self.wires: Dict[str, Wire] = {}
+        # the count the next component of each type, wire and node gets. eg: {"Resistor": 3, "Wire": 12}
+        self.uniqueCounts: Dict[str, int] = {}
 
         self.selectedComponentsIDs: List[str] = []
         self.selectedWireIDs: List[str] = []
@@ -39,9 +74,46 @@ class Canvas(QGraphicsView):
         # dictionary to store circuit nodes based on their uniqueIDs
         self.circuitNodes: Dict[str, CircuitNode] = {}
 
+        # True when components have been edited since the last simulation
+        self.simulationOutdated = False
+        # simulations run in a worker process. the results of the last one stay in shared memory until the next one
+        self.simulationWorker = SimulationWorker()
+        self.simulationWorker.signals.simulationFinished.connect(
+            self.onSimulationFinished
+        )
+        self.simulationResults: Optional["SharedResults"] = None
+        # transient waveforms are streamed to a temporary directory. the waveforms of the last analysis are kept until the next one
+        self.simulationWorker.signals.transientFinished.connect(
+            self.onTransientFinished
+        )
+        self.waveforms: Optional["WaveformStore"] = None
+        self.pendingWaveformsPath: Optional[str] = None
+
+        # undo and redo history of the edits made on the canvas
+        self.undoStack = QUndoStack(self)
+        self.undoStack.setUndoLimit(constants.UNDO_LIMIT)
+        # the component being dragged as (uniqueID, position at the last recorded step), and a count to tell drags apart
+        self.draggedComponent: Tuple[str, QPointF] | None = None
+        self.dragCount = 0
+
+        # True when the scene and view are tuned for a design with many items
+        self.largeDesignMode = False
+        # number of bulk operations running. viewport updates come back once the last one is done
+        self.bulkOperations = 0
+
         # signals
         self.signals = self.Signals()
 
+        # which terminals every node connects, kept up to date with the nodes every edit touches
+        self.connectivity = ConnectivityIndex()
+        self.signals.designChanged.connect(self.onDesignChanged)
+        # the node drawn highlighted, with the wires and components it's drawn on
+        self.highlightedNetID: Optional[str] = None
+        self.highlightedItems: List[Wire | GeneralComponent] = []
+
+        # the changes of the design are saved to a journal in the background once the autosave is started
+        self.autosave = Autosave(self)
+
         self.initUI()
 
     def initUI(self):
@@ -60,6 +132,126 @@ class Canvas(QGraphicsView):
 
         self.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
 
+        # zoom in and out around the mouse position
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+
+        # repaint only the regions that changed. large designs switch to the bounding rect of the changes
+        self.setViewportUpdateMode(
+            QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate
+        )
+
+    def updateDesignMode(self) -> None:
+        """
+        Function that switches the large-design tuning on or off from the number of components and wires on the canvas.
+        It goes on at `LARGE_DESIGN_ITEMS` items and off again below `SMALL_DESIGN_ITEMS`.
+        """
+        itemCount = len(self.components) + len(self.wires)
+        if not self.largeDesignMode and itemCount >= constants.LARGE_DESIGN_ITEMS:
+            self.setLargeDesignMode(True)
+        elif self.largeDesignMode and itemCount < constants.SMALL_DESIGN_ITEMS:
+            self.setLargeDesignMode(False)
+
+    def setLargeDesignMode(self, enabled: bool) -> None:
+        """
+        Function that tunes the scene and the view for large designs or back to the default tuning.
+
+        For large designs the scene sizes its index for the design and fixes its rect to it, the view repaints
+        the bounding rect of the changed regions instead of every region separately (many small regions cost more
+        to clip than one larger one) and caches the grid it draws behind the items.
+
+        Params:
+            enabled: `bool` - True to tune the canvas for large designs
+        """
+        self.largeDesignMode = enabled
+        self.scene().setLargeDesignMode(enabled, len(self.components) + len(self.wires))
+        if enabled:
+            self.setViewportUpdateMode(
+                QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+            )
+            self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+        else:
+            self.setViewportUpdateMode(
+                QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate
+            )
+            self.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
+        self.resetCachedContent()
+        logger.info(f"Large design mode {'on' if enabled else 'off'}")
+
+    @contextmanager
+    def bulkOperation(self):
+        """
+        Context manager for adding, moving or removing many items at once. eg: importing a netlist.
+
+        The item index of the scene is turned off and the viewport is not repainted while the body runs.
+        Once it's done the index is rebuilt and the canvas repainted once, and the design mode is updated
+        for the new number of items. Bulk operations can be nested.
+
+        Components can be added to the scene and to `components` directly in the body, without `addComponent`.
+        """
+        if self.bulkOperations == 0:
+            self.viewport().setUpdatesEnabled(False)
+        self.bulkOperations += 1
+        try:
+            with self.scene().suspendIndex():
+                yield
+        finally:
+            self.bulkOperations -= 1
+            if self.bulkOperations == 0:
+                if self.scene().sceneRectFixed:
+                    self.scene().fitSceneRect()
+                self.updateDesignMode()
+                self.viewport().setUpdatesEnabled(True)
+                self.viewport().update()
+
+    def zoomLevel(self) -> float:
+        """
+        Function that returns the current zoom level of the canvas. 1 means not zoomed.
+        """
+        return self.transform().m11()
+
+    def zoomBy(self, factor: float) -> None:
+        """
+        Function to scale the canvas by the given factor, keeping the zoom level within the zoom limits.
+
+        Params:
+            factor: `float` - the factor to scale the canvas by. Greater than 1 zooms in.
+        """
+        zoom = self.zoomLevel()
+        newZoom = min(max(zoom * factor, constants.MIN_ZOOM), constants.MAX_ZOOM)
+        if newZoom != zoom:
+            self.scale(newZoom / zoom, newZoom / zoom)
+
+    def zoomIn(self) -> None:
+        self.zoomBy(constants.ZOOM_FACTOR)
+
+    def zoomOut(self) -> None:
+        self.zoomBy(1 / constants.ZOOM_FACTOR)
+
+    def resetZoom(self) -> None:
+        self.resetTransform()
+
+    def zoomToFit(self) -> None:
+        """
+        Function to zoom the canvas so that every item on the scene fits in the view.
+        """
+        itemsRect = self.scene().itemsBoundingRect()
+        if itemsRect.isEmpty():
+            return
+        self.fitInView(itemsRect, Qt.AspectRatioMode.KeepAspectRatio)
+        # keep the zoom level within the zoom limits
+        self.zoomBy(1)
+
+    def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
+        # zoom with the mouse wheel when the control key is held, scroll otherwise
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            if event.angleDelta().y() > 0:
+                self.zoomIn()
+            elif event.angleDelta().y() < 0:
+                self.zoomOut()
+            event.accept()
+            return
+        return super().wheelEvent(event)
+
     def addComponent(self, component: Type["GeneralComponent"]) -> None:
         """
         Function to create and add a component to the scene.
@@ -74,18 +266,214 @@ class Canvas(QGraphicsView):
         uniqueCount = self.generateUniqueComponentCount(component.name)
         # create the component
         comp = component(compCount=uniqueCount)
+        self.connectComponentSignals(comp)
+        with self.recordCircuitEdit(f"Add {comp.uniqueID}", components=[comp]):
+            self.scene().addItem(comp)
+            self.scene().includeRect(comp.sceneBoundingRect())
+            self.components[comp.uniqueID] = comp
+
+    def connectComponentSignals(self, component: GeneralComponent) -> None:
+        """
+        Function that connects the signals of a component added to the canvas
+        """
         try:
-            comp.signals.terminalClicked.connect(self.onTerminalClick)
-            comp.signals.componentSelected.connect(self.onComponentSelected)
-            comp.signals.componentDeselected.connect(self.onComponentDeselected)
-        except Exception as e:
+            component.signals.terminalClicked.connect(self.onTerminalClick)
+            component.signals.componentSelected.connect(self.onComponentSelected)
+            component.signals.componentDeselected.connect(self.onComponentDeselected)
+            component.signals.componentDataChanged.connect(
+                lambda uniqueID=component.uniqueID: self.onComponentsDataChanged(
+                    [uniqueID]
+                )
+            )
+        except Exception:
             logger.exception("Some component signals not connected")
-        self.scene().addItem(comp)
-        self.components[comp.uniqueID] = comp
+
+    def connectWireSignals(self, wire: Wire) -> None:
+        """
+        Function that connects the signals of a wire added to the canvas
+        """
+        wire.signals.wireClicked.connect(self.onWireClick)
+        wire.signals.wireSelected.connect(self.onWireSelected)
+        wire.signals.wireDeselected.connect(self.onWireDeselected)
+
+    def loadDesign(self, state: DesignState, undoText: Optional[str] = None) -> None:
+        """
+        Function that adds a saved design to the canvas, in one bulk operation. The uniqueIDs of the design
+        must not be on the canvas already.
+
+        Params:
+            state: `DesignState` - the records of the components, wires and nodes of the design
+            undoText: `str` - the text of the undo command the design is added with. eg: "Import amplifier.cir".
+                `None` if the design can not be undone, the undo stack is cleared then. eg: for a recovered design
+        """
+        with self.bulkOperation():
+            for record in state.components.values():
+                spec = getComponentSpec(record.type)
+                if spec is None:
+                    logger.error(
+                        f"Unknown component type {record.type} of {record.uniqueID}"
+                    )
+                    continue
+                component = spec.loadClass()(
+                    compCount=int(record.uniqueID.rsplit("-", 1)[-1])
+                )
+                self.connectComponentSignals(component)
+                for key, text, unit in record.data:
+                    component.setComponentData(key, Quantity(text, unit), notify=False)
+                component.updateText()
+                component.setPos(*record.pos)
+                component.setRotation(record.rotation)
+                self.scene().addItem(component)
+                self.components[component.uniqueID] = component
+
+            for record in state.nodes.values():
+                node = CircuitNode(int(record.uniqueID.rsplit("-", 1)[-1]))
+                node.componentTerminals = [
+                    tuple(terminal) for terminal in record.terminals
+                ]
+                self.circuitNodes[node.uniqueID] = node
+                for componentID, terminalIndex in node.componentTerminals:
+                    component = self.components.get(componentID)
+                    if component is not None:
+                        component.setTerminalNode(terminalIndex, node)
+
+            # a wire that starts or ends on another wire is created after it
+            pending = sorted(
+                state.wires.values(),
+                key=lambda record: int(record.uniqueID.rsplit("-", 1)[-1]),
+            )
+            while pending:
+                remaining = [record for record in pending if not self._loadWire(record)]
+                if len(remaining) == len(pending):
+                    logger.error(
+                        f"Wires not loaded, what they are connected to is missing: {[record.uniqueID for record in remaining]}"
+                    )
+                    break
+                pending = remaining
+
+            for record in state.nodes.values():
+                node = self.circuitNodes[record.uniqueID]
+                node.wires = [
+                    self.wires[wireID]
+                    for wireID in record.wires
+                    if wireID in self.wires
+                ]
+                for wire in node.wires:
+                    wire.setCircuitNode(node)
+
+        self.simulationOutdated = True
+        if undoText is None:
+            self.undoStack.clear()
+            self.signals.designChanged.emit(
+                [*self.components, *self.wires, *self.circuitNodes]
+            )
+            return
+        # the loaded objects were not part of the circuit before. pushing the command emits designChanged for them
+        after = CircuitSnapshot(
+            self,
+            [
+                self.components[uniqueID]
+                for uniqueID in state.components
+                if uniqueID in self.components
+            ],
+            [
+                self.wires[uniqueID]
+                for uniqueID in state.wires
+                if uniqueID in self.wires
+            ],
+            [
+                self.circuitNodes[uniqueID]
+                for uniqueID in state.nodes
+                if uniqueID in self.circuitNodes
+            ],
+            expand=False,
+        )
+        before = CircuitSnapshot(self, expand=False)
+        before.addMissing(after)
+        self.undoStack.push(CircuitEditCommand(undoText, before, after))
+
+    def _loadWire(self, record: WireRecord) -> bool:
+        """
+        Function that adds a saved wire to the canvas
+
+        Returns:
+            `False` if the component or wire it starts or ends on is not on the canvas yet
+        """
+        ends = []
+        for end in (record.start, record.end):
+            if end is None:
+                ends.append(None)
+                continue
+            uniqueID, terminal = end
+            if isinstance(terminal, tuple):
+                wire = self.wires.get(uniqueID)
+                if wire is None:
+                    return False
+                ends.append((wire, QPointF(*terminal)))
+            else:
+                component = self.components.get(uniqueID)
+                if component is None:
+                    return False
+                ends.append(ComponentAndTerminalIndex(component, terminal))
+        start, end = ends
+        if start is None:
+            logger.error(
+                f"{record.uniqueID} does not start on anything and is not loaded"
+            )
+            return True
+        wire = Wire(start=start, wireCount=int(record.uniqueID.rsplit("-", 1)[-1]))
+        if end is not None:
+            wire.setEnd(end)
+        wire.setPoints([QPointF(x, y) for x, y in record.points])
+        self.connectWireSignals(wire)
+        self.scene().addItem(wire)
+        self.wires[wire.uniqueID] = wire
+        return True
+
+    @contextmanager
+    def recordCircuitEdit(
+        self,
+        text: str,
+        components: Iterable[GeneralComponent] = (),
+        wires: Iterable[Wire] = (),
+        nodes: Iterable[CircuitNode] = (),
+    ):
+        """
+        Context manager that records the edit made in its body on the undo stack.
+
+        The given objects and their neighbours are snapshotted before and after the edit. They must include
+        everything the edit changes. Objects the edit creates are picked up through the neighbours of the
+        given objects after the edit, and are recorded as not being part of the circuit before it.
+
+        Params:
+            text: `str` - the text of the edit shown on the undo and redo actions
+            components, wires, nodes: the objects the edit changes
+
+        Returns:
+            The command pushed on the undo stack, once the body is done
+        """
+        components, wires, nodes = list(components), list(wires), list(nodes)
+        before = CircuitSnapshot(self, components, wires, nodes)
+        command = CircuitEditCommand(text, before, before)
+        yield command
+        # the objects recorded before, along with the ones the edit connected to the given objects
+        reached = CircuitSnapshot(self, components, wires, nodes)
+        beforeObjects, reachedObjects = before.objects(), reached.objects()
+        after = CircuitSnapshot(
+            self,
+            beforeObjects[0] + reachedObjects[0],
+            beforeObjects[1] + reachedObjects[1],
+            beforeObjects[2] + reachedObjects[2],
+            expand=False,
+        )
+        before.addMissing(after)
+        command.after = after
+        self.undoStack.push(command)
+        self.updateDesignMode()
 
     def generateUniqueComponentCount(self, componentName: str) -> int:
         """
-        Function to generate the unique component count for a component name.
+        Function to generate the unique count for a component name.
 
         Params:
             componentName: `str` the name of the component to generate the unique count for
@@ -93,27 +481,50 @@ class Canvas(QGraphicsView):
         Returns:
             `int` the unique count for the component name
         """
-        # get all the componentIDs availble
-        existingIDs = self.components.keys()
-        # filter the IDs to get only the ones that start with the component name
-        filteredIDs = list(filter(lambda x: x.startswith(componentName), existingIDs))
-        # if there are no existing IDs, return 0
-        if len(filteredIDs) == 0:
-            return 0
-        # sort the IDs in ascending order
-        filteredIDs.sort()
-        # get the last ID
-        lastID = filteredIDs[-1]
-        # get the unique count from the last ID
-        uniqueCount = int(lastID.split("-")[-1])
-        # increment the unique count by 1
-        uniqueCount += 1
+        return self.generateUniqueCount(componentName, self.components)
+
+    def generateUniqueCount(self, name: str, existingIDs: Container[str]) -> int:
+        """
+        Function to generate the count of the uniqueID of a new component, wire or node. eg: 3 for "Resistor-3"
+
+        Params:
+            name: `str` the name the uniqueID starts with. eg: "Resistor" or "Wire"
+            existingIDs: the uniqueIDs already on the canvas
+
+        Returns:
+            `int` the unique count for the name
+        """
+        uniqueCount = self.uniqueCounts.get(name)
+        if uniqueCount is None:
+            # first one of this name. continue after the highest count on the canvas.
+            # the counts are compared as numbers, as IDs sort "Resistor-9" after "Resistor-10"
+            prefix = f"{name}-"
+            uniqueCount = 1 + max(
+                (
+                    int(uniqueID[len(prefix) :])
+                    for uniqueID in existingIDs
+                    if uniqueID.startswith(prefix) and uniqueID[len(prefix) :].isdigit()
+                ),
+                default=-1,
+            )
+        # skip the counts of IDs added with counts of their own. eg: by loading a design
+        while f"{name}-{uniqueCount}" in existingIDs:
+            uniqueCount += 1
+        # the next count is kept, so adding a component does not go through every component on the canvas
+        self.uniqueCounts[name] = uniqueCount + 1
         return uniqueCount
 
     def deleteComponents(self, componentIDs: List[str]):
-        for componentID in componentIDs:
-            component = self.components.get(componentID)
-            if component is not None:
+        components = [
+            self.components[componentID]
+            for componentID in componentIDs
+            if componentID in self.components
+        ]
+        if not components:
+            return
+        with self.recordCircuitEdit("Delete Components", components=components):
+            for component in components:
+                componentID = component.uniqueID
                 # go through circuit nodes and remove the component terminals from the nodes
                 for node in component.terminalNodes.values():
                     node.removeComponent(componentID)
@@ -123,10 +534,111 @@ class Canvas(QGraphicsView):
                 del self.components[componentID]
                 component.setSelected(False)
 
+    def setComponentsData(
+        self, componentIDs: List[str], key: str, value: Quantity
+    ) -> List[str]:
+        """
+        Function that sets a property of many components in one edit.
+
+        The components are not notified one by one. Their text is updated while viewport updates are held back,
+        and a single componentsDataChanged signal is sent for all the components that changed.
+
+        Params:
+            componentIDs: `List[str]` - the IDs of the components to edit. Components without the property are skipped
+            key: `str` - the key of the property. eg: "R"
+            value: `Quantity` - the new value and unit of the property
+
+        Returns:
+            `List[str]` the IDs of the components whose data changed
+        """
+        # component uniqueID to (old value, new value) pairs
+        changes: Dict[str, Tuple[Quantity, Quantity]] = {}
+        for componentID in componentIDs:
+            component = self.components.get(componentID)
+            if component is None or key not in component.data:
+                continue
+            if component.data[key] != value:
+                # quantities can not be changed, so they are shared instead of copied
+                changes[componentID] = (
+                    Quantity.fromPair(component.data[key]),
+                    Quantity.fromPair(value),
+                )
+
+        if changes:
+            self.undoStack.push(SetComponentsDataCommand(self, key, changes))
+        return list(changes.keys())
+
+    def applyComponentsData(self, key: str, values: Dict[str, Quantity]) -> List[str]:
+        """
+        Function that sets a property of components to the given values in one batch. Used by the undo stack.
+
+        Params:
+            key: `str` - the key of the property. eg: "R"
+            values: `Dict[str, Quantity]` - component uniqueID to new value pairs
+
+        Returns:
+            `List[str]` the IDs of the components whose data changed
+        """
+        changedIDs: List[str] = []
+        self.viewport().setUpdatesEnabled(False)
+        try:
+            for componentID, value in values.items():
+                component = self.components.get(componentID)
+                if component is None:
+                    continue
+                if component.setComponentData(key, value, notify=False):
+                    component.updateText()
+                    changedIDs.append(componentID)
+        finally:
+            self.viewport().setUpdatesEnabled(True)
+
+        if changedIDs:
+            self.scene().update()
+            self.onComponentsDataChanged(changedIDs)
+        return changedIDs
+
+    def setSelectedComponentsData(self, key: str, value: Quantity) -> List[str]:
+        """
+        Function that sets a property of every selected component that has it. See `setComponentsData`.
+        """
+        return self.setComponentsData(self.selectedComponentsIDs.copy(), key, value)
+
+    def onComponentsDataChanged(self, componentIDs: List[str]):
+        """
+        Function that marks the last simulation as outdated and passes the change on, once per edit
+        """
+        self.simulationOutdated = True
+        self.signals.componentsDataChanged.emit(componentIDs)
+        self.signals.designChanged.emit(componentIDs)
+
     def rotateSelectedComponents(self):
-        for componentID in self.selectedComponentsIDs:
+        if self.selectedComponentsIDs:
+            self.undoStack.push(
+                RotateComponentsCommand(self, self.selectedComponentsIDs)
+            )
+
+    def rotateComponents(self, componentIDs: List[str], angle: float):
+        """
+        Function that rotates components by the given angle in degrees. Used by the undo stack.
+        """
+        for componentID in componentIDs:
             component = self.components.get(componentID)
-            component.rotate()
+            if component is not None:
+                component.setRotation(component.rotation() + angle)
+        self.signals.designChanged.emit(list(componentIDs))
+
+    def setComponentPosition(self, componentID: str, pos: QPointF):
+        """
+        Function that moves a component to the given position and lets its wires know. Used by the undo stack.
+        """
+        component = self.components.get(componentID)
+        if component is None or component.pos() == pos:
+            return
+        component.setPos(pos)
+        component.signals.componentMoved.emit()
+        self.scene().includeRect(component.sceneBoundingRect())
+        self.scene().update()
+        self.signals.designChanged.emit([componentID])
 
     def onComponentSelected(self, uniqueID: str):
         self.selectedComponentsIDs.append(uniqueID)
@@ -138,9 +650,93 @@ class Canvas(QGraphicsView):
 
     def onWireSelected(self, uniqueID: str):
         self.selectedWireIDs.append(uniqueID)
+        wire = self.wires.get(uniqueID)
+        if wire is not None and wire.circuitNode is not None:
+            self.highlightNet(wire.circuitNode.uniqueID)
+            self.signals.nodeSelected.emit(wire.circuitNode.uniqueID)
 
     def onWireDeselected(self, uniqueID: str):
         self.selectedWireIDs.remove(uniqueID)
+        if not self.selectedWireIDs:
+            self.highlightNet(None)
+
+    def onDesignChanged(self, uniqueIDs: List[str]) -> None:
+        """
+        Function that updates the connectivity index with the nodes an edit touched. The nodes of the touched components
+        and wires are updated too, since dragging a component off the end of a wire disconnects it from the node
+        without the node being part of the edit.
+        """
+        netIDs: Dict[str, None] = {}
+        for uniqueID in uniqueIDs:
+            component = self.components.get(uniqueID)
+            if component is not None:
+                netIDs.update(
+                    dict.fromkeys(self.connectivity.netsOf(uniqueID).values())
+                )
+                netIDs.update(
+                    dict.fromkeys(
+                        node.uniqueID for node in component.terminalNodes.values()
+                    )
+                )
+                continue
+            wire = self.wires.get(uniqueID)
+            if wire is not None:
+                if wire.circuitNode is not None:
+                    netIDs[wire.circuitNode.uniqueID] = None
+                continue
+            # a node, or a component or wire that was deleted. their nodes are part of the same edit
+            netIDs[uniqueID] = None
+
+        for netID in netIDs:
+            node = self.circuitNodes.get(netID)
+            if node is not None:
+                self.connectivity.updateNet(netID, node.componentTerminals)
+            elif netID in self.connectivity.netTerminals:
+                self.connectivity.updateNet(netID, None)
+
+        if self.highlightedNetID in netIDs:
+            self.highlightNet(self.highlightedNetID)
+
+    def highlightNet(self, netID: Optional[str]) -> None:
+        """
+        Function that draws the wires and terminals of a node highlighted. The node highlighted before is drawn normally again.
+
+        Params:
+            netID: `str` - the uniqueID of the node to highlight. `None` to only clear the highlight
+        """
+        for item in self.highlightedItems:
+            if isinstance(item, Wire):
+                item.setHighlighted(False)
+            else:
+                item.setHighlightedTerminals(())
+        self.highlightedItems = []
+        node = self.circuitNodes.get(netID) if netID is not None else None
+        self.highlightedNetID = node.uniqueID if node is not None else None
+        if node is None:
+            return
+
+        for wire in node.wires:
+            wire.setHighlighted(True)
+            self.highlightedItems.append(wire)
+        terminalIndices: Dict[str, List[int]] = {}
+        for componentID, terminalIndex in self.connectivity.terminalsOf(node.uniqueID):
+            terminalIndices.setdefault(componentID, []).append(terminalIndex)
+        for componentID, indices in terminalIndices.items():
+            component = self.components.get(componentID)
+            if component is not None:
+                component.setHighlightedTerminals(tuple(indices))
+                self.highlightedItems.append(component)
+
+    def connectedTerminals(
+        self, componentID: str, terminalIndex: int
+    ) -> List[Tuple[str, int]]:
+        """
+        Function that returns the terminals connected to a terminal, through the node it's on
+
+        Returns:
+            `List[Tuple[str, int]]` (componentID, terminalIndex) of the other terminals on the node. Empty if it's not connected
+        """
+        return self.connectivity.connectedTerminals(componentID, terminalIndex)
 
     def deleteWires(self, wireIDs: List[str]):
         """
@@ -149,6 +745,13 @@ class Canvas(QGraphicsView):
         Params:
             wireIDs: `List[str]` - a list of the IDs of the wires to delete
         """
+        wires = [self.wires[wireID] for wireID in wireIDs if wireID in self.wires]
+        if not wires:
+            return
+        with self.recordCircuitEdit("Delete Wires", wires=wires):
+            self._deleteWires(wireIDs)
+
+    def _deleteWires(self, wireIDs: List[str]):
         for wireID in wireIDs:
             # Don't preceed if the wire doesn't exist
             wire = self.wires.get(wireID)
@@ -200,8 +803,14 @@ class Canvas(QGraphicsView):
             uniqueID (str): Unique ID of the component.
             terminalIndex (int): Index of the terminal that has been clicked.
         """
-        # Only proceed if the wire tool is active.
+        # Without the wire tool, clicking a terminal highlights the node it's on
         if not self.wireToolActive:
+            netID = self.connectivity.netOf(uniqueID, terminalIndex)
+            self.highlightNet(netID)
+            if netID is not None:
+                logger.info(
+                    f"{uniqueID} terminal {terminalIndex} is on {netID}, connected to {self.connectedTerminals(uniqueID, terminalIndex)}"
+                )
             return
 
         # Fetch the component associated with the uniqueID.
@@ -227,13 +836,11 @@ class Canvas(QGraphicsView):
         # Create new wire and assign start position.
         self.currentWire = Wire(
             start=ComponentAndTerminalIndex(component, terminalIndex),
-            wireCount=len(self.wires),
+            wireCount=self.generateUniqueCount(Wire.name, self.wires),
         )
 
         # Connect signals for wire interaction events.
-        self.currentWire.signals.wireClicked.connect(self.onWireClick)
-        self.currentWire.signals.wireSelected.connect(self.onWireSelected)
-        self.currentWire.signals.wireDeselected.connect(self.onWireDeselected)
+        self.connectWireSignals(self.currentWire)
 
         # Register the clicked terminal.
         self.clickedTerminals.append((component.uniqueID, terminalIndex))
@@ -250,27 +857,51 @@ class Canvas(QGraphicsView):
         # Register terminal click and prevent connecting a wire to the same terminal twice.
         terminal = (component.uniqueID, terminalIndex)
         if terminal not in self.clickedTerminals:
-            # Set wire end position.
-            self.currentWire.setEnd(
-                end=ComponentAndTerminalIndex(component, terminalIndex)
-            )
-
-            # Register the clicked terminal.
-            self.clickedTerminals.append(terminal)
-
-            # Register the completed wire.
-            self.wires[self.currentWire.uniqueID] = self.currentWire
-
-            # Update nodes when connection is done and assign circuit node to wire.
-            node = self.update_circuit_nodes()
-            self.currentWire.setCircuitNode(node)
-
-            # Register the new wire with the circuit node.
-            node.addNewWires([self.currentWire])
+            with self.recordConnection(components=[component]):
+                # Set wire end position.
+                self.currentWire.setEnd(
+                    end=ComponentAndTerminalIndex(component, terminalIndex)
+                )
+
+                # Register the clicked terminal.
+                self.clickedTerminals.append(terminal)
+
+                # Register the completed wire.
+                self.wires[self.currentWire.uniqueID] = self.currentWire
+                self.scene().includeRect(self.currentWire.sceneBoundingRect())
+
+                # Update nodes when connection is done and assign circuit node to wire.
+                node = self.update_circuit_nodes()
+                self.currentWire.setCircuitNode(node)
+
+                # Register the new wire with the circuit node.
+                node.addNewWires([self.currentWire])
+
+                # Reset for next wire creation process.
+                self.clickedTerminals.clear()
+                self.currentWire = None
+
+    @contextmanager
+    def recordConnection(
+        self, components: Iterable[GeneralComponent] = (), wires: Iterable[Wire] = ()
+    ):
+        """
+        Context manager that records the completion of the current wire on the undo stack.
+        Nodes merged by the connection are part of the same edit.
 
-            # Reset for next wire creation process.
-            self.clickedTerminals.clear()
-            self.currentWire = None
+        Params:
+            components, wires: the component or wire the current wire is finished on
+        """
+        components = list(components)
+        wires = list(wires)
+        # the terminals and wires clicked to start the current wire
+        for uniqueID, _ in self.clickedTerminals:
+            if uniqueID in self.components:
+                components.append(self.components[uniqueID])
+            elif uniqueID in self.wires:
+                wires.append(self.wires[uniqueID])
+        with self.recordCircuitEdit("Connect", components=components, wires=wires):
+            yield
 
     def onWireClick(self, uniqueID: str, point: QPointF):
         """
@@ -316,12 +947,10 @@ class Canvas(QGraphicsView):
         # Create new wire and assign start position.
         self.currentWire = Wire(
             start=(wire, point),
-            wireCount=len(self.wires),
+            wireCount=self.generateUniqueCount(Wire.name, self.wires),
         )
         # Connect signals for wire interaction events.
-        self.currentWire.signals.wireClicked.connect(self.onWireClick)
-        self.currentWire.signals.wireSelected.connect(self.onWireSelected)
-        self.currentWire.signals.wireDeselected.connect(self.onWireDeselected)
+        self.connectWireSignals(self.currentWire)
 
         # Register the clicked wire.
         self.clickedTerminals.append((wire.uniqueID, QPointF))
@@ -343,25 +972,27 @@ class Canvas(QGraphicsView):
         if wire.uniqueID in wireIDs:
             return
 
-        # Set wire end position.
-        self.currentWire.setEnd(end=(wire, point))
+        with self.recordConnection(wires=[wire]):
+            # Set wire end position.
+            self.currentWire.setEnd(end=(wire, point))
 
-        # Register the clicked wire in the clicked terminals
-        self.clickedTerminals.append((wire.uniqueID, QPointF))
+            # Register the clicked wire in the clicked terminals
+            self.clickedTerminals.append((wire.uniqueID, QPointF))
 
-        # Register the completed wire
-        self.wires[self.currentWire.uniqueID] = self.currentWire
+            # Register the completed wire
+            self.wires[self.currentWire.uniqueID] = self.currentWire
+            self.scene().includeRect(self.currentWire.sceneBoundingRect())
 
-        # Update nodes when connection is done and assign circuit node to wire.
-        node = self.update_circuit_nodes()
-        self.currentWire.setCircuitNode(node)
+            # Update nodes when connection is done and assign circuit node to wire.
+            node = self.update_circuit_nodes()
+            self.currentWire.setCircuitNode(node)
 
-        # Register the new wire with the circuit node.
-        node.addNewWires([self.currentWire])
+            # Register the new wire with the circuit node.
+            node.addNewWires([self.currentWire])
 
-        # Reset for next wire creation process.
-        self.clickedTerminals.clear()
-        self.currentWire = None
+            # Reset for next wire creation process.
+            self.clickedTerminals.clear()
+            self.currentWire = None
 
     def rerenderItem(self, item) -> None:
         if item in self.scene().items():
@@ -389,7 +1020,9 @@ class Canvas(QGraphicsView):
 
     def _create_new_node_if_no_existing_nodes(self) -> CircuitNode:
         """Creates a new node if there are no existing nodes"""
-        node = CircuitNode(len(self.circuitNodes))
+        node = CircuitNode(
+            self.generateUniqueCount(CircuitNode.name, self.circuitNodes)
+        )
         node.addComponentTerminals(self.clickedTerminals)
 
         # Register the newly created node
@@ -477,38 +1110,14 @@ class Canvas(QGraphicsView):
         # Initialize an empty set to keep track of existing nodes that intersect with the new terminals
         nodesIntersectedWith: set = set()
 
-        # Check if there are existing circuitNodes
-        # If yes, iterate through each of these circuit nodes
-        for nodeID in self.circuitNodes.keys():
-            # Fetch the current circuit node based on nodeID
-            circuitNode = self.circuitNodes.get(nodeID)
-
-            # Convert the clicked terminals to a set, these are the new terminals being added
-            newTerminals = set(self.clickedTerminals)
-
-            # Convert the terminals of the current circuit node to a set, these are the existing terminals
-            oldTerminals = set(circuitNode.componentTerminals)
-
-            # Find the common terminals between new and old terminals
-            intersections = newTerminals.intersection(oldTerminals)
-
-            if len(intersections) == 0:
-                # This implies that the new terminals don't intersect with the current circuit node
-                # Move to the next circuit node
+        # Look up the node of each new terminal in the connectivity index instead of scanning every circuit node
+        for terminal in self.clickedTerminals:
+            nodeID = self.connectivity.netOf(*terminal)
+            if nodeID is None:
+                # The terminal is not part of any node yet
                 continue
-            elif len(intersections) == 1:
-                # Only one of the new terminals intersects with the current node
-                # Add this terminal to the set that keeps track of terminals intersected with
-                terminalIntersections.add(next(iter(intersections)))
-                # Similarly, add the current node's ID to the set that keeps track of intersected nodes
-                nodesIntersectedWith.add(nodeID)
-            elif len(intersections) == 2:
-                # Both new terminals intersect with the current node
-                # Add these terminals to the set that keeps track of terminals intersected with
-                for intersection in iter(intersections):
-                    terminalIntersections.add(intersection)
-                # Add the current node's ID to the set that keeps track of intersected nodes
-                nodesIntersectedWith.add(nodeID)
+            terminalIntersections.add(terminal)
+            nodesIntersectedWith.add(nodeID)
 
         return terminalIntersections, nodesIntersectedWith
 
@@ -565,11 +1174,39 @@ class Canvas(QGraphicsView):
                 self.currentWire.addNewPoint(clickedPoint)
                 # update the wire component on the scene to make the current wire show
                 self.rerenderItem(self.currentWire)
+        elif self.highlightedNetID is not None and self.itemAt(event.pos()) is None:
+            # clicking the empty canvas clears the highlighted node
+            self.highlightNet(None)
+
+        super().mousePressEvent(event)
+
+        # start recording the drag of the component under the mouse, if any
+        grabbedItem = self.scene().mouseGrabberItem()
+        if isinstance(grabbedItem, GeneralComponent):
+            self.dragCount += 1
+            self.draggedComponent = (grabbedItem.uniqueID, QPointF(grabbedItem.pos()))
 
-        return super().mousePressEvent(event)
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        super().mouseMoveEvent(event)
+
+        # record each step of a component drag. the steps of one drag merge into a single undo command
+        if self.draggedComponent is not None:
+            componentID, lastPos = self.draggedComponent
+            component = self.components.get(componentID)
+            if component is not None and component.pos() != lastPos:
+                newPos = QPointF(component.pos())
+                self.undoStack.push(
+                    MoveComponentCommand(
+                        self, componentID, lastPos, newPos, self.dragCount
+                    )
+                )
+                self.draggedComponent = (componentID, newPos)
+                self.scene().includeRect(component.sceneBoundingRect())
+                self.signals.designChanged.emit([componentID])
 
     def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
         super().mouseReleaseEvent(event)
+        self.draggedComponent = None
         self.scene().update()
 
     def normalizePointToGrid(self, p: QPointF) -> QPointF:
@@ -578,42 +1215,192 @@ class Canvas(QGraphicsView):
         return QPointF(x, y)
 
     def onSimulateButtonClick(self):
+        if not self.simulationWorker.submit(self.circuitModel()):
+            logger.info("A simulation is already running.")
+            return
         logger.info("Simulating...")
+        # edits made while the simulation runs mark it as outdated again
+        self.simulationOutdated = False
 
-        # create a circuit simulator instance with current data
-        circuitSimulator = CircuitSimulator(
-            components=self.components, circuitNodes=self.circuitNodes
-        )
-
-        # simulate the circuit
-        results = circuitSimulator.simulate()
-
+    def onSimulationFinished(self, results: Optional["SharedResults"]):
         if results is None:
             # if simulation fails and there is no results
+            self.simulationOutdated = True
             return
 
+        # the results of the previous simulation are no longer needed
+        self.releaseSimulationResults()
+        self.simulationResults = results
+
         # set the simulated node voltages
         self.setSimulatedNodeVoltages(results=results)
         # set simulation results for components
         self.setComponentsSimulationResults(results)
 
-    def setSimulatedNodeVoltages(self, results: Dict[str, Dict[str, List[str]]]):
-        voltages = results.get("voltages")
-        for nodeID in self.circuitNodes.keys():
-            nodeData = voltages.get(nodeID.lower())
-            # add node data to the node
-            self.circuitNodes.get(nodeID).setNodeData("V", nodeData)
-
-    def setComponentsSimulationResults(self, results: Dict[str, Dict[str, List[str]]]):
-        currents = results.get("currents")
-        components = self.components
-
-        for componentID in components.keys():
-            for currentKey in currents.keys():
-                if componentID.lower() in currentKey:
-                    # the current is for that component
-                    # set the current of that component to the simulation current
-                    components.get(componentID).setSimulationResults(
-                        "I", currents.get(currentKey)
-                    )
-                    break
+    def onTransientButtonClick(self, stop: float):
+        """
+        Function that starts a transient analysis of the circuit from 0 to the given time, in seconds
+        """
+        path = tempfile.mkdtemp(prefix="simit-waveforms-")
+        step = stop / constants.TRANSIENT_STEPS
+        if not self.simulationWorker.submitTransient(
+            self.circuitModel(), step, stop, path
+        ):
+            shutil.rmtree(path, ignore_errors=True)
+            logger.info("A simulation is already running.")
+            return
+        logger.info("Simulating transient...")
+        self.pendingWaveformsPath = path
+
+    def onTransientFinished(self, waveforms: Optional["WaveformStore"]):
+        path, self.pendingWaveformsPath = self.pendingWaveformsPath, None
+        if waveforms is None:
+            # remove whatever was written before the analysis failed
+            if path is not None:
+                shutil.rmtree(path, ignore_errors=True)
+            return
+
+        previous, self.waveforms = self.waveforms, waveforms
+        # the views let go of the previous waveforms before their files are removed
+        self.signals.waveformsReady.emit(waveforms)
+        self.releaseWaveforms(previous)
+
+    def releaseWaveforms(self, waveforms: Optional["WaveformStore"]):
+        """
+        Function that removes the files of the given waveforms
+        """
+        if waveforms is not None:
+            waveforms.close()
+            shutil.rmtree(waveforms.path, ignore_errors=True)
+
+    def releaseSimulationResults(self):
+        """
+        Function that frees the shared memory of the results of the last simulation
+        """
+        if self.simulationResults is not None:
+            self.simulationResults.unlink()
+            self.simulationResults = None
+
+    def shutdown(self):
+        """
+        Function that stops the simulation worker and the autosave and frees the last results and waveforms.
+        Called when the app closes
+        """
+        self.autosave.stop()
+        self.simulationWorker.shutdown()
+        self.releaseSimulationResults()
+        self.releaseWaveforms(self.waveforms)
+        self.waveforms = None
+        if self.pendingWaveformsPath is not None:
+            shutil.rmtree(self.pendingWaveformsPath, ignore_errors=True)
+            self.pendingWaveformsPath = None
+
+    def circuitModel(self) -> CircuitModel:
+        """
+        Function that returns the model of the circuit on the canvas. The model shares the component and node models
+        the items on the canvas are views over, so nothing is copied.
+        """
+        return CircuitModel.fromModels(
+            (component.model for component in self.components.values()),
+            (node.model for node in self.circuitNodes.values()),
+        )
+
+    def importNetlist(self, path: str) -> None:
+        """
+        Function that reads a SPICE deck and places its circuit on the canvas, below the design already on it.
+        The deck is read a line at a time. The import is undone in one step.
+
+        Params:
+            path: `str` - the path of the deck. eg: "amplifier.cir"
+
+        Raises:
+            OSError: if the deck can not be read
+        """
+        itemsRect = self.scene().itemsBoundingRect()
+        origin = (0, 0)
+        if self.components:
+            origin = (
+                itemsRect.left(),
+                itemsRect.bottom() + constants.NETLIST_CELL_MARGIN,
+            )
+        layout = NetlistLayout(
+            ChainMap(self.components, self.wires, self.circuitNodes), origin
+        )
+        with open(path, encoding="utf-8") as f:
+            reader = NetlistReader(f)
+            state = layout.design(reader.iterElements())
+        self.loadDesign(state, undoText=f"Import {os.path.basename(path)}")
+        self.zoomToFit()
+        logger.info(
+            f"Imported {len(state.components)} components and {len(state.nodes)} nodes from {path}"
+        )
+        if reader.skipped:
+            logger.warning(f"Elements not imported: {dict(reader.skipped)}")
+
+    def exportNetlist(self, path: str) -> None:
+        """
+        Function that writes the circuit on the canvas to a SPICE deck, with the same netlist writer simulations use.
+        The deck has no current probes, so importing it gives back the same circuit.
+
+        Params:
+            path: `str` - the path of the deck. eg: "amplifier.cir"
+
+        Raises:
+            OSError: if the deck can not be written
+        """
+        CircuitSimulator(self.circuitModel(), currentProbes=False).writeNetlist(path)
+        logger.info(f"Netlist exported to {path}")
+
+    def setSimulatedNodeVoltages(self, results: "SharedResults"):
+        """
+        Function that back-annotates the simulated voltages onto the circuit nodes.
+
+        The new voltages are diffed against the ones the nodes already have and only the nodes whose voltage changed
+        are signalled. Viewport updates are held back while the wire labels change so they are drawn in one update.
+        """
+        # find the nodes whose voltage changed without notifying anything yet
+        changedNodes: List[CircuitNode] = []
+        for nodeID, node in self.circuitNodes.items():
+            voltage = results.value("nodeVoltages", "nodes", nodeID.lower())
+            nodeData = [f"{voltage:.4f}", "V"] if voltage is not None else None
+            if node.setNodeData("V", nodeData, notify=False):
+                changedNodes.append(node)
+
+        if not changedNodes:
+            return
+
+        # update the labels of the changed nodes in one batch
+        self.viewport().setUpdatesEnabled(False)
+        try:
+            for node in changedNodes:
+                node.notifyDataChanged()
+        finally:
+            self.viewport().setUpdatesEnabled(True)
+        self.scene().update()
+
+    def signalFanOutReport(self) -> Dict[str, int]:
+        """
+        Function that reports how many slots the nodeDataChanged signal of every circuit node fans out to.
+        A node should fan out to one slot per wire. Any node with more connections than wires is logged as a leak.
+
+        Returns:
+            `Dict[str, int]` node uniqueID to number of connected slots pairs
+        """
+        report: Dict[str, int] = {}
+        for nodeID, node in self.circuitNodes.items():
+            fanOut = signalFanOut(node.signals, "nodeDataChanged")
+            report[nodeID] = fanOut
+            if fanOut > len(node.wires):
+                logger.warning(
+                    f"{nodeID} signals {fanOut} slots but has {len(node.wires)} wires"
+                )
+        return report
+
+    def setComponentsSimulationResults(self, results: "SharedResults"):
+        """
+        Function that sets the simulated current of every component. The currents are already keyed by component uniqueID
+        """
+        for componentID, component in self.components.items():
+            current = results.value("componentCurrents", "components", componentID)
+            if current is not None:
+                component.setSimulationResults("I", [f"{current:.4f}", "A"])
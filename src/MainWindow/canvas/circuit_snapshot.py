@@ -0,0 +1,159 @@
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+from components.general import GeneralComponent
+from components.wire import Wire
+from SimulationBackend.middleware import CircuitNode
+
+if TYPE_CHECKING:
+    from .canvas import Canvas
+
+
+class CircuitSnapshot:
+    """
+    The connectivity state of the part of a circuit an edit touches.
+
+    Only the given components, wires and nodes are recorded, together with their direct neighbours:
+    the nodes the components and wires are connected to, and the wires and components of those nodes.
+    Two snapshots, taken before and after an edit, make up the delta the edit can be undone and redone with.
+    The rest of the circuit is never copied, so the size of a snapshot does not grow with the size of the design.
+    """
+
+    def __init__(
+        self,
+        canvas: "Canvas",
+        components: Iterable[GeneralComponent] = (),
+        wires: Iterable[Wire] = (),
+        nodes: Iterable[CircuitNode] = (),
+        expand: bool = True,
+    ) -> None:
+        self.canvas = canvas
+
+        # component to (on canvas, terminalIndex to node pairs)
+        self.components: Dict[
+            GeneralComponent, Tuple[bool, Dict[int, CircuitNode]]
+        ] = {}
+        # wire to (on canvas, on scene, node)
+        self.wires: Dict[Wire, Tuple[bool, bool, CircuitNode | None]] = {}
+        # node to (on canvas, component terminals, wires)
+        self.nodes: Dict[
+            CircuitNode, Tuple[bool, List[Tuple[str, int]], List[Wire]]
+        ] = {}
+
+        if expand:
+            components, wires, nodes = self.expand(components, wires, nodes)
+        for component in components:
+            self.components[component] = (
+                canvas.components.get(component.uniqueID) is component,
+                dict(component.terminalNodes),
+            )
+        for wire in wires:
+            self.wires[wire] = (
+                canvas.wires.get(wire.uniqueID) is wire,
+                wire.scene() is not None,
+                wire.circuitNode,
+            )
+        for node in nodes:
+            self.nodes[node] = (
+                canvas.circuitNodes.get(node.uniqueID) is node,
+                list(node.componentTerminals),
+                list(node.wires),
+            )
+
+    def expand(
+        self,
+        components: Iterable[GeneralComponent],
+        wires: Iterable[Wire],
+        nodes: Iterable[CircuitNode],
+    ) -> Tuple[List[GeneralComponent], List[Wire], List[CircuitNode]]:
+        """
+        A function that adds the direct neighbours of the given objects to them
+
+        Returns:
+            The components, wires and nodes to record, without duplicates
+        """
+        components = list(components)
+        wires = list(wires)
+        nodes = list(nodes)
+
+        for component in components:
+            nodes.extend(component.terminalNodes.values())
+        for wire in wires:
+            if wire.circuitNode is not None:
+                nodes.append(wire.circuitNode)
+        nodes = list(dict.fromkeys(nodes))
+
+        for node in nodes:
+            wires.extend(node.wires)
+            for componentID, _ in node.componentTerminals:
+                component = self.canvas.components.get(componentID)
+                if component is not None:
+                    components.append(component)
+
+        return (list(dict.fromkeys(components)), list(dict.fromkeys(wires)), nodes)
+
+    def objects(self) -> Tuple[List[GeneralComponent], List[Wire], List[CircuitNode]]:
+        return list(self.components), list(self.wires), list(self.nodes)
+
+    def uniqueIDs(self) -> List[str]:
+        """
+        A function that returns the uniqueIDs of the recorded components, wires and nodes
+        """
+        return [
+            *(component.uniqueID for component in self.components),
+            *(wire.uniqueID for wire in self.wires),
+            *(node.uniqueID for node in self.nodes),
+        ]
+
+    def addMissing(self, other: "CircuitSnapshot") -> None:
+        """
+        A function that records the objects only the other snapshot has as not being part of the circuit.
+        Used on the snapshot taken before an edit, for the objects the edit created.
+        """
+        for component in other.components:
+            self.components.setdefault(component, (False, {}))
+        for wire in other.wires:
+            self.wires.setdefault(wire, (False, False, None))
+        for node in other.nodes:
+            self.nodes.setdefault(node, (False, [], []))
+
+    def restore(self) -> None:
+        """
+        A function that puts the recorded objects back in the recorded state
+        """
+        canvas = self.canvas
+        scene = canvas.scene()
+
+        for node, (onCanvas, componentTerminals, wires) in self.nodes.items():
+            node.componentTerminals = list(componentTerminals)
+            node.wires = list(wires)
+            if onCanvas:
+                canvas.circuitNodes[node.uniqueID] = node
+            elif canvas.circuitNodes.get(node.uniqueID) is node:
+                del canvas.circuitNodes[node.uniqueID]
+
+        for component, (onCanvas, terminalNodes) in self.components.items():
+            component.terminalNodes = dict(terminalNodes)
+            if onCanvas:
+                canvas.components[component.uniqueID] = component
+                if component.scene() is None:
+                    scene.addItem(component)
+            elif canvas.components.get(component.uniqueID) is component:
+                component.setSelected(False)
+                scene.removeItem(component)
+                del canvas.components[component.uniqueID]
+
+        for wire, (onCanvas, onScene, node) in self.wires.items():
+            wire.setCircuitNode(node)
+            if onCanvas:
+                canvas.wires[wire.uniqueID] = wire
+            elif canvas.wires.get(wire.uniqueID) is wire:
+                del canvas.wires[wire.uniqueID]
+            if onScene and wire.scene() is None:
+                scene.addItem(wire)
+            elif not onScene and wire.scene() is not None:
+                wire.setSelected(False)
+                scene.removeItem(wire)
+
+        canvas.updateDesignMode()
+        scene.update()
+        canvas.signals.designChanged.emit(self.uniqueIDs())
@@ -0,0 +1,141 @@
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QUndoCommand
+
+from .circuit_snapshot import CircuitSnapshot
+
+if TYPE_CHECKING:
+    from components.types import Quantity
+    from .canvas import Canvas
+
+
+# ids of the commands that can merge with the command before them
+MOVE_COMMAND_ID = 1
+SET_DATA_COMMAND_ID = 2
+
+
+class CircuitEditCommand(QUndoCommand):
+    """
+    An undoable change to the connectivity of the circuit: adding or deleting components and wires,
+    connecting terminals and merging nodes.
+
+    The command holds the snapshots of the touched part of the circuit taken before and after the edit.
+    The edit has already been applied when the command is pushed, so redoing it the first time restores the state it's already in.
+    """
+
+    def __init__(
+        self, text: str, before: CircuitSnapshot, after: CircuitSnapshot
+    ) -> None:
+        super(CircuitEditCommand, self).__init__(text)
+        self.before = before
+        self.after = after
+
+    def undo(self) -> None:
+        self.before.restore()
+
+    def redo(self) -> None:
+        self.after.restore()
+
+
+class MoveComponentCommand(QUndoCommand):
+    """
+    An undoable move of a component. The steps of one drag are merged into a single command.
+    """
+
+    def __init__(
+        self,
+        canvas: "Canvas",
+        componentID: str,
+        oldPos: QPointF,
+        newPos: QPointF,
+        dragID: int,
+    ) -> None:
+        super(MoveComponentCommand, self).__init__(f"Move {componentID}")
+        self.canvas = canvas
+        self.componentID = componentID
+        self.oldPos = QPointF(oldPos)
+        self.newPos = QPointF(newPos)
+        # the drag the move belongs to. only steps of the same drag are merged
+        self.dragID = dragID
+
+    def id(self) -> int:
+        return MOVE_COMMAND_ID
+
+    def mergeWith(self, other: QUndoCommand) -> bool:
+        if (
+            not isinstance(other, MoveComponentCommand)
+            or other.dragID != self.dragID
+            or other.componentID != self.componentID
+        ):
+            return False
+        self.newPos = QPointF(other.newPos)
+        return True
+
+    def undo(self) -> None:
+        self.canvas.setComponentPosition(self.componentID, self.oldPos)
+
+    def redo(self) -> None:
+        self.canvas.setComponentPosition(self.componentID, self.newPos)
+
+
+class RotateComponentsCommand(QUndoCommand):
+    """
+    An undoable rotation of components by a quarter turn
+    """
+
+    def __init__(self, canvas: "Canvas", componentIDs: List[str]) -> None:
+        super(RotateComponentsCommand, self).__init__("Rotate")
+        self.canvas = canvas
+        self.componentIDs = list(componentIDs)
+
+    def undo(self) -> None:
+        self.canvas.rotateComponents(self.componentIDs, -90)
+
+    def redo(self) -> None:
+        self.canvas.rotateComponents(self.componentIDs, 90)
+
+
+class SetComponentsDataCommand(QUndoCommand):
+    """
+    An undoable change of a property of one or more components.
+    Consecutive changes of the same property of the same components, like typing a value digit by digit, are merged.
+    """
+
+    def __init__(
+        self,
+        canvas: "Canvas",
+        key: str,
+        changes: Dict[str, Tuple["Quantity", "Quantity"]],
+    ) -> None:
+        super(SetComponentsDataCommand, self).__init__(f"Set {key}")
+        self.canvas = canvas
+        self.key = key
+        # component uniqueID to (old value, new value) pairs
+        self.changes = changes
+
+    def id(self) -> int:
+        return SET_DATA_COMMAND_ID
+
+    def mergeWith(self, other: QUndoCommand) -> bool:
+        if (
+            not isinstance(other, SetComponentsDataCommand)
+            or other.key != self.key
+            or other.changes.keys() != self.changes.keys()
+        ):
+            return False
+        for componentID, (_, newValue) in other.changes.items():
+            self.changes[componentID] = (self.changes[componentID][0], newValue)
+        return True
+
+    def undo(self) -> None:
+        self.canvas.applyComponentsData(
+            self.key,
+            {componentID: old for componentID, (old, _) in self.changes.items()},
+        )
+
+    def redo(self) -> None:
+        self.canvas.applyComponentsData(
+            self.key,
+            {componentID: new for componentID, (_, new) in self.changes.items()},
+        )
@@ -1,5 +1,9 @@
+import math
+from contextlib import contextmanager
+
 from PyQt6.QtWidgets import QGraphicsScene
 from PyQt6.QtGui import QPen, QColor
+from PyQt6.QtCore import QRectF
 
 import constants
 
@@ -14,6 +18,90 @@ class GridScene(QGraphicsScene):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.gridPen = QPen(QColor(50, 50, 50))
+        # True when the scene rect is fixed to the bounds of the design instead of growing with the items
+        self.sceneRectFixed = False
+        # number of bulk operations running. the item index is rebuilt once the last one is done
+        self.indexSuspensions = 0
+        # depth of the BSP tree. 0 lets Qt pick it. kept here as turning the index off drops it
+        self.bspDepth = 0
+
+    @staticmethod
+    def bspTreeDepthFor(itemCount: int) -> int:
+        """
+        Function that returns the depth of the BSP tree for the given number of items, within the depth limits.
+        Qt picks log2 of the number of items and rebuilds the tree every time the number crosses a power of two.
+        The depth here is one level deeper, so the design can double in size before the tree gets too shallow.
+        """
+        depth = math.ceil(math.log2(max(itemCount, 1))) + 1
+        return min(max(depth, constants.MIN_BSP_DEPTH), constants.MAX_BSP_DEPTH)
+
+    def setLargeDesignMode(self, enabled: bool, itemCount: int = 0) -> None:
+        """
+        Function that tunes the scene for large designs or back to the default tuning.
+
+        For large designs the BSP tree gets a fixed depth sized for the number of items, and the scene rect is fixed
+        to the bounds of the design. Qt rebuilds the whole tree when the depth it picks changes and when the scene rect
+        grows, which it does every time an item moves past the items bounding rect.
+
+        Params:
+            enabled: `bool` - True to tune the scene for large designs
+            itemCount: `int` - the number of items of the design
+        """
+        self.bspDepth = self.bspTreeDepthFor(itemCount) if enabled else 0
+        if self.indexSuspensions == 0:
+            self.setBspTreeDepth(self.bspDepth)
+        if enabled:
+            self.fitSceneRect()
+        else:
+            # a null rect lets the scene rect grow with the items again
+            self.setSceneRect(QRectF())
+            self.sceneRectFixed = False
+
+    def fitSceneRect(self) -> None:
+        """
+        Function that fixes the scene rect to the bounds of the items, with a margin around them
+        """
+        margin = constants.SCENE_MARGIN
+        self.setSceneRect(
+            self.itemsBoundingRect().adjusted(-margin, -margin, margin, margin)
+        )
+        self.sceneRectFixed = True
+
+    def includeRect(self, rect: QRectF) -> None:
+        """
+        Function that grows a fixed scene rect so it contains the given rect, with a margin around it.
+        Nothing is done if the scene rect is not fixed or already contains the rect.
+
+        Every change of the scene rect rebuilds the BSP tree, so the margin grows with the design:
+        dragging an item past the edge rebuilds the tree a few times, not at every step.
+        """
+        sceneRect = self.sceneRect()
+        if not self.sceneRectFixed or sceneRect.contains(rect):
+            return
+        margin = max(
+            constants.SCENE_MARGIN, max(sceneRect.width(), sceneRect.height()) / 4
+        )
+        self.setSceneRect(
+            sceneRect.united(rect.adjusted(-margin, -margin, margin, margin))
+        )
+
+    @contextmanager
+    def suspendIndex(self):
+        """
+        Context manager that turns the item index off while items are added, moved or removed in bulk.
+        Without it the BSP tree is updated for every item. The index is rebuilt once, when the body is done.
+        Bulk operations can be nested.
+        """
+        if self.indexSuspensions == 0:
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        self.indexSuspensions += 1
+        try:
+            yield
+        finally:
+            self.indexSuspensions -= 1
+            if self.indexSuspensions == 0:
+                self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+                self.setBspTreeDepth(self.bspDepth)
 
     def drawBackground(self, painter, rect):
         """
@@ -29,6 +117,13 @@ class GridScene(QGraphicsScene):
         """
         super().drawBackground(painter, rect)
 
+        # skip the grid when zoomed so far out that the grid lines would be packed too tightly to be useful
+        if (
+            painter.worldTransform().m11() * constants.GRID_SIZE
+            < constants.MIN_GRID_SPACING
+        ):
+            return
+
         # Calculate the left, top, right, and bottom coordinates of the visible area
         left = int(rect.left()) - (int(rect.left()) % constants.GRID_SIZE)
         top = int(rect.top()) - (int(rect.top()) % constants.GRID_SIZE)
@@ -0,0 +1,250 @@
+import math
+import re
+from typing import Container, Dict, Iterable, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import QRectF
+
+from components.registry import ComponentSpec, getComponentSpecs
+from components.wire import Wire
+from model import ComponentRecord, DesignState, NodeRecord, WireRecord
+from SimulationBackend.middleware import CircuitNode
+from SimulationBackend.netlist_reader import GROUND_NODES, SpiceElement
+
+import constants
+
+pointType = Tuple[float, float]
+
+
+class NetlistLayout:
+    """
+    Places the elements read from a SPICE deck on the canvas, as the records of a design.
+
+    The components are laid out on a square grid in the order of the deck, so elements written next to each other,
+    that usually share nodes, are placed next to each other. Every node is drawn as a chain of wires through its terminals
+    in the same order, and every terminal on the ground node gets a ground of its own right below it instead of
+    one ground wired across the whole design. Laying out a deck takes time linear in the number of elements.
+
+    Components and nodes keep the uniqueIDs they were written with, eg: "RResistor-0" is placed as "Resistor-0",
+    unless the uniqueID is taken. Other elements get new uniqueIDs.
+    """
+
+    def __init__(self, usedIDs: Container[str], origin: pointType = (0, 0)) -> None:
+        """
+        Params:
+            usedIDs: the uniqueIDs already on the canvas
+            origin: the top left corner of the grid the components are laid out on
+        """
+        self.usedIDs = usedIDs
+        self.origin = origin
+        # the uniqueIDs given out by the layout
+        self.claimedIDs: Set[str] = set()
+        # the count the next uniqueID of each name is looked for from
+        self.counts: Dict[str, int] = {}
+        # component type name to the positions of its terminals and its bounding rect, with the component at (0, 0)
+        self.geometries: Dict[str, Tuple[Tuple[pointType, ...], QRectF]] = {}
+        self.groundSpec: ComponentSpec = next(
+            spec for spec in getComponentSpecs() if spec.ground
+        )
+
+    def geometry(self, spec: ComponentSpec) -> Tuple[Tuple[pointType, ...], QRectF]:
+        """
+        A function that returns the positions of the terminals and the bounding rect of a component type,
+        measured once on a component of the type that's never added to the canvas
+        """
+        geometry = self.geometries.get(spec.name)
+        if geometry is None:
+            component = spec.loadClass()(compCount=0)
+            terminals = tuple(
+                (point.x(), point.y()) for point in component.getTerminalPositions()
+            )
+            geometry = (terminals, component.boundingRect())
+            self.geometries[spec.name] = geometry
+        return geometry
+
+    def claim(self, uniqueID: str) -> bool:
+        """
+        A function that gives out a uniqueID if it's not taken
+
+        Returns:
+            `True` if the uniqueID was free
+        """
+        if uniqueID in self.claimedIDs or uniqueID in self.usedIDs:
+            return False
+        self.claimedIDs.add(uniqueID)
+        return True
+
+    def newID(self, name: str) -> str:
+        """
+        A function that gives out the next free uniqueID of a name. eg: "Wire-12"
+        """
+        count = self.counts.get(name, 0)
+        while not self.claim(f"{name}-{count}"):
+            count += 1
+        self.counts[name] = count + 1
+        return f"{name}-{count}"
+
+    def keepID(self, uniqueID: str, name: str) -> bool:
+        """
+        A function that gives out a uniqueID read from the deck, if it's a uniqueID of the name and it's free
+        """
+        return re.fullmatch(
+            rf"{re.escape(name)}-\d+", uniqueID
+        ) is not None and self.claim(uniqueID)
+
+    def design(self, elements: Iterable[SpiceElement]) -> DesignState:
+        """
+        A function that lays out the elements of a deck
+
+        Params:
+            elements: the elements, in the order they are in the deck
+
+        Returns:
+            The records of the components, wires and nodes of the design, ready to be loaded onto the canvas
+        """
+        # the size of the grid depends on the number of elements
+        elements = list(elements)
+        state = DesignState()
+        if not elements:
+            return state
+
+        # the uniqueIDs written in the deck are given out before any new one, so no new one takes them
+        componentIDs: List[Optional[str]] = [
+            element.componentID
+            if self.keepID(element.componentID, element.spec.name)
+            else None
+            for element in elements
+        ]
+        # node name to the terminals connected to it, in the order of the deck
+        nets: Dict[str, List[Tuple[int, int]]] = {}
+        for index, element in enumerate(elements):
+            for terminalIndex, node in enumerate(element.nodes):
+                nets.setdefault(node, []).append((index, terminalIndex))
+        nodeIDs = {
+            node: node
+            for node in nets
+            if node.lower() not in GROUND_NODES and self.keepID(node, CircuitNode.name)
+        }
+        componentIDs = [
+            componentID or self.newID(element.spec.name)
+            for componentID, element in zip(componentIDs, elements)
+        ]
+
+        groundTerminals, groundRect = self.geometry(self.groundSpec)
+        groundX, groundY = groundTerminals[0]
+        specs = {element.spec.name: element.spec for element in elements}
+        rects = [self.geometry(spec)[1] for spec in specs.values()]
+        cellWidth = gridAligned(
+            max(rect.width() for rect in rects) + constants.NETLIST_CELL_MARGIN
+        )
+        cellHeight = gridAligned(
+            max(rect.height() for rect in rects)
+            + constants.NETLIST_GROUND_DROP
+            + groundRect.height()
+            + constants.NETLIST_CELL_MARGIN
+        )
+        columns = math.ceil(math.sqrt(len(elements)))
+
+        # the positions of the terminals of every element
+        terminalPositions: List[Tuple[pointType, ...]] = []
+        for index, (element, componentID) in enumerate(zip(elements, componentIDs)):
+            terminals, _ = self.geometry(element.spec)
+            row, column = divmod(index, columns)
+            x = self.origin[0] + column * cellWidth
+            y = self.origin[1] + row * cellHeight
+            terminalPositions.append(tuple((x + dx, y + dy) for dx, dy in terminals))
+            data = ()
+            if element.value is not None:
+                data = (
+                    (
+                        element.spec.parameters[0].key,
+                        element.value.text,
+                        element.value.unit,
+                    ),
+                )
+            state.components[componentID] = ComponentRecord(
+                componentID, element.spec.name, data, (x, y), 0.0
+            )
+
+        for node, terminals in nets.items():
+            if node.lower() in GROUND_NODES:
+                # a ground below every terminal on the ground node
+                for index, terminalIndex in terminals:
+                    terminalX, terminalY = terminalPositions[index][terminalIndex]
+                    _, rect = self.geometry(elements[index].spec)
+                    groundID = self.newID(self.groundSpec.name)
+                    groundPosition = (
+                        terminalX - groundX,
+                        state.components[componentIDs[index]].pos[1]
+                        + rect.bottom()
+                        + constants.NETLIST_GROUND_DROP
+                        - groundY,
+                    )
+                    state.components[groundID] = ComponentRecord(
+                        groundID, self.groundSpec.name, (), groundPosition, 0.0
+                    )
+                    self.addNode(
+                        state,
+                        self.newID(CircuitNode.name),
+                        [(componentIDs[index], terminalIndex), (groundID, 0)],
+                        [
+                            (terminalX, terminalY),
+                            (terminalX, groundPosition[1] + groundY),
+                        ],
+                    )
+                continue
+            self.addNode(
+                state,
+                nodeIDs.get(node) or self.newID(CircuitNode.name),
+                [
+                    (componentIDs[index], terminalIndex)
+                    for index, terminalIndex in terminals
+                ],
+                [
+                    terminalPositions[index][terminalIndex]
+                    for index, terminalIndex in terminals
+                ],
+            )
+        return state
+
+    def addNode(
+        self,
+        state: DesignState,
+        nodeID: str,
+        terminals: List[Tuple[str, int]],
+        positions: List[pointType],
+    ) -> None:
+        """
+        A function that adds the records of a node and of the chain of wires it's drawn with
+
+        Params:
+            state: the design the records are added to
+            nodeID: the uniqueID of the node
+            terminals: the terminals on the node, in the order they are wired in
+            positions: the position of every terminal
+        """
+        wireIDs = []
+        for (start, startPosition), (end, endPosition) in zip(
+            zip(terminals, positions), zip(terminals[1:], positions[1:])
+        ):
+            wireID = self.newID(Wire.name)
+            state.wires[wireID] = WireRecord(
+                wireID, orthogonalPath(startPosition, endPosition), start, end, nodeID
+            )
+            wireIDs.append(wireID)
+        state.nodes[nodeID] = NodeRecord(nodeID, tuple(terminals), tuple(wireIDs))
+
+
+def gridAligned(value: float) -> float:
+    """
+    A function that rounds a length up to the grid of the canvas
+    """
+    return math.ceil(value / constants.GRID_SIZE) * constants.GRID_SIZE
+
+
+def orthogonalPath(start: pointType, end: pointType) -> Tuple[pointType, ...]:
+    """
+    A function that returns the points of a wire from start to end, made of a horizontal and a vertical segment
+    """
+    if start[0] == end[0] or start[1] == end[1]:
+        return (start, end)
+    return (start, (end[0], start[1]), end)
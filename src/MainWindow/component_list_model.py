@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+from PyQt6 import QtCore
+
+from components import ComponentSpec
+
+
+class ComponentListModel(QtCore.QAbstractListModel):
+    """
+    A list model over the component types shown on the components pane.
+
+    The view only asks the model for the rows it is displaying, so the number of component types
+    listed does not affect how many widgets are created.
+    """
+
+    def __init__(self, parent=None):
+        super(ComponentListModel, self).__init__(parent)
+        self._specs: List[ComponentSpec] = []
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        # a list model has no children
+        if parent.isValid():
+            return 0
+        return len(self._specs)
+
+    def data(
+        self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole
+    ):
+        if not index.isValid() or not (0 <= index.row() < len(self._specs)):
+            return None
+        spec = self._specs[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return spec.name
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return spec.category.value.capitalize()
+        if role == QtCore.Qt.ItemDataRole.UserRole:
+            return spec
+        return None
+
+    def setSpecs(self, specs: List[ComponentSpec]) -> None:
+        """
+        A function that replaces the component types listed by the model
+        """
+        self.beginResetModel()
+        self._specs = list(specs)
+        self.endResetModel()
+
+    def specAt(self, row: int) -> Optional[ComponentSpec]:
+        """
+        A function that returns the component type on the given row, `None` if there is no such row
+        """
+        if 0 <= row < len(self._specs):
+            return self._specs[row]
+        return None
@@ -1,12 +1,12 @@
-from typing import Type
-
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.sip import wrappertype
 
 from utils.components import QHLine
+from utils.resources import loadStyleSheet
 from components.types import ComponentCategory
-from components import getComponentClasses
-from components.general import GeneralComponent
+from components import filterComponentSpecs
+
+from .component_list_model import ComponentListModel
 
 
 class ComponentsPane(QtWidgets.QWidget):
@@ -17,6 +17,9 @@ class ComponentsPane(QtWidgets.QWidget):
 
         componentSelected = QtCore.pyqtSignal(wrappertype)
 
+    # milliseconds to wait after the last keystroke before filtering the component list
+    SEARCH_DEBOUNCE_MS = 150
+
     def __init__(self, parent=None):
         super(ComponentsPane, self).__init__(parent)
 
@@ -27,9 +30,7 @@ class ComponentsPane(QtWidgets.QWidget):
 
     def initUI(self):
         # load QSS stylesheet and set that as the stylesheet of the ComponentsPane
-        with open("src/styles/components_pane.stylesheet.qss", "r") as f:
-            styleSheet = f.read()
-            self.setStyleSheet(styleSheet)
+        self.setStyleSheet(loadStyleSheet("components_pane"))
 
         # making sure that the components pane is not any smaller than 250px
         self.setMinimumWidth(250)
@@ -68,78 +69,72 @@ class ComponentsPane(QtWidgets.QWidget):
             self.componentCategory, QtCore.Qt.AlignmentFlag.AlignTop
         )
 
+        # the list of component types, backed by a model so only the visible rows are ever drawn
+        self.componentListModel = ComponentListModel(self)
+        self.componentListView = QtWidgets.QListView()
+        self.componentListView.setModel(self.componentListModel)
+        # every row has the same height, which lets the view skip measuring the rows
+        self.componentListView.setUniformItemSizes(True)
+        self.componentListView.setEditTriggers(
+            QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self.componentListView.setCursor(
+            QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor)
+        )
+        self.componentListView.clicked.connect(self.onComponentIndexClick)
+        self.layout.addWidget(self.componentListView)
+
+        # the search is only run once the user stops typing for a moment
+        self.searchTimer = QtCore.QTimer(self)
+        self.searchTimer.setSingleShot(True)
+        self.searchTimer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.searchTimer.timeout.connect(self.refreshComponentList)
+
         # sets the initial state of the components category to "All" to display all compnents from the start
         self.componentCategory.setCurrentText("All")
+        self.refreshComponentList()
 
-        # adding stretch to the bottom to push all the components up
-        self.layout.addStretch()
         # using the vertical box layout as the layout of the component pane
         self.setLayout(self.layout)
 
-    def clearComponents(self):
+    def selectedCategory(self) -> ComponentCategory | None:
         """
-        A utility function to clear every everything on the components pane except the first three i.e the searchbox, the line underneath it and the category combobox
-        It's used to clear the listed components
+        A function that returns the category selected in the category combobox, `None` when "All" is selected
         """
-        while self.layout.count() > 3:
-            item = self.layout.takeAt(3)
-            widget = item.widget()
-            if widget is not None:
-                self.layout.removeWidget(widget)
-                widget.deleteLater()
-
-    def displayComponentClasses(self, componentClasses: list[Type["GeneralComponent"]]):
+        text = self.componentCategory.currentText()
+        if not text or text.lower() == "all":
+            return None
+        return ComponentCategory[text.upper()]
+
+    def refreshComponentList(self):
         """
-        A function that takes in a list of the component classes to display and adds them to the layout
+        A function that lists the component types matching both the search text and the selected category
         """
-        for componentClass in componentClasses:
-            label = QtWidgets.QLabel(componentClass.name)
-            label.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
-            label.mousePressEvent = self.onComponentClassClick(componentClass)
-            self.layout.addWidget(label)
+        componentSpecs = filterComponentSpecs(
+            category=self.selectedCategory(), searchText=self.searchBox.text()
+        )
+        self.componentListModel.setSpecs(componentSpecs)
 
     def onSearchBoxTextChange(self, searchText: str):
         """
         A function that gets called whenever the text in the seach box changes.
-        It clears the current components in there and uses the searchText to get the filtered component classes.
-        It then calls the displayComponentClasses above to display the filtered component classes.
-        It adds a stretch to make sure the components are all pushed up
+        It restarts the search timer so that the list is only filtered once the user pauses typing.
         """
-        self.clearComponents()
-        componentClasses = getComponentClasses(searchText=searchText)
-        # show components
-        self.displayComponentClasses(componentClasses)
-        # add stretch to the bottom to push all the components up
-        self.layout.addStretch()
+        self.searchTimer.start()
 
     def onComponentCategoryChange(self, text):
         """
         A function that gets called whenever category in the comboxbox is changed by the user.
-        It clears the current components in there and uses the selected category to get the filtered component classes.
-        It then calls the displayComponentClasses above to display the filtered component classes.
-        It adds a stretch to make sure the components are all pushed up
+        It filters the listed component types straight away.
         """
-        # clear the current components
-        self.clearComponents()
-        # extract selected category
-        if text.lower() == "all":
-            componentClasses = getComponentClasses()
-        else:
-            selectedCategory = ComponentCategory[text.upper()]
-            componentClasses = getComponentClasses(category=selectedCategory)
-        # show components
-        self.displayComponentClasses(componentClasses)
-
-        # add stretch to the bottom to push all the components up
-        self.layout.addStretch()
-
-    def onComponentClassClick(self, component: Type["GeneralComponent"]):
+        self.searchTimer.stop()
+        self.refreshComponentList()
+
+    def onComponentIndexClick(self, index: QtCore.QModelIndex):
         """
-        This function creates and returns the handler functions for each component that is displayed on components pane
-        It handler function is customized based on component to make sure that the right component calsses are emitted when clicked on
+        A function that gets called when a component type on the list is clicked.
+        It emits the class of the component type. The class is only imported when it's clicked on for the first time.
         """
-
-        def onComponentClick(event):
-            self.signals.componentSelected.emit(component)
-
-        return onComponentClick
+        componentSpec = self.componentListModel.specAt(index.row())
+        if componentSpec is not None:
+            self.signals.componentSelected.emit(componentSpec.loadClass())
@@ -2,6 +2,8 @@ from PyQt6.QtWidgets import QWidget, QTextEdit, QVBoxLayout, QLabel
 from PyQt6.QtGui import QFont, QTextCursor
 from PyQt6.QtCore import Qt
 
+from utils.resources import loadStyleSheet
+
 
 class LogConsole(QWidget):
     def __init__(self, parent=None):
@@ -10,9 +12,7 @@ class LogConsole(QWidget):
 
     def _init_ui(self):
         # load QSS stylesheet and set that as the stylesheet of the log console
-        with open("src/styles/log_console.stylesheet.qss", "r") as f:
-            styleSheet = f.read()
-            self.setStyleSheet(styleSheet)
+        self.setStyleSheet(loadStyleSheet("log_console"))
 
         # set the fixed height of the log console
         self.setFixedHeight(250)
@@ -7,18 +7,28 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QToolBar,
     QMessageBox,
+    QDockWidget,
+    QInputDialog,
+    QFileDialog,
 )
-from PyQt6.QtGui import QAction, QIcon
-from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QAction, QKeySequence
+from PyQt6.QtCore import QSize, Qt
 
 from components.general import GeneralComponent
+from components.types import Quantity
+from model import readJournal
 
 from .components_pane import ComponentsPane
 from .canvas import Canvas
 from .attributes_pane import AttributesPane
 from .log_console import LogConsole
+from .waveform_viewer import WaveformViewer
 
-from logger import qt_log_handler
+from logger import logger, qt_log_handler
+from utils.resources import loadIcon
+
+# the files the netlist dialogs show
+NETLIST_FILE_FILTER = "SPICE netlists (*.cir *.sp *.spice *.net);;All files (*)"
 
 
 class MainWindow(QMainWindow):
@@ -56,6 +66,14 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(container)
 
+        # waveforms of transient analyses, docked below the canvas and the log console. shown when the first ones are ready
+        self.waveformViewer = WaveformViewer(self)
+        self.waveformDock = QDockWidget("Waveforms", self)
+        self.waveformDock.setObjectName("waveformDock")
+        self.waveformDock.setWidget(self.waveformViewer)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.waveformDock)
+        self.waveformDock.hide()
+
         # create toolbar
         self._createToolBar()
 
@@ -69,28 +87,61 @@ class MainWindow(QMainWindow):
         self.toolbar.setIconSize(QSize(18, 18))
         self.addToolBar(self.toolbar)
 
+        self._create_and_add_netlist_actions()
+
+        self.toolbar.addSeparator()
         self._create_and_add_simulate_action()
+        self._create_and_add_transient_actions()
         self._create_and_add_wire_tool_action()
         self._create_and_add_rotate_action()
 
+        # adding undo and redo actions to the toolbar
+        self.toolbar.addSeparator()
+        self._create_and_add_undo_actions()
+
+        # adding zoom actions to the toolbar
+        self.toolbar.addSeparator()
+        self._create_and_add_zoom_actions()
+
         # adding delete button to the toolbar
         self.toolbar.addSeparator()
         self._create_and_add_delete_action()
 
+    def _create_and_add_netlist_actions(self):
+        """Create the actions that import and export SPICE netlists and add them to the toolbar"""
+        import_action = QAction("Import Netlist", self)
+        import_action.setStatusTip("Place the circuit of a SPICE netlist on the canvas")
+        import_action.triggered.connect(self._onImportNetlistClick)
+        self.toolbar.addAction(import_action)
+
+        export_action = QAction("Export Netlist", self)
+        export_action.setStatusTip("Save the circuit on the canvas as a SPICE netlist")
+        export_action.triggered.connect(self._onExportNetlistClick)
+        self.toolbar.addAction(export_action)
+
     def _create_and_add_simulate_action(self):
         """Create a simulate action and add it to the toolbar"""
         # add simulate action
-        simulate_button = QAction(
-            QIcon("src/assets/simulate-icon.png"), "Simulate", self
-        )
+        simulate_button = QAction(loadIcon("simulate-icon"), "Simulate", self)
         simulate_button.setStatusTip("Simulate circuit on canvas")
         simulate_button.triggered.connect(self._onSimulateButtonClick)
         self.toolbar.addAction(simulate_button)
 
+    def _create_and_add_transient_actions(self):
+        """Create the transient analysis action and the action that shows the waveforms and add them to the toolbar"""
+        transient_action = QAction("Transient", self)
+        transient_action.setStatusTip("Simulate the circuit over time")
+        transient_action.triggered.connect(self._onTransientButtonClick)
+        self.toolbar.addAction(transient_action)
+
+        waveforms_action = self.waveformDock.toggleViewAction()
+        waveforms_action.setStatusTip("Show or hide the waveforms")
+        self.toolbar.addAction(waveforms_action)
+
     def _create_and_add_wire_tool_action(self):
         """Create a wire tool action and add it to the toolbar"""
         # adding wire tool action to the toolbar
-        wire_tool = QAction(QIcon("src/assets/wire-tool-icon.png"), "Wire", self)
+        wire_tool = QAction(loadIcon("wire-tool-icon"), "Wire", self)
         wire_tool.setStatusTip("Wire")
         wire_tool.triggered.connect(self._onWireToolClick)
         wire_tool.setCheckable(True)
@@ -99,23 +150,119 @@ class MainWindow(QMainWindow):
     def _create_and_add_rotate_action(self):
         """Create a rotate action and add it to the toolbar"""
         # add rotate action to toolbar
-        rotate_action = QAction(QIcon("src/assets/rotate-icon.png"), "Rotate", self)
+        rotate_action = QAction(loadIcon("rotate-icon"), "Rotate", self)
         rotate_action.triggered.connect(self.rotateSelectedComponent)
         self.toolbar.addAction(rotate_action)
 
+    def _create_and_add_undo_actions(self):
+        """Create the undo and redo actions of the canvas and add them to the toolbar"""
+        undo_action = self.canvas.undoStack.createUndoAction(self, "Undo")
+        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        undo_action.setStatusTip("Undo the last edit")
+        self.toolbar.addAction(undo_action)
+
+        redo_action = self.canvas.undoStack.createRedoAction(self, "Redo")
+        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        redo_action.setStatusTip("Redo the last undone edit")
+        self.toolbar.addAction(redo_action)
+
+    def _create_and_add_zoom_actions(self):
+        """Create the zoom in, zoom out and zoom to fit actions and add them to the toolbar"""
+        zoom_in_action = QAction("Zoom In", self)
+        zoom_in_action.setShortcut(QKeySequence.StandardKey.ZoomIn)
+        zoom_in_action.setStatusTip("Zoom in on the canvas")
+        zoom_in_action.triggered.connect(self.canvas.zoomIn)
+        self.toolbar.addAction(zoom_in_action)
+
+        zoom_out_action = QAction("Zoom Out", self)
+        zoom_out_action.setShortcut(QKeySequence.StandardKey.ZoomOut)
+        zoom_out_action.setStatusTip("Zoom out of the canvas")
+        zoom_out_action.triggered.connect(self.canvas.zoomOut)
+        self.toolbar.addAction(zoom_out_action)
+
+        zoom_to_fit_action = QAction("Zoom to Fit", self)
+        zoom_to_fit_action.setStatusTip("Fit the whole circuit in the canvas")
+        zoom_to_fit_action.triggered.connect(self.canvas.zoomToFit)
+        self.toolbar.addAction(zoom_to_fit_action)
+
     def _create_and_add_delete_action(self):
         """Create a delete action and add it to the toolbar"""
-        deleteSelectedComponentsButton = QAction(
-            QIcon("src/assets/bin-icon.png"), "Delete", self
-        )
+        deleteSelectedComponentsButton = QAction(loadIcon("bin-icon"), "Delete", self)
         deleteSelectedComponentsButton.triggered.connect(
             self.onDeleteSelectedComponentsClick
         )
         self.toolbar.addAction(deleteSelectedComponentsButton)
 
+    def closeEvent(self, event) -> None:
+        # stop the simulation worker process and the autosave before the app exits
+        self.canvas.shutdown()
+        super().closeEvent(event)
+
+    def startAutosave(self):
+        """
+        Offer to recover the design of the last session that did not close, then start autosaving the design
+        """
+        autosave = self.canvas.autosave
+        autosave.start()
+        journals = autosave.recoverableJournals()
+        if not journals:
+            return
+        button = QMessageBox.question(
+            self,
+            "Recover Design",
+            "simit did not close properly last time. Do you want to recover the design?",
+            buttons=QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if button == QMessageBox.StandardButton.Yes:
+            try:
+                self.canvas.loadDesign(readJournal(journals[0]))
+                # the recovered design is in the journal of this session before the old journal is deleted
+                autosave.flush()
+            except (OSError, ValueError):
+                # the journal is kept, to be offered again next time
+                logger.exception("Design could not be recovered")
+                return
+            logger.info(f"Design recovered from {journals[0]}")
+        autosave.discardJournals(journals)
+
+    def _onImportNetlistClick(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Netlist", "", NETLIST_FILE_FILTER
+        )
+        if not path:
+            return
+        try:
+            self.canvas.importNetlist(path)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.exception(f"Netlist {path} not imported")
+            QMessageBox.warning(
+                self, "Import Netlist", f"The netlist could not be imported: {e}"
+            )
+
+    def _onExportNetlistClick(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Netlist", "circuit.cir", NETLIST_FILE_FILTER
+        )
+        if not path:
+            return
+        try:
+            self.canvas.exportNetlist(path)
+        except OSError as e:
+            logger.exception(f"Netlist {path} not exported")
+            QMessageBox.warning(
+                self, "Export Netlist", f"The netlist could not be exported: {e}"
+            )
+
     def _onSimulateButtonClick(self):
         self.canvas.onSimulateButtonClick()
 
+    def _onTransientButtonClick(self):
+        stop, ok = QInputDialog.getDouble(
+            self, "Transient Analysis", "Stop time (ms):", 1.0, 0.000001, 1e6, 6
+        )
+        if ok:
+            self.canvas.onTransientButtonClick(stop * 1e-3)
+
     def _onWireToolClick(self, state: bool):
         self.canvas.onWireToolClick(state)
 
@@ -129,6 +276,20 @@ class MainWindow(QMainWindow):
         # selected component on attributes pane is deleted
         self.attributesPane.signals.deleteComponent.connect(self.onDeleteComponent)
 
+        # property of the selected component edited on the attributes pane
+        self.attributesPane.signals.componentDataChange.connect(
+            self.onComponentDataChange
+        )
+
+        # keep the attributes pane in sync with data changed on the canvas
+        self.canvas.signals.componentsDataChanged.connect(
+            self.attributesPane.onComponentsDataChanged
+        )
+
+        # plot the waveforms of transient analyses and add the traces of the wires and components selected
+        self.canvas.signals.waveformsReady.connect(self.onWaveformsReady)
+        self.canvas.signals.nodeSelected.connect(self.waveformViewer.addNodeTrace)
+
         # connected log signal to log console
         qt_log_handler.signals.log.connect(self.log_console.on_log)
 
@@ -139,11 +300,40 @@ class MainWindow(QMainWindow):
     def onCanvasComponentSelect(self, component: GeneralComponent):
         """Slot to handle the componentSelected signal from the canvas"""
         self.attributesPane.onCanvasComponentSelect(component)
+        # only a component clicked on by itself is plotted. a rubber band would add a trace for every component it selects
+        if (
+            component is not None
+            and len(self.canvas.selectedComponentsIDs) == 1
+            and self.canvas.rubberBandRect().isNull()
+        ):
+            self.waveformViewer.addComponentTrace(component.uniqueID, component.name)
+
+    def onWaveformsReady(self, waveforms):
+        """Slot to handle the waveformsReady signal from the canvas"""
+        self.waveformViewer.setWaveforms(waveforms)
+        self.waveformDock.show()
 
     def onDeleteComponent(self, uniqueID: str):
         """Slot to handle the deleteComponent signal from the attributes pane"""
         self.canvas.deleteComponents(componentIDs=[uniqueID])
 
+    def onComponentDataChange(self, uniqueID: str, key: str, value: Quantity):
+        """
+        Slot to handle the componentDataChange signal from the attributes pane.
+        If the edited component is part of a multi-selection, the edit is applied to every selected component of the same type in one go.
+        """
+        component = self.canvas.components.get(uniqueID)
+        if component is None:
+            return
+        componentIDs = [uniqueID]
+        if uniqueID in self.canvas.selectedComponentsIDs:
+            componentIDs = [
+                componentID
+                for componentID in self.canvas.selectedComponentsIDs
+                if self.canvas.components[componentID].name == component.name
+            ]
+        self.canvas.setComponentsData(componentIDs, key, value)
+
     def onDeleteSelectedComponentsClick(self):
         """Slot to handle the deleteSelectedComponents signal from the toolbar"""
         selectedComponentsIDs = self.canvas.selectedComponentsIDs.copy()
@@ -0,0 +1,305 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+from PyQt6 import QtGui
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPolygonF
+from PyQt6.QtCore import Qt, QPointF, QRectF
+
+import constants
+from components import getComponentSpec
+from logger import logger
+from SimulationBackend.circuit_simulator import componentBranchNames
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from SimulationBackend.waveform_pyramid import WaveformPyramid
+    from SimulationBackend.waveform_store import WaveformStore
+
+# space around the plot area, in pixels, for the axis labels
+PLOT_MARGIN = 40
+
+
+@dataclass
+class Trace:
+    label: str
+    pyramid: "WaveformPyramid"
+    color: QColor
+
+
+def toPixelColumns(
+    x: "np.ndarray", mins: "np.ndarray", maxs: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    A function that merges the blocks of a trace that fall in the same pixel column, so a trace is drawn with
+    at most two points per column.
+
+    Params:
+        x: the pixel column of every block, in ascending order
+        mins: the minimum of every block
+        maxs: the maximum of every block
+
+    Returns:
+        The columns and their minimum and maximum
+    """
+    import numpy as np
+
+    columns = np.floor(x)
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    return (
+        columns[starts],
+        np.fmin.reduceat(mins, starts),
+        np.fmax.reduceat(maxs, starts),
+    )
+
+
+class WaveformPlot(QWidget):
+    """
+    Draws the traces of the waveform viewer. Traces are read from their pyramids at the resolution of the plot,
+    so drawing, zooming and panning cost O(pixels) whatever the length of the waveforms.
+
+    The wheel zooms the time window around the mouse, dragging pans it and a double click shows the whole waveforms.
+    """
+
+    def __init__(self, parent=None):
+        super(WaveformPlot, self).__init__(parent=parent)
+        self.setMinimumHeight(150)
+        self.traces: List[Trace] = []
+        # the full time range of the waveforms and the part of it that's shown
+        self.bounds: Tuple[float, float] = (0.0, 1.0)
+        self.window: Tuple[float, float] = self.bounds
+        # the mouse x and the window when a drag started
+        self.dragStart: Optional[Tuple[float, Tuple[float, float]]] = None
+
+    def setBounds(self, start: float, stop: float) -> None:
+        if stop <= start:
+            stop = start + 1.0
+        self.bounds = (start, stop)
+        self.window = self.bounds
+        self.update()
+
+    def plotRect(self) -> QRectF:
+        return QRectF(self.rect()).adjusted(PLOT_MARGIN, 10, -10, -PLOT_MARGIN / 2)
+
+    def setWindow(self, start: float, stop: float) -> None:
+        """
+        Function that shows the given part of the time range. The window is kept within the waveforms
+        """
+        boundStart, boundStop = self.bounds
+        span = min(stop - start, boundStop - boundStart)
+        start = min(max(start, boundStart), boundStop - span)
+        self.window = (start, start + span)
+        self.update()
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        import numpy as np
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.black)
+        rect = self.plotRect()
+        if not self.traces or rect.width() <= 0 or rect.height() <= 0:
+            painter.end()
+            return
+
+        start, stop = self.window
+        pixels = int(rect.width())
+        xScale = rect.width() / (stop - start)
+
+        # one query per trace, at the width of the plot
+        columns = []
+        for trace in self.traces:
+            times, mins, maxs = trace.pyramid.query(start, stop, pixels)
+            if len(times) == 0:
+                columns.append(None)
+                continue
+            x, mins, maxs = toPixelColumns((times - start) * xScale, mins, maxs)
+            columns.append((x, mins, maxs))
+
+        # fit the visible part of the traces
+        visible = [
+            value
+            for column in columns
+            if column is not None
+            for value in (np.nanmin(column[1]), np.nanmax(column[2]))
+            if not np.isnan(value)
+        ]
+        low, high = (min(visible), max(visible)) if visible else (-1.0, 1.0)
+        if high - low < 1e-12:
+            padding = max(abs(high) * 0.1, 1e-12)
+            low, high = low - padding, high + padding
+        yScale = rect.height() / (high - low)
+
+        painter.setClipRect(rect)
+        for trace, column in zip(self.traces, columns):
+            if column is None:
+                continue
+            x, mins, maxs = column
+            valid = ~(np.isnan(mins) | np.isnan(maxs))
+            x = rect.left() + x[valid]
+            top = rect.bottom() - (maxs[valid] - low) * yScale
+            bottom = rect.bottom() - (mins[valid] - low) * yScale
+            # every column is a vertical stroke from its minimum to its maximum, joined to the next column
+            points = np.empty((len(x) * 2, 2))
+            points[0::2, 0] = points[1::2, 0] = x
+            points[0::2, 1] = bottom
+            points[1::2, 1] = top
+            polygon = QPolygonF([QPointF(px, py) for px, py in points.tolist()])
+            painter.setPen(QPen(trace.color, 1))
+            painter.drawPolyline(polygon)
+        painter.setClipping(False)
+
+        # axes labels and legend
+        painter.setPen(QPen(Qt.GlobalColor.gray, 1))
+        painter.drawRect(rect)
+        painter.setFont(QFont("Arial", 8))
+        painter.drawText(QPointF(2, rect.top() + 8), f"{high:.3g}")
+        painter.drawText(QPointF(2, rect.bottom()), f"{low:.3g}")
+        painter.drawText(QPointF(rect.left(), rect.bottom() + 14), f"{start:.4g} s")
+        stopText = f"{stop:.4g} s"
+        painter.drawText(
+            QPointF(
+                rect.right() - painter.fontMetrics().horizontalAdvance(stopText),
+                rect.bottom() + 14,
+            ),
+            stopText,
+        )
+        legendX = rect.left() + 6
+        for trace in self.traces:
+            painter.setPen(QPen(trace.color, 1))
+            painter.drawText(QPointF(legendX, rect.top() + 14), trace.label)
+            legendX += painter.fontMetrics().horizontalAdvance(trace.label) + 12
+        painter.end()
+
+    def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
+        rect = self.plotRect()
+        start, stop = self.window
+        # the time under the mouse stays where it is
+        fraction = min(
+            max((event.position().x() - rect.left()) / max(rect.width(), 1), 0.0), 1.0
+        )
+        anchor = start + (stop - start) * fraction
+        factor = constants.WAVEFORM_ZOOM_FACTOR
+        span = (
+            (stop - start) / factor
+            if event.angleDelta().y() > 0
+            else (stop - start) * factor
+        )
+        self.setWindow(anchor - span * fraction, anchor + span * (1 - fraction))
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.dragStart = (event.position().x(), self.window)
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        if self.dragStart is None:
+            return
+        x, (start, stop) = self.dragStart
+        shift = (
+            (x - event.position().x())
+            * (stop - start)
+            / max(self.plotRect().width(), 1)
+        )
+        self.setWindow(start + shift, stop + shift)
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
+        self.dragStart = None
+
+    def mouseDoubleClickEvent(self, event: QtGui.QMouseEvent) -> None:
+        self.setWindow(*self.bounds)
+
+
+class WaveformViewer(QWidget):
+    """
+    The panel the waveforms of the last transient analysis are plotted in. Selecting a wire adds the voltage of its node
+    and selecting a component adds its current.
+    """
+
+    def __init__(self, parent=None):
+        super(WaveformViewer, self).__init__(parent=parent)
+        self.waveforms: Optional["WaveformStore"] = None
+        self._init_ui()
+
+    def _init_ui(self):
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        # heading and clear button
+        header = QHBoxLayout()
+        self.heading = QLabel("Waveforms", self)
+        self.heading.setFont(QFont("Verdana", 15))
+        header.addWidget(self.heading)
+        header.addStretch()
+        self.clearButton = QPushButton("Clear", self)
+        self.clearButton.clicked.connect(self.clearTraces)
+        header.addWidget(self.clearButton)
+        self.layout.addLayout(header)
+
+        self.plot = WaveformPlot(self)
+        self.layout.addWidget(self.plot)
+
+        self.setLayout(self.layout)
+
+    def setWaveforms(self, waveforms: "WaveformStore"):
+        """
+        Function that shows new waveforms. The traces of the previous ones are added again from the new ones if they are there
+        """
+        labels = [(trace.label, trace.pyramid.name) for trace in self.plot.traces]
+        self.plot.traces = []
+        self.waveforms = waveforms
+        scale = waveforms.scale()
+        if len(scale):
+            self.plot.setBounds(float(scale[0]), float(scale[-1]))
+        for label, name in labels:
+            if name in waveforms:
+                self.addTrace(label, name)
+        self.plot.update()
+
+    def addTrace(self, label: str, name: str) -> bool:
+        """
+        Function that plots a vector of the waveforms
+
+        Params:
+            label: the name of the trace in the legend. eg: "V(CircuitNode-1)"
+            name: the name of the vector in the waveforms
+
+        Returns:
+            `True` if the trace was added
+        """
+        from SimulationBackend.waveform_pyramid import WaveformPyramid
+
+        if self.waveforms is None or name not in self.waveforms:
+            return False
+        if any(trace.label == label for trace in self.plot.traces):
+            return True
+        color = QColor(
+            constants.TRACE_COLORS[len(self.plot.traces) % len(constants.TRACE_COLORS)]
+        )
+        self.plot.traces.append(
+            Trace(label, WaveformPyramid.open(self.waveforms, name), color)
+        )
+        self.plot.update()
+        return True
+
+    def addNodeTrace(self, nodeID: str):
+        """Slot that plots the voltage of a circuit node"""
+        if self.waveforms is None:
+            return
+        if not self.addTrace(f"V({nodeID})", nodeID):
+            logger.info(f"No waveform for the voltage of {nodeID}")
+
+    def addComponentTrace(self, componentID: str, componentType: str):
+        """Slot that plots the current of a component"""
+        if self.waveforms is None:
+            return
+        spec = getComponentSpec(componentType)
+        if spec is None or spec.spicePrefix is None:
+            return
+        for branchName in componentBranchNames(componentID, spec.spicePrefix):
+            if self.addTrace(f"I({componentID})", f"{branchName}#branch"):
+                return
+        logger.info(f"No waveform for the current of {componentID}")
+
+    def clearTraces(self):
+        self.plot.traces = []
+        self.plot.update()
@@ -0,0 +1,384 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+from components.registry import getComponentSpec
+from components.types.quantity import siValue
+from .netlist_writer import componentsInfoType, getTerminalNodes, SPICE_GND
+from .topology_validator import UnionFind
+
+
+@dataclass(frozen=True)
+class EliminatedNode:
+    """
+    How to get the voltage of a node that was reduced away from the voltages of the nodes that are left.
+    The voltage is V(a) + (V(b) - V(a)) * ratio. A ratio of 0 means the node follows node a.
+
+    Attributes:
+        node: the eliminated node
+        a, b: the nodes its voltage is derived from
+        ratio: where the node sits between a and b
+    """
+
+    node: str
+    a: str
+    b: str
+    ratio: float = 0.0
+
+
+@dataclass
+class CircuitReduction:
+    """
+    The result of reducing a circuit.
+
+    Attributes:
+        componentsInfo: the components of the reduced circuit. Resistors that were combined are replaced by
+            resistors named "Reduced-<n>". Ground nodes are all written as SPICE's ground node
+        GNDNodes: the ground nodes of the reduced circuit
+        eliminatedNodes: the nodes that were reduced away, in the order they were eliminated
+        originalComponentsInfo: the components of the circuit before it was reduced
+        originalGNDNodes: the ground nodes of the circuit before it was reduced
+    """
+
+    componentsInfo: componentsInfoType
+    GNDNodes: List[str]
+    eliminatedNodes: List[EliminatedNode] = field(default_factory=list)
+    originalComponentsInfo: componentsInfoType = field(default_factory=dict)
+    originalGNDNodes: List[str] = field(default_factory=list)
+
+    def reconstruct(
+        self, nodeVoltages: Dict[str, float], branchCurrents: Dict[str, float]
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        A function that works out the voltages and currents of the original circuit from the solution of the reduced one.
+
+        The voltages of the eliminated nodes are derived in the reverse order they were eliminated in.
+        The current of every resistor is then (V1 - V2) / R. Zero ohm resistors get their current from
+        Kirchhoff's current law at their nodes, when the currents of all the other elements there are known.
+
+        Params:
+            nodeVoltages: the voltage of every node of the reduced circuit, ground excluded
+            branchCurrents: the current of every voltage source of the reduced circuit, by component uniqueID.
+                The current flows from the first terminal of the source through it to the second one
+
+        Returns:
+            A tuple of the voltage of every node and the current through every element of the original circuit.
+            Currents flow from the first terminal of the element to the second one
+        """
+        GNDNodes = set(self.originalGNDNodes)
+        voltages: Dict[str, float] = {SPICE_GND: 0.0}
+        voltages.update(nodeVoltages)
+        for node in GNDNodes:
+            voltages[node] = 0.0
+        for eliminated in reversed(self.eliminatedNodes):
+            voltageA = voltages.get(eliminated.a, 0.0)
+            voltageB = voltages.get(eliminated.b, 0.0)
+            voltages[eliminated.node] = (
+                voltageA + (voltageB - voltageA) * eliminated.ratio
+            )
+
+        currents: Dict[str, float] = {}
+        shorts: Dict[str, Tuple[str, str]] = {}
+        # node to (element uniqueID, +1 if the element's current leaves the node, -1 if it enters it) pairs
+        incidence: Dict[str, List[Tuple[str, int]]] = {}
+        for componentID, componentInfo in self.originalComponentsInfo.items():
+            spec = getComponentSpec(componentInfo.get("type"))
+            if spec is None or spec.spicePrefix is None:
+                continue
+            nodes = getTerminalNodes(componentInfo, spec.terminals)
+            if nodes is None:
+                continue
+            nodes = [SPICE_GND if node in GNDNodes else node for node in nodes]
+            if spec.terminals == 2:
+                incidence.setdefault(nodes[0], []).append((componentID, 1))
+                incidence.setdefault(nodes[1], []).append((componentID, -1))
+            else:
+                # the currents into a block are not known
+                for node in nodes:
+                    incidence.setdefault(node, []).append((componentID, 0))
+            if spec.spicePrefix == "R":
+                resistance = siValue(componentInfo.get("data").get("R"))
+                if resistance == 0:
+                    shorts[componentID] = (nodes[0], nodes[1])
+                    continue
+                currents[componentID] = (
+                    voltages.get(nodes[0], 0.0) - voltages.get(nodes[1], 0.0)
+                ) / resistance
+            elif componentID in branchCurrents:
+                currents[componentID] = branchCurrents[componentID]
+
+        currents.update(self.shortCurrents(shorts, incidence, currents))
+        return voltages, currents
+
+    def shortCurrents(
+        self,
+        shorts: Dict[str, Tuple[str, str]],
+        incidence: Dict[str, List[Tuple[str, int]]],
+        currents: Dict[str, float],
+    ) -> Dict[str, float]:
+        """
+        A function that finds the currents of zero ohm resistors by peeling the trees they form from the leaves inwards.
+        At a node with a single unknown current, that current is whatever makes the currents at the node add up to zero.
+        Shorts that form loops, or touch an element whose current is not known, are left out.
+        """
+        known = dict(currents)
+        # node to the shorts at it whose current is not known yet
+        unknownAt: Dict[str, Set[str]] = {}
+        for shortID, (node1, node2) in shorts.items():
+            if node1 == node2:
+                # a short from a node to itself carries no current
+                known[shortID] = 0.0
+                continue
+            unknownAt.setdefault(node1, set()).add(shortID)
+            unknownAt.setdefault(node2, set()).add(shortID)
+
+        queue = deque(node for node, unknown in unknownAt.items() if len(unknown) == 1)
+        while queue:
+            node = queue.popleft()
+            unknown = unknownAt[node]
+            if len(unknown) != 1:
+                continue
+            shortID = next(iter(unknown))
+            total = 0.0
+            direction = 0
+            solvable = True
+            for elementID, sign in incidence.get(node, []):
+                if elementID == shortID:
+                    direction = sign
+                elif sign == 0 or elementID not in known:
+                    solvable = False
+                    break
+                else:
+                    total += sign * known[elementID]
+            if not solvable or direction == 0:
+                continue
+            # the currents leaving the node add up to zero
+            known[shortID] = -total / direction
+            for shortNode in shorts[shortID]:
+                unknownAt[shortNode].discard(shortID)
+                if len(unknownAt[shortNode]) == 1:
+                    queue.append(shortNode)
+
+        return {shortID: known[shortID] for shortID in shorts if shortID in known}
+
+
+class CircuitReducer:
+    """
+    A class that shrinks a circuit before it's solved by replacing groups of resistors with equivalent ones.
+
+    The reductions, repeated until none of them applies:
+        - zero ohm resistors short their two nodes into one
+        - a resistor hanging off a node nothing else is connected to carries no current and is removed
+        - two resistors in series through a node nothing else is connected to become one resistor
+        - resistors between the same two nodes become one resistor
+
+    Nodes connected to ground or to any element other than a resistor are never eliminated,
+    so the voltages and currents of those elements are not affected.
+    The eliminated nodes are recorded so their voltages can be worked out after the reduced circuit is solved.
+    """
+
+    def __init__(
+        self, componentsInfo: componentsInfoType, GNDNodes: Iterable[str]
+    ) -> None:
+        self.componentsInfo = componentsInfo
+        self.GNDNodes: Set[str] = set(GNDNodes)
+
+        # live resistors. uniqueID to (node1, node2, resistance) pairs
+        self.resistors: Dict[str, Tuple[str, str, float]] = {}
+        # node to the live resistors connected to it
+        self.incident: Dict[str, Set[str]] = {}
+        # (node, node) pair, in sorted order, to the live resistor between them
+        self.pairs: Dict[Tuple[str, str], str] = {}
+        # nodes that can not be eliminated
+        self.pinned: Set[str] = {SPICE_GND}
+        self.eliminatedNodes: List[EliminatedNode] = []
+        self.reducedCount = 0
+
+    def reduce(self) -> CircuitReduction:
+        """
+        A function that reduces the circuit.
+
+        Returns:
+            The reduced circuit along with what's needed to reconstruct the original one
+        """
+        others: componentsInfoType = {}
+        zeroResistors: List[Tuple[str, str]] = []
+        resistors: List[Tuple[str, str, str, float]] = []
+
+        for componentID, componentInfo in self.componentsInfo.items():
+            spec = getComponentSpec(componentInfo.get("type"))
+            nodes = (
+                getTerminalNodes(componentInfo, spec.terminals)
+                if spec is not None
+                else None
+            )
+            if spec is None or spec.spicePrefix is None or nodes is None:
+                # nothing to reduce. eg: GND or a component that will be left out
+                continue
+            nodes = [self.groundNode(node) for node in nodes]
+            if spec.spicePrefix != "R":
+                others[componentID] = componentInfo
+                self.pinned.update(nodes)
+                continue
+            resistance = siValue(componentInfo.get("data").get("R"))
+            if resistance == 0:
+                zeroResistors.append((nodes[0], nodes[1]))
+            else:
+                resistors.append((componentID, nodes[0], nodes[1], resistance))
+
+        # merge the nodes shorted by zero ohm resistors
+        representatives = self.mergeShorts(zeroResistors)
+        node = lambda nodeID: representatives.get(nodeID, nodeID)
+
+        for componentID, node1, node2, resistance in resistors:
+            self.addResistor(componentID, node(node1), node(node2), resistance)
+
+        # eliminate nodes until nothing changes
+        queue = deque(node for node in self.incident if node not in self.pinned)
+        while queue:
+            self.eliminateNode(queue.popleft(), queue)
+
+        # build the reduced components information
+        reducedInfo: componentsInfoType = {}
+        for componentID, componentInfo in others.items():
+            spec = getComponentSpec(componentInfo.get("type"))
+            reducedComponentInfo = {
+                "type": componentInfo["type"],
+                "data": componentInfo["data"],
+            }
+            for index in range(spec.terminals):
+                key = f"node{index + 1}"
+                reducedComponentInfo[key] = node(self.groundNode(componentInfo[key]))
+            reducedInfo[componentID] = reducedComponentInfo
+        for componentID, (node1, node2, resistance) in self.resistors.items():
+            if componentID in self.componentsInfo:
+                data = self.componentsInfo[componentID]["data"]
+            else:
+                data = {"R": [repr(resistance), "Ohm"]}
+            reducedInfo[componentID] = {
+                "type": "Resistor",
+                "data": data,
+                "node1": node1,
+                "node2": node2,
+            }
+
+        return CircuitReduction(
+            componentsInfo=reducedInfo,
+            GNDNodes=[SPICE_GND],
+            eliminatedNodes=self.eliminatedNodes,
+            originalComponentsInfo=self.componentsInfo,
+            originalGNDNodes=list(self.GNDNodes),
+        )
+
+    def groundNode(self, nodeID: str) -> str:
+        """
+        A function that returns the name of a node in the reduced circuit. All ground nodes become SPICE's ground node.
+        """
+        return SPICE_GND if nodeID in self.GNDNodes else nodeID
+
+    def mergeShorts(self, shorts: List[Tuple[str, str]]) -> Dict[str, str]:
+        """
+        A function that merges the nodes connected by zero ohm resistors.
+        Ground or a pinned node is kept as the node a group is merged into, when the group has one.
+
+        Returns:
+            A dictionary of the merged nodes and the node each one was merged into
+        """
+        nodes = UnionFind()
+        for node1, node2 in shorts:
+            nodes.union(node1, node2)
+        groups: Dict[str, List[str]] = {}
+        for node in nodes.parents:
+            groups.setdefault(nodes.find(node), []).append(node)
+
+        representatives: Dict[str, str] = {}
+        for members in groups.values():
+            if SPICE_GND in members:
+                keep = SPICE_GND
+            else:
+                keep = next(
+                    (member for member in members if member in self.pinned), members[0]
+                )
+            for member in members:
+                if member != keep:
+                    representatives[member] = keep
+                    self.eliminatedNodes.append(EliminatedNode(member, keep, keep))
+        return representatives
+
+    def addResistor(
+        self, componentID: str, node1: str, node2: str, resistance: float
+    ) -> None:
+        """
+        A function that adds a live resistor. A resistor in parallel with one that's already there is combined with it.
+        A resistor from a node to itself carries no current and is dropped.
+        """
+        if node1 == node2:
+            return
+        pair = (node1, node2) if node1 < node2 else (node2, node1)
+        existingID = self.pairs.get(pair)
+        if existingID is not None:
+            (_, _, existingResistance) = self.removeResistor(existingID)
+            resistance = (
+                existingResistance * resistance / (existingResistance + resistance)
+            )
+            componentID = self.newResistorID()
+        self.resistors[componentID] = (node1, node2, resistance)
+        self.incident.setdefault(node1, set()).add(componentID)
+        self.incident.setdefault(node2, set()).add(componentID)
+        self.pairs[pair] = componentID
+
+    def removeResistor(self, componentID: str) -> Tuple[str, str, float]:
+        (node1, node2, resistance) = self.resistors.pop(componentID)
+        self.incident[node1].discard(componentID)
+        self.incident[node2].discard(componentID)
+        del self.pairs[(node1, node2) if node1 < node2 else (node2, node1)]
+        return node1, node2, resistance
+
+    def newResistorID(self) -> str:
+        componentID = f"Reduced-{self.reducedCount}"
+        self.reducedCount += 1
+        return componentID
+
+    def otherNode(self, componentID: str, node: str) -> Tuple[str, float]:
+        """
+        A function that returns the node at the other end of a resistor and its resistance
+        """
+        (node1, node2, resistance) = self.resistors[componentID]
+        return (node2 if node1 == node else node1), resistance
+
+    def eliminateNode(self, node: str, queue: deque) -> None:
+        """
+        A function that eliminates the node if it's a dangling end or the middle of two resistors in series.
+        The nodes next to it are queued to be looked at again.
+        """
+        if node in self.pinned:
+            return
+        incident = self.incident.get(node)
+        if not incident or len(incident) > 2:
+            return
+
+        if len(incident) == 1:
+            # a dangling resistor carries no current. the node follows the other end
+            componentID = next(iter(incident))
+            other, _ = self.otherNode(componentID, node)
+            self.removeResistor(componentID)
+            self.eliminatedNodes.append(EliminatedNode(node, other, other))
+            queue.append(other)
+            return
+
+        firstID, secondID = incident
+        a, resistanceA = self.otherNode(firstID, node)
+        b, resistanceB = self.otherNode(secondID, node)
+        self.removeResistor(firstID)
+        self.removeResistor(secondID)
+        if a == b:
+            # both resistors go back to the same node. no current flows through them
+            self.eliminatedNodes.append(EliminatedNode(node, a, a))
+        else:
+            # the node divides the voltage between a and b
+            self.eliminatedNodes.append(
+                EliminatedNode(node, a, b, resistanceA / (resistanceA + resistanceB))
+            )
+            self.addResistor(self.newResistorID(), a, b, resistanceA + resistanceB)
+        queue.append(a)
+        queue.append(b)
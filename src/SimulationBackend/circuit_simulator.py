@@ -1,109 +1,460 @@
-from typing import Dict, Union, Literal, Tuple, List
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
+from typing import Dict, Optional, Tuple, TypeVar, List, TYPE_CHECKING
 
-from dotenv import load_dotenv
-
-from components.general import GeneralComponent, componentDataType
+from components import getComponentSpec, collectSubcircuits
+from components.types.quantity import siValue
 from logger import logger
-from .middleware import CircuitNode
+from model import CircuitModel
+from .netlist_writer import (
+    NetlistWriter,
+    componentsInfoType,
+    getTerminalNodes,
+    SPICE_GND,
+)
+from .circuit_reducer import CircuitReducer, CircuitReduction
+from .topology_validator import TopologyValidator, TopologyIssue, IssueSeverity
+
+if TYPE_CHECKING:
+    from .netlist_table import NetlistTable
+    from .shared_results import SharedResults
+    from .waveform_store import WaveformStore, WaveformWriter
+    from .streaming_ngspice import StreamingNgSpice
+
+# a formatted or a plain value
+T = TypeVar("T")
+
+
+class SimulationError(Exception):
+    """
+    Raised when ngspice can not be loaded or fails to run the analysis
+    """
+
+
+@lru_cache(maxsize=None)
+def loadEnvironment() -> None:
+    """
+    A function that loads the environment variables from the .env file before ngspice is loaded for the first time.
+    PySpice, ngspice and numpy are only imported when the first simulation runs to keep the app startup fast.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+# the reason ngspice could not be loaded. the library is loaded once per process, so it's never tried again
+ngspiceLoadError: Optional[str] = None
+
+
+def loadNgSpice() -> "StreamingNgSpice":
+    """
+    A function that returns the shared ngspice instance, loading the library the first time it's needed.
+    Once the library could not be loaded, it's not tried again, as a second load fails with a cffi error instead.
+
+    Raises:
+        SimulationError: if ngspice can not be loaded
+    """
+    global ngspiceLoadError
+    if ngspiceLoadError is not None:
+        raise SimulationError(f"ngspice could not be loaded. {ngspiceLoadError}")
+    from .streaming_ngspice import StreamingNgSpice
+
+    try:
+        return StreamingNgSpice.instance()
+    except OSError as e:
+        ngspiceLoadError = str(e)
+        raise SimulationError(f"ngspice could not be loaded. {e}") from e
+
+
+@contextmanager
+def ngspiceErrors():
+    """
+    A context manager that raises the errors ngspice reports while running the body as `SimulationError`
+    """
+    from PySpice.Spice.NgSpice.Shared import NgSpiceCommandError, NgSpiceCircuitError
 
-from PySpice.Spice.Netlist import Circuit
+    try:
+        yield
+    except (NgSpiceCommandError, NgSpiceCircuitError) as e:
+        raise SimulationError(str(e)) from e
 
-load_dotenv()
 
+def componentBranchNames(componentID: str, spicePrefix: str) -> Tuple[str, str]:
+    """
+    A function that returns the names of the branches a component's current can be found under in ngspice's results
 
-componentsInfoType = Dict[
-    str, Dict[Literal["data", "node1", "node2"], Union[componentDataType, str]]
-]
+    Returns:
+        The lower case names of the component's probe source and of the element itself. eg: ("vrresistor-0_plus", "rresistor-0")
+    """
+    elementName = f"{spicePrefix}{componentID}".lower()
+    return f"v{elementName}_plus", elementName
 
 
 class CircuitSimulator:
     def __init__(
         self,
-        components: Dict[str, GeneralComponent],
-        circuitNodes: Dict[str, CircuitNode],
+        model: CircuitModel,
+        fastNetlist: bool = True,
+        currentProbes: bool = True,
+        reduceCircuit: bool = False,
     ) -> None:
-        self.components = components
-        self.circuitNodes = circuitNodes
+        # the circuit to simulate. the simulator only reads the model, never the items on the canvas
+        self.model = model
 
-        # keep track of ground nodes in the circuit
-        self.GNDNodes: List[str] = []
+        # write the netlist text directly instead of building a PySpice circuit when True
+        self.fastNetlist = fastNetlist
+        # measure resistor currents with zero volt probe sources when True.
+        # when False, resistor currents are computed from the node voltages after the analysis
+        self.currentProbes = currentProbes
+        # solve a smaller equivalent of the circuit when True. see `CircuitReducer`
+        self.reduceCircuit = reduceCircuit
+        # the reduced circuit of the last simulation, if the circuit was reduced
+        self.reduction: Optional[CircuitReduction] = None
 
-        # extract component information from the components and nodes provided
+        # extract component information from the model provided
         self.extractComponentNodesAndData()
 
-    def extractComponentNodesAndData(self):
-        logger.info("Extracting Components Information")
-        self.componentsInfo: componentsInfoType = {}
-        for component in self.components.values():
-            # add the component data to componentsInfo
-            componentInfo = {}
-            componentInfo["data"] = component.data
-
-            # get the two nodes the two terminals are connected to
-            for circuitNode in self.circuitNodes.values():
-                # check if currentNode is connected to a ground node
-                if (
-                    component.name == "GND"
-                    and (component.uniqueID, 0) in circuitNode.componentTerminals
-                ):
-                    self.GNDNodes.append(circuitNode.uniqueID)
-                if (component.uniqueID, 0) in circuitNode.componentTerminals:
-                    componentInfo["node1"] = circuitNode.uniqueID
-                if (component.uniqueID, 1) in circuitNode.componentTerminals:
-                    componentInfo["node2"] = circuitNode.uniqueID
-
-            # add single componentInfo to the full componentsInfo variable
-            self.componentsInfo[component.uniqueID] = componentInfo
+    @classmethod
+    def fromComponentsInfo(
+        cls,
+        componentsInfo: componentsInfoType,
+        GNDNodes: List[str],
+        fastNetlist: bool = True,
+        currentProbes: bool = True,
+        reduceCircuit: bool = False,
+    ) -> "CircuitSimulator":
+        """
+        A function that creates a simulator from already extracted components information instead of a circuit model.
+
+        Params:
+            componentsInfo: the components information. Same format as the one extracted from the canvas
+            GNDNodes: a list of the uniqueIDs of the nodes connected to ground
+
+        Returns:
+            A `CircuitSimulator` instance
+        """
+        from .netlist_table import NetlistTable
+
+        return cls.fromTable(
+            NetlistTable.fromComponentsInfo(componentsInfo, GNDNodes),
+            fastNetlist=fastNetlist,
+            currentProbes=currentProbes,
+            reduceCircuit=reduceCircuit,
+        )
+
+    @classmethod
+    def fromTable(
+        cls,
+        table: "NetlistTable",
+        fastNetlist: bool = True,
+        currentProbes: bool = True,
+        reduceCircuit: bool = False,
+    ) -> "CircuitSimulator":
+        """
+        A function that creates a simulator from a netlist table instead of a circuit model.
+        eg: a table memory mapped from the files the app saved it to, in a worker process
+
+        Params:
+            table: the netlist table of the circuit
+
+        Returns:
+            A `CircuitSimulator` instance
+        """
+        simulator = cls(
+            CircuitModel(),
+            fastNetlist=fastNetlist,
+            currentProbes=currentProbes,
+            reduceCircuit=reduceCircuit,
+        )
+        simulator.table = table
+        return simulator
+
+    def extractComponentNodesAndData(self) -> "NetlistTable":
+        """
+        A function that fills the netlist table of the circuit straight from the model.
+        numpy is only imported here, when the first simulation runs.
+        """
+        from .netlist_table import NetlistTable
 
+        logger.info("Extracting Components Information")
+        self.table = NetlistTable.fromModel(self.model)
         logger.info("Components Information Extracted")
-        return self.componentsInfo
+        return self.table
+
+    @property
+    def GNDNodes(self) -> List[str]:
+        # all the ground nodes are SPICE's ground node in the table
+        return [SPICE_GND]
+
+    @cached_property
+    def componentsInfo(self) -> componentsInfoType:
+        """
+        The components information of the circuit, built from the table the first time it's needed.
+        Only the parts of the simulator that work on dictionaries use it: the PySpice path and the circuit reducer.
+        """
+        return self.table.toComponentsInfo()
 
     def createPySpiceCircuit(self):
+        from PySpice.Spice.Netlist import Circuit
+
+        from PySpice.Spice.Netlist import SubCircuit
+
         logger.info("Creating PySpice Circuit")
+        componentsInfo, GNDNodes = self.netlistComponents()
         # create an instance of the PySpice circuit
         circuit = Circuit("Circuit")
-        # add circuit components based on the componentsInfo
-        for componentID in self.componentsInfo.keys():
-            componentInfo = self.componentsInfo.get(componentID)
-            # get component's nodes
-            node1 = (
-                circuit.gnd
-                if componentInfo.get("node1") in self.GNDNodes
-                else componentInfo.get("node1")
+        # define every block used in the circuit once
+        for definition in collectSubcircuits(componentsInfo):
+            subcircuit = SubCircuit(definition.name, *definition.ports)
+            self.addPySpiceElements(
+                subcircuit, definition.componentsInfo, definition.GNDNodes, False
             )
-            node2 = (
-                circuit.gnd
-                if componentInfo.get("node2") in self.GNDNodes
-                else componentInfo.get("node2")
-            )
-            if (node1 is not None) and (node2 is not None):
-                if "Resistor" in componentID:
-                    # component is a resistor. eg: Resistor-0
-                    # add resistor component to the circuit instance
-                    (R_value, R_unit) = componentInfo.get("data").get("R")
-                    circuit.R(componentID, node1, node2, f"{R_value}@u_{R_unit}")
-                    # adding current probe to the resistor to keep track of current flowing through resistor
-                    circuit[f"R{componentID}"].plus.add_current_probe(circuit)
-                elif "VoltageSource" in componentID:
-                    # component is a voltage source. eg: VoltageSource-0
-                    # add voltage source component to the circuit instance
-                    (V_value, V_unit) = componentInfo.get("data").get("V")
-                    circuit.V(componentID, node1, node2, f"{V_value}@u_{V_unit}")
+            circuit.subcircuit(subcircuit)
+        # add circuit components based on the componentsInfo
+        self.addPySpiceElements(circuit, componentsInfo, GNDNodes, self.currentProbes)
 
         logger.info("PySpice Circuit Created")
         return circuit
 
-    def simulate(self):
+    def addPySpiceElements(
+        self,
+        netlist,
+        componentsInfo: componentsInfoType,
+        GNDNodes: List[str],
+        currentProbes: bool,
+    ) -> None:
+        """
+        A function that adds the elements of the given components to a PySpice circuit or subcircuit.
+
+        Params:
+            netlist: the PySpice `Circuit` or `SubCircuit` to add the elements to
+            componentsInfo: the components of the circuit or of the block
+            GNDNodes: the nodes tied to ground
+            currentProbes: add a current probe to every element that asks for one
+        """
+        GNDNodes = set(GNDNodes)
+        for componentID, componentInfo in componentsInfo.items():
+            # get the component type's spec to know how to add it to the circuit
+            spec = getComponentSpec(componentInfo.get("type"))
+            if spec is None or spec.spicePrefix is None:
+                continue
+            # get component's nodes
+            nodes = getTerminalNodes(componentInfo, spec.terminals)
+            if nodes is None:
+                continue
+            nodes = [netlist.gnd if node in GNDNodes else node for node in nodes]
+            if spec.subcircuit is not None:
+                # an instance of a block refers to the block's definition by name
+                netlist.X(componentID, spec.subcircuit.name, *nodes)
+                continue
+            # add the element to the circuit instance using the element method of its SPICE letter. eg: circuit.R
+            value = siValue(componentInfo.get("data").get(spec.parameters[0].key))
+            addElement = getattr(netlist, spec.spicePrefix)
+            addElement(componentID, *nodes, value)
+            if spec.currentProbe and currentProbes:
+                # adding current probe to the element to keep track of current flowing through it
+                netlist[f"{spec.spicePrefix}{componentID}"].plus.add_current_probe(
+                    netlist
+                )
+
+    def netlistComponents(self) -> Tuple[componentsInfoType, List[str]]:
+        """
+        A function that returns the components and ground nodes that go into the netlist.
+        They are the ones of the reduced circuit when the circuit was reduced.
+        """
+        if self.reduction is not None:
+            return self.reduction.componentsInfo, self.reduction.GNDNodes
+        return self.componentsInfo, self.GNDNodes
+
+    def createNetlist(self) -> NetlistWriter:
+        """
+        A function that creates a netlist writer for the circuit. The writer produces the SPICE deck
+        straight from the componentsInfo without building a PySpice circuit.
+
+        Returns:
+            A `NetlistWriter` instance that can be written to a file or turned into a string
+        """
+        if self.reduction is not None:
+            return NetlistWriter(
+                self.reduction.componentsInfo,
+                self.reduction.GNDNodes,
+                temperature=25,
+                nominalTemperature=25,
+                currentProbes=self.currentProbes,
+            )
+        return NetlistWriter.fromTable(
+            self.table,
+            temperature=25,
+            nominalTemperature=25,
+            currentProbes=self.currentProbes,
+        )
+
+    def writeNetlist(self, path: str) -> None:
+        """
+        A function that writes the SPICE deck of the circuit to the file at the given path
+        """
+        self.createNetlist().writeToFile(path)
+
+    def runNetlist(self, netlist: str):
+        """
+        A function that loads a SPICE deck into the shared ngspice instance, runs it and returns the analysis.
+
+        Params:
+            netlist: string - the full SPICE deck, analysis card included
+
+        Returns:
+            The PySpice analysis of the last plot ngspice produced
+        """
+        ngspice = loadNgSpice()
+        ngspice.destroy()
+        ngspice.load_circuit(netlist)
+        ngspice.run()
+
+        plotName = ngspice.last_plot
+        if plotName == "const":
+            raise SimulationError("ngspice did not produce any results")
+
+        return ngspice.plot(None, plotName).to_analysis()
+
+    def streamNetlist(self, netlist: str, writer: "WaveformWriter") -> None:
+        """
+        A function that runs a SPICE deck in ngspice and writes every point of its vectors to the writer as it's computed.
+        The results are not loaded into Python and the plot is dropped from ngspice once the run is done.
+
+        Params:
+            netlist: string - the full SPICE deck, analysis card included
+            writer: the writer the points are sent to. It's closed once the run is done
+        """
+        ngspice = loadNgSpice()
+        ngspice.destroy()
+        ngspice.load_circuit(netlist)
+        ngspice.writer = writer
+        try:
+            ngspice.run()
+        finally:
+            ngspice.writer = None
+            writer.close()
+            ngspice.destroy()
+
+        if writer.length == 0:
+            raise SimulationError("ngspice did not produce any results")
+
+    def validate(self) -> List[TopologyIssue]:
+        """
+        A function that checks the topology of the circuit without running ngspice. See `TopologyValidator`.
+
+        Returns:
+            The issues found in the circuit. Errors come before warnings
+        """
+        return TopologyValidator.fromTable(self.table).validate()
+
+    def runAnalysis(self):
+        """
+        A function that runs the operating point analysis of the circuit in ngspice.
+
+        Returns:
+            The PySpice analysis
+
+        Raises:
+            SimulationError: if ngspice can not be loaded or the analysis fails
+        """
+        loadEnvironment()
+        with ngspiceErrors():
+            if self.fastNetlist:
+                # write the netlist text directly and feed it to ngspice
+                netlist = self.createNetlist().toString()
+                return self.runNetlist(netlist)
+            # PySpice simulators use the shared instance, so the library is loaded the same way first
+            loadNgSpice()
+            # create a PySpice circuit instance with the component info
+            circuit = self.createPySpiceCircuit()
+            # create a simulator instance
+            simulator = circuit.simulator(temperature=25, nominal_temperature=25)
+            return simulator.operating_point()
+
+    def runTransient(self, step: float, stop: float, path: str) -> "WaveformStore":
+        """
+        A function that runs a transient analysis of the circuit and streams its waveforms to disk.
+
+        Params:
+            step: the suggested time step, in seconds
+            stop: the time the analysis ends at, in seconds
+            path: the directory the waveforms are written to. See `WaveformWriter`
+
+        Returns:
+            A `WaveformStore` over the waveforms
+
+        Raises:
+            SimulationError: if ngspice can not be loaded, the analysis fails or the waveforms can not be written
+        """
+        loadEnvironment()
+        from .waveform_store import WaveformStore, WaveformWriter
+
+        netlist = self.createNetlist().toString(f".tran {step:g} {stop:g}")
+        try:
+            writer = WaveformWriter(path)
+            with ngspiceErrors():
+                self.streamNetlist(netlist, writer)
+        except OSError as e:
+            # a failure of this run only, eg: a full disk. the next simulation tries again
+            raise SimulationError(
+                f"The waveforms could not be written to {path}. {e}"
+            ) from e
+        return WaveformStore(path)
+
+    def checkTopology(self) -> bool:
+        """
+        A function that validates the circuit before it's handed to ngspice. The issues found are logged.
+
+        Returns:
+            `False` if the circuit has errors and can not be simulated
+        """
+        issues = self.validate()
+        for issue in issues:
+            if issue.severity == IssueSeverity.WARNING:
+                logger.warning(str(issue))
+        errors = [issue for issue in issues if issue.severity == IssueSeverity.ERROR]
+        if errors:
+            for issue in errors:
+                logger.error(str(issue))
+            logger.error("Circuit not simulated. Fix the errors above and try again.")
+            return False
+        return True
+
+    def analyse(self):
+        """
+        A function that validates the circuit, reduces it if asked to and runs the analysis.
+        Problems are logged.
+
+        Returns:
+            The PySpice analysis, or `None` if the circuit could not be simulated
+        """
         logger.info("Simulating Circuit")
-        # create a PySpice circuit instance with the component info
-        circuit = self.createPySpiceCircuit()
-        # create a simulator instance
-        simulator = circuit.simulator(temperature=25, nominal_temperature=25)
+
+        # check the circuit before handing it to ngspice
+        if not self.checkTopology():
+            return None
+
+        self.reduction = None
+        if self.reduceCircuit:
+            self.reduction = CircuitReducer(self.componentsInfo, self.GNDNodes).reduce()
+            logger.info(
+                f"Circuit reduced from {len(self.table)} to "
+                f"{len(self.reduction.componentsInfo)} components"
+            )
+
         # analyse the circuit
         try:
-            analysis = simulator.operating_point()
-        except:
-            logger.exception("Operating point analysis failed.")
+            analysis = self.runAnalysis()
+        except SimulationError as e:
+            logger.error(f"Operating point analysis failed. {e}")
+            return None
+
+        return analysis
+
+    def simulate(self):
+        analysis = self.analyse()
+        if analysis is None:
             return None
 
         # get the results from the analysis
@@ -113,25 +464,230 @@ class CircuitSimulator:
 
         return results
 
-    def getResultsFromAnalysis(self, analysis) -> Dict[str, Dict[str, List[str]]]:
-        results: Dict[str, Dict[str, List[str]]] = {}
+    def simulateTransient(
+        self, step: float, stop: float, path: str
+    ) -> Optional["WaveformStore"]:
+        """
+        A function that simulates the circuit over time and writes its waveforms to disk while ngspice runs.
+        Transient waveforms can be much larger than memory, so they are read back lazily. See `WaveformStore`.
+        The circuit is never reduced: the waveforms of eliminated nodes could not be rebuilt.
+
+        Returns:
+            The waveforms, or `None` if the circuit could not be simulated
+        """
+        logger.info("Simulating Circuit Transient")
+
+        if not self.checkTopology():
+            return None
+
+        self.reduction = None
+        try:
+            store = self.runTransient(step, stop, path)
+        except SimulationError as e:
+            logger.error(f"Transient analysis failed. {e}")
+            return None
+
+        logger.info(f"Circuit Simulated. {len(store)} points written to {path}")
+
+        return store
+
+    def simulateShared(self) -> Optional["SharedResults"]:
+        """
+        A function that simulates the circuit and writes the results into shared memory, for simulations run in a worker process.
+        See `getSharedResultsFromAnalysis`.
+
+        Returns:
+            The results, or `None` if the circuit could not be simulated
+        """
+        analysis = self.analyse()
+        if analysis is None:
+            return None
+
+        results = self.getSharedResultsFromAnalysis(analysis)
+
+        logger.info("Circuit Simulated.")
+
+        return results
+
+    def getValuesFromAnalysis(
+        self, analysis
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        A function that reads the voltage of every node and the current of every branch from the analysis.
+        The voltages and currents of the parts of the circuit that were reduced away and the currents of resistors
+        without probes are worked out and added.
 
+        Returns:
+            A tuple of two dictionaries. The lower case node names and their voltages,
+            and the lower case branch names (eg: vrresistor-0_plus or rresistor-0) and their currents
+        """
         # get currents through all components from analysis
-        currents: Dict[str, List[str]] = {}
+        currents: Dict[str, float] = {}
         for current in analysis.branches.values():
-            currentValue = float(current)
-            componentName = str(current)
-            currents[componentName] = [f"{currentValue:.4f}", "A"]
+            currents[str(current)] = float(current)
 
-        # get voltages across all components and at all nodes from analysis
-        voltages: Dict[str, List[str]] = {}
+        # get voltages at all nodes from analysis
+        nodeVoltages: Dict[str, float] = {}
         for voltage in analysis.nodes.values():
-            voltageValue = float(voltage)
-            nodeName = str(voltage)
-            voltages[nodeName] = [f"{voltageValue:.4f}", "V"]
+            nodeVoltages[str(voltage)] = float(voltage)
+
+        reducedCurrents: Dict[str, float] = {}
+        if self.reduction is not None:
+            # work out the voltages and currents of the parts of the circuit that were reduced away
+            reducedVoltages, reducedCurrents = self.reconstructReducedResults(
+                nodeVoltages, dict(currents)
+            )
+            nodeVoltages.update(reducedVoltages)
+
+        if not self.currentProbes:
+            # there are no probe branches for the resistors. compute their currents from the node voltages
+            currents.update(self.computeResistorCurrents(nodeVoltages))
+        currents.update(reducedCurrents)
+
+        return nodeVoltages, currents
+
+    def getResultsFromAnalysis(self, analysis) -> Dict[str, Dict[str, List[str]]]:
+        results: Dict[str, Dict[str, List[str]]] = {}
+
+        nodeVoltages, branchCurrents = self.getValuesFromAnalysis(analysis)
+        currents = {
+            componentName: [f"{currentValue:.4f}", "A"]
+            for componentName, currentValue in branchCurrents.items()
+        }
+        voltages = {
+            nodeName: [f"{voltageValue:.4f}", "V"]
+            for nodeName, voltageValue in nodeVoltages.items()
+        }
 
         # combine current and voltage dictionaries into one big results dictionanry
         results["currents"] = currents
         results["voltages"] = voltages
+        results["componentCurrents"] = self.getComponentCurrents(currents)
 
         return results
+
+    def getSharedResultsFromAnalysis(self, analysis) -> "SharedResults":
+        """
+        A function that writes the results of the analysis into a new block of shared memory as float64 arrays:
+            - "nodeVoltages": the voltage of every node in the "nodes" labels, the lower case node names
+            - "componentCurrents": the current of every component in the "components" labels, the component uniqueIDs.
+              nan for components without a current
+
+        Returns:
+            A `SharedResults` instance. The caller closes it, and the last process to use it unlinks it
+        """
+        import numpy as np
+
+        from .shared_results import SharedResults
+
+        nodeVoltages, branchCurrents = self.getValuesFromAnalysis(analysis)
+        componentCurrents = self.getComponentCurrents(branchCurrents)
+        componentIDs = self.table.componentIDs
+        return SharedResults.create(
+            arrays={
+                "nodeVoltages": np.fromiter(
+                    nodeVoltages.values(), dtype=np.float64, count=len(nodeVoltages)
+                ),
+                "componentCurrents": np.fromiter(
+                    (
+                        componentCurrents.get(componentID, np.nan)
+                        for componentID in componentIDs
+                    ),
+                    dtype=np.float64,
+                    count=len(componentIDs),
+                ),
+            },
+            labels={"nodes": list(nodeVoltages), "components": componentIDs},
+        )
+
+    def reconstructReducedResults(
+        self, nodeVoltages: Dict[str, float], branchCurrents: Dict[str, float]
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        A function that works out the voltages and currents of the parts of the circuit that were reduced away
+        from the analysis of the reduced circuit.
+
+        Params:
+            nodeVoltages: a dictionary of the lower case node names from the analysis and their voltages
+            branchCurrents: a dictionary of the lower case branch names from the analysis and their currents
+
+        Returns:
+            A tuple of two dictionaries. The lower case names of the reduced away nodes and their voltages,
+            and the lower case element names of the reduced away resistors (eg: rresistor-0) and their currents
+        """
+        reduction = self.reduction
+        solvedVoltages: Dict[str, float] = {}
+        solvedCurrents: Dict[str, float] = {}
+        for componentID, componentInfo in reduction.componentsInfo.items():
+            spec = getComponentSpec(componentInfo.get("type"))
+            for node in getTerminalNodes(componentInfo, spec.terminals):
+                if node != SPICE_GND:
+                    solvedVoltages[node] = nodeVoltages.get(node.lower(), 0.0)
+            elementName = f"{spec.spicePrefix}{componentID}".lower()
+            if elementName in branchCurrents:
+                solvedCurrents[componentID] = branchCurrents[elementName]
+
+        allVoltages, allCurrents = reduction.reconstruct(solvedVoltages, solvedCurrents)
+
+        reducedCurrents: Dict[str, float] = {}
+        for componentID, currentValue in allCurrents.items():
+            if componentID in reduction.componentsInfo:
+                continue
+            spec = getComponentSpec(self.componentsInfo[componentID].get("type"))
+            reducedCurrents[f"{spec.spicePrefix}{componentID}".lower()] = currentValue
+
+        GNDNodes = set(self.GNDNodes)
+        reducedVoltages = {
+            node.lower(): voltage
+            for node, voltage in allVoltages.items()
+            if node != SPICE_GND
+            and node not in GNDNodes
+            and node.lower() not in nodeVoltages
+        }
+        return reducedVoltages, reducedCurrents
+
+    def getComponentCurrents(self, currents: Dict[str, T]) -> Dict[str, T]:
+        """
+        A function that maps the currents from the analysis to the uniqueIDs of the components they flow through.
+
+        A component's current is either the current of its probe source (eg: vrresistor-0_plus) or the current
+        of the element itself (eg: vvoltagesource-0 or a computed rresistor-0), so it's found with direct lookups.
+
+        Params:
+            currents: a dictionary of the lower case branch names from the analysis and their currents, formatted or not
+
+        Returns:
+            A dictionary of component uniqueIDs and their currents
+        """
+        componentCurrents: Dict[str, T] = {}
+        specs = self.table.specs
+        for componentID, typeIndex in zip(
+            self.table.componentIDs, self.table.types.tolist()
+        ):
+            spec = specs[typeIndex]
+            if spec is None or spec.spicePrefix is None:
+                continue
+            probeName, elementName = componentBranchNames(componentID, spec.spicePrefix)
+            current = (
+                currents[probeName]
+                if probeName in currents
+                else currents.get(elementName)
+            )
+            if current is not None:
+                componentCurrents[componentID] = current
+        return componentCurrents
+
+    def computeResistorCurrents(
+        self, nodeVoltages: Dict[str, float]
+    ) -> Dict[str, float]:
+        """
+        A function that computes the current through every resistor from the voltages at its two nodes, (V1 - V2) / R.
+        It is used in place of the current probes when they are left out of the netlist.
+
+        Params:
+            nodeVoltages: a dictionary of the lower case node names from the analysis and their voltages
+
+        Returns:
+            A dictionary of the resistor element names as ngspice would report them (eg: rresistor-0) and their currents
+        """
+        return self.table.resistorCurrents(nodeVoltages)
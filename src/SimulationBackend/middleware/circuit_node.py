@@ -1,13 +1,19 @@
-from typing import List, Tuple, Dict, TYPE_CHECKING
+from typing import List, Optional, Tuple, Dict, TYPE_CHECKING
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from model import NetModel, NodeRecord
 
 if TYPE_CHECKING:
     from components import Wire
 
 
 class CircuitNode:
+    """
+    The node on the canvas. The terminals and data of the node live in its `NetModel`,
+    the node itself only adds the wires it's drawn with and the signals the wires listen to.
+    """
+
     name = "CircuitNode"
 
     class Signals(QObject):
@@ -16,15 +22,49 @@ class CircuitNode:
     def __init__(self, nodeCount: int) -> None:
         self.uniqueID = f"{self.name}-{nodeCount}"
 
-        self.componentTerminals: List[Tuple[str, int]] = []
+        # the terminals and data of the node
+        self.model = NetModel(self.uniqueID)
 
         # keep track of wires that make up the node
         self.wires: List["Wire"] = []
 
-        self.data: Dict[str, List[str]] = {}
+        # pyqt signals. only created once something listens to the node
+        self._signals: Optional[CircuitNode.Signals] = None
+
+    @property
+    def signals(self) -> "CircuitNode.Signals":
+        if self._signals is None:
+            self._signals = self.Signals()
+        return self._signals
+
+    @property
+    def componentTerminals(self) -> List[Tuple[str, int]]:
+        return self.model.terminals
+
+    @componentTerminals.setter
+    def componentTerminals(self, componentTerminals: List[Tuple[str, int]]) -> None:
+        self.model.terminals = componentTerminals
+
+    @property
+    def data(self) -> Dict[str, List[str]]:
+        return self.model.data
+
+    def record(self) -> NodeRecord:
+        """
+        A function that returns the state of the node as it's saved. The record does not change with the node
+        """
+        return NodeRecord(
+            self.uniqueID,
+            tuple(tuple(terminal) for terminal in self.componentTerminals),
+            tuple(wire.uniqueID for wire in self.wires),
+        )
 
-        # pyqt signals
-        self.signals = self.Signals()
+    def notifyDataChanged(self) -> None:
+        """
+        A function that emits nodeDataChanged, if anything listens to the node
+        """
+        if self._signals is not None:
+            self._signals.nodeDataChanged.emit()
 
     def addNewWires(self, newWires: List["Wire"]):
         """
@@ -58,16 +98,25 @@ class CircuitNode:
                 # update the wire's node
                 wire.setCircuitNode(None)
 
-    def setNodeData(self, key, value):
+    def setNodeData(self, key, value, notify: bool = True) -> bool:
         """
         A function that sets the node values after simulation. Voltage and the likes.
+        Nothing is emitted when the value is the same as the one the node already has.
 
         Params:
             key: string - the particular node parameter to set
             value: string - the value of the paramter specified in key
+            notify: bool - emit the nodeDataChanged signal when the value changes. Defaults to True
+
+        Returns:
+            `True` if the value changed, `False` otherwise
         """
+        if self.data.get(key) == value:
+            return False
         self.data[key] = value
-        self.signals.nodeDataChanged.emit()
+        if notify:
+            self.notifyDataChanged()
+        return True
 
     def addComponentTerminals(self, newComponentTerminals: List[Tuple[str, int]]):
         """
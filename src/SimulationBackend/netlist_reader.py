@@ -0,0 +1,345 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from components.registry import (
+    ComponentParameter,
+    ComponentSpec,
+    getComponentSpec,
+    getComponentSpecs,
+    registerSubcircuit,
+)
+from components.subcircuit import SubcircuitDefinition
+from components.types import Quantity
+from components.types.quantity import unitMultiplier
+from logger import logger
+from .netlist_writer import SPICE_GND
+
+# the names SPICE knows the ground node by
+GROUND_NODES = {SPICE_GND, "gnd"}
+
+# the scale factors of SPICE numbers. they are not case sensitive, "m" is milli and "meg" is mega
+SPICE_SCALE_FACTORS: Dict[str, float] = {
+    "t": 1e12,
+    "g": 1e9,
+    "meg": 1e6,
+    "k": 1e3,
+    "mil": 25.4e-6,
+    "m": 1e-3,
+    "u": 1e-6,
+    "n": 1e-9,
+    "p": 1e-12,
+    "f": 1e-15,
+}
+# a SPICE number: a float with an optional scale factor, followed by any letters. eg: "4.7k", "1e3", "10megohm", "5V"
+_SPICE_NUMBER_RE = re.compile(
+    r"(?P<number>[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:e[+-]?\d+)?)(?P<scale>meg|mil|[tgkmunpf])?[a-z]*",
+    re.IGNORECASE,
+)
+# an inline comment and the rest of the line after it
+_INLINE_COMMENT_RE = re.compile(r";|\s\$")
+
+
+def parseSpiceNumber(text: str) -> float:
+    """
+    A function that parses a number written the way SPICE reads it into a float.
+
+    Params:
+        text: string - the number. eg: "100", "4.7k", "1e-3", "10Meg" or "5V"
+
+    Returns:
+        The number as a float. eg: 4700.0 for "4.7k"
+
+    Raises:
+        ValueError: if the text is not a number
+    """
+    match = _SPICE_NUMBER_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Not a number: {text!r}")
+    scale = match.group("scale")
+    return float(match.group("number")) * (
+        SPICE_SCALE_FACTORS[scale.lower()] if scale else 1.0
+    )
+
+
+def spiceQuantity(parameter: ComponentParameter, value: float) -> Quantity:
+    """
+    A function that returns a SI float as a quantity of a component property. The largest unit of the property
+    the value is not smaller than is used, and the text is only rounded to two decimals when that does not change the value,
+    so the netlist written from the quantity has the same value again.
+
+    Params:
+        parameter: the declaration of the property
+        value: the SI float. eg: 4700.0
+
+    Returns:
+        The quantity. eg: Quantity("4.70", "kOhm") for a resistance of 4700.0
+    """
+    units = unitMultipliers(parameter)
+    smallestUnit = units[-1][0]
+    for unit, multiplier in units:
+        if abs(value) < multiplier and unit != smallestUnit:
+            continue
+        for text in (f"{value / multiplier:.2f}", repr(value / multiplier)):
+            if float(text) * multiplier == value:
+                return Quantity(text, unit, value)
+    return Quantity(repr(value), smallestUnit, value)
+
+
+@lru_cache(maxsize=None)
+def unitMultipliers(parameter: ComponentParameter) -> Tuple[Tuple[str, float], ...]:
+    """
+    A function that returns the units of a property with what they stand for in the base unit, largest first
+    """
+    return tuple(
+        sorted(
+            ((unit, unitMultiplier(unit)) for unit in parameter.units),
+            key=lambda unit: unit[1],
+            reverse=True,
+        )
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SpiceElement:
+    """
+    An element of a SPICE deck, mapped to the component type it's placed on the canvas as.
+
+    Attributes:
+        name: the name of the element in the deck. eg: "RResistor-0" or "R1"
+        spec: the spec of the component type of the element
+        nodes: the names of the nodes the terminals of the element connect to, in terminal order
+        value: the quantity of the property stamped into the netlist. `None` if the deck does not give one
+    """
+
+    name: str
+    spec: ComponentSpec
+    nodes: Tuple[str, ...]
+    value: Optional[Quantity]
+
+    @property
+    def componentID(self) -> str:
+        # the writer names an element after the component: the SPICE element letter and the uniqueID. eg: "RResistor-0"
+        return self.name[len(self.spec.spicePrefix) :]
+
+
+class NetlistReader:
+    """
+    A class that reads the elements of a SPICE deck, the inverse of the `NetlistWriter`.
+
+    The deck is read from a text stream a line at a time and the elements are yielded as they are read,
+    so only the line being read is held in memory, whatever the size of the deck. Elements are mapped to component types
+    through the SPICE element letter of the specs in the registry, and `X` elements through the name of their block.
+    The blocks a deck defines with `.subckt` that are not registered yet are registered, so their instances can be placed.
+    Elements of other types are skipped and counted.
+
+    As in SPICE, the first line of the deck is its title and is never read as an element.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.title: Optional[str] = None
+        # the element letter to the number of elements of that letter skipped. eg: {"C": 12}
+        self.skipped: Counter = Counter()
+        # the blocks defined in the deck that were registered
+        self.subcircuits: List[SubcircuitDefinition] = []
+        # the component type of every SPICE element letter. blocks are looked up by name instead
+        self.elementSpecs: Dict[str, ComponentSpec] = {}
+        for spec in getComponentSpecs():
+            if spec.spicePrefix is not None and spec.subcircuit is None:
+                self.elementSpecs.setdefault(spec.spicePrefix.upper(), spec)
+
+    def iterLines(self) -> Iterator[Tuple[int, str]]:
+        """
+        A generator that yields the logical lines of the deck with their line numbers. Comments are removed
+        and continuation lines, starting with "+", are joined onto the line they continue.
+        """
+        pending: Optional[str] = None
+        pendingNumber = 0
+        for number, line in enumerate(self.stream, start=1):
+            if number == 1:
+                title = line.strip()
+                self.title = (
+                    title[len(".title") :].strip()
+                    if title.lower().startswith(".title")
+                    else title
+                )
+                continue
+            # full line comments, then inline comments
+            if line.lstrip().startswith("*"):
+                continue
+            line = _INLINE_COMMENT_RE.split(line, maxsplit=1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("+"):
+                if pending is not None:
+                    pending = f"{pending} {line[1:]}"
+                continue
+            if pending is not None:
+                yield pendingNumber, pending
+            pending, pendingNumber = line, number
+        if pending is not None:
+            yield pendingNumber, pending
+
+    def iterElements(self) -> Iterator[SpiceElement]:
+        """
+        A generator that yields the elements of the circuit in the order they are in the deck.
+        Control lines are skipped and reading stops at ".end". The elements inside `.subckt` definitions are not yielded.
+        """
+        # the blocks being defined, innermost last, as (name, ports, elements) tuples
+        definitions: List[Tuple[str, Tuple[str, ...], List[SpiceElement]]] = []
+        for number, line in self.iterLines():
+            tokens = line.split()
+            keyword = tokens[0].lower()
+            if keyword == ".end":
+                return
+            if keyword == ".subckt" and len(tokens) > 1:
+                definitions.append(
+                    (tokens[1], tuple(withoutParameters(tokens[2:])), [])
+                )
+                continue
+            if keyword == ".ends":
+                if definitions:
+                    self.defineSubcircuit(*definitions.pop())
+                continue
+            if keyword.startswith("."):
+                # analyses, options, models and other control lines
+                continue
+            element = self.parseElement(number, tokens)
+            if element is None:
+                continue
+            if definitions:
+                definitions[-1][2].append(element)
+            else:
+                yield element
+
+    def parseElement(
+        self, number: int, tokens: Sequence[str]
+    ) -> Optional[SpiceElement]:
+        """
+        A function that maps the tokens of an element line to an element
+
+        Params:
+            number: the line number of the element. used in the warnings
+            tokens: the tokens of the line. eg: ["R1", "in", "out", "4.7k"]
+
+        Returns:
+            The element, or `None` if it's not of a component type in the registry
+        """
+        name = tokens[0]
+        prefix = name[0].upper()
+        if prefix == "X":
+            # the name of the block is the last token before the parameters of the instance
+            tokens = withoutParameters(tokens)
+            spec = getComponentSpec(tokens[-1]) if len(tokens) > 1 else None
+            if spec is not None and spec.subcircuit is None:
+                spec = None
+            nodes = tokens[1:-1]
+        else:
+            spec = self.elementSpecs.get(prefix)
+            nodes = tokens[1 : 1 + spec.terminals] if spec is not None else []
+        if spec is None:
+            if prefix not in self.skipped:
+                logger.warning(
+                    f"Line {number}: {name} is not of a component type simit has. Elements like it are skipped"
+                )
+            self.skipped[prefix] += 1
+            return None
+        if len(nodes) != spec.terminals:
+            logger.warning(
+                f"Line {number}: {name} does not connect all {spec.terminals} terminals of a {spec.name} and is skipped"
+            )
+            self.skipped[prefix] += 1
+            return None
+
+        value = None
+        if spec.parameters and spec.subcircuit is None:
+            value = self.parseValue(
+                number, name, spec.parameters[0], tokens[1 + spec.terminals :]
+            )
+        return SpiceElement(name, spec, tuple(nodes), value)
+
+    def parseValue(
+        self,
+        number: int,
+        name: str,
+        parameter: ComponentParameter,
+        tokens: Sequence[str],
+    ) -> Optional[Quantity]:
+        """
+        A function that reads the value of an element from the tokens after its nodes. eg: ["4.7k"], ["DC", "5"] or ["r=1k"]
+
+        Returns:
+            The value, or `None` if the tokens do not give one. The default of the component type is used then
+        """
+        for token in tokens:
+            if token.lower() == "dc":
+                continue
+            try:
+                return spiceQuantity(
+                    parameter, parseSpiceNumber(token.split("=", 1)[-1])
+                )
+            except ValueError:
+                break
+        logger.warning(
+            f"Line {number}: the value of {name} is not read. The default of {parameter.default} is used"
+        )
+        return None
+
+    def defineSubcircuit(
+        self, name: str, ports: Tuple[str, ...], elements: List[SpiceElement]
+    ) -> None:
+        """
+        A function that registers a block defined in the deck, if there isn't a component type with its name already
+        """
+        if getComponentSpec(name) is not None:
+            return
+        componentsInfo = {}
+        grounded = False
+        # the elements are keyed by their name without the element letter, as the writer adds it back,
+        # unless two elements share it. eg: "R1" and "V1" are then keyed by their full names
+        strippedIDs = Counter(element.componentID for element in elements)
+        for element in elements:
+            componentID = element.componentID
+            if (
+                not componentID
+                or strippedIDs[componentID] > 1
+                or componentID in componentsInfo
+            ):
+                componentID = element.name
+            count = 0
+            while componentID in componentsInfo:
+                count += 1
+                componentID = f"{element.name}-{count}"
+            info = {"type": element.spec.name, "data": {}}
+            if element.spec.parameters and element.spec.subcircuit is None:
+                parameter = element.spec.parameters[0]
+                info["data"][parameter.key] = element.value or Quantity(
+                    *parameter.default
+                )
+            for index, node in enumerate(element.nodes):
+                if node.lower() in GROUND_NODES:
+                    node = SPICE_GND
+                    grounded = True
+                info[f"node{index + 1}"] = node
+            componentsInfo[componentID] = info
+        # the ground inside the block is written as SPICE's ground node again
+        GNDNodes = (SPICE_GND,) if grounded else ()
+        definition = SubcircuitDefinition(
+            name, ports, componentsInfo, GNDNodes, description="imported"
+        )
+        registerSubcircuit(definition)
+        self.subcircuits.append(definition)
+        logger.info(f"Subcircuit {name} registered from the netlist")
+
+
+def withoutParameters(tokens: Sequence[str]) -> List[str]:
+    """
+    A function that drops the parameters at the end of a line, from the first "name=value" or "params:" token on
+    """
+    for index, token in enumerate(tokens):
+        if index > 0 and ("=" in token or token.lower() == "params:"):
+            return list(tokens[:index])
+    return list(tokens)
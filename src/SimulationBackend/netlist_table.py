@@ -0,0 +1,415 @@
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from components.registry import ComponentSpec, getComponentSpec
+from components.subcircuit import SubcircuitDefinition, collectSubcircuits
+from components.types.quantity import BASE_UNITS, Quantity, siValue
+from model import CircuitModel
+from .netlist_writer import componentsInfoType, SPICE_GND
+
+# index of the ground node in the node names of every table
+GND_INDEX = 0
+# node index of a terminal that is not connected
+UNCONNECTED = -1
+
+
+class NetlistTable:
+    """
+    A columnar store of the elements of a circuit, one row per component.
+
+    The per component dictionaries of the components information hold a string ID, a string value and unit pair
+    and a string per node for every component. The table holds the same circuit in a few flat numpy arrays instead:
+        - types: int16 - the index of the component type in `typeNames`
+        - nodes: int32 - one column per terminal. The index of the node in `nodeNames`, or -1 if the terminal is not connected
+        - values: float64 - the SI value of the first parameter of the component, nan if it has none
+
+    The uniqueIDs, type names and node names are interned once in plain lists. All ground nodes are node 0, written as
+    SPICE's ground node. The arrays can be saved to a directory and memory mapped back without reading them into memory,
+    so a worker process can open the table of a large circuit without copying it.
+    """
+
+    ARRAY_NAMES = ("types", "nodes", "values")
+    # number of rows turned into Python objects at a time when iterating over the table
+    CHUNK_SIZE = 4096
+
+    def __init__(
+        self,
+        componentIDs: List[str],
+        typeNames: List[str],
+        nodeNames: List[str],
+        types: np.ndarray,
+        nodes: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        self.componentIDs = componentIDs
+        self.typeNames = typeNames
+        self.nodeNames = nodeNames
+        self.types = types
+        self.nodes = nodes
+        self.values = values
+
+        # the specs of the component types, in type index order. None for types that are not registered
+        self.specs: List[Optional[ComponentSpec]] = [
+            getComponentSpec(typeName) for typeName in typeNames
+        ]
+
+    def __len__(self) -> int:
+        return len(self.componentIDs)
+
+    @classmethod
+    def fromModel(cls, model: CircuitModel) -> "NetlistTable":
+        """
+        A function that fills a table straight from a circuit model. The node a ground component is connected to becomes ground.
+
+        Params:
+            model: the circuit to fill the table with
+
+        Returns:
+            A `NetlistTable` instance
+        """
+        terminalNets = model.terminalNets()
+        GNDNodes = set()
+        for component in model.components.values():
+            spec = getComponentSpec(component.type)
+            if spec is not None and spec.ground:
+                netID = terminalNets.get((component.uniqueID, 0))
+                if netID is not None:
+                    GNDNodes.add(netID)
+
+        builder = _TableBuilder(GNDNodes)
+        for component in model.components.values():
+            spec = builder.spec(component.type)
+            terminals = spec.terminals if spec is not None else 2
+            builder.addRow(
+                component.uniqueID,
+                component.type,
+                [
+                    terminalNets.get((component.uniqueID, index))
+                    for index in range(terminals)
+                ],
+                component.data,
+            )
+        return builder.build()
+
+    @classmethod
+    def fromComponentsInfo(
+        cls, componentsInfo: componentsInfoType, GNDNodes: Iterable[str]
+    ) -> "NetlistTable":
+        """
+        A function that fills a table from already extracted components information
+
+        Params:
+            componentsInfo: the components information
+            GNDNodes: the nodes connected to ground
+
+        Returns:
+            A `NetlistTable` instance
+        """
+        builder = _TableBuilder(set(GNDNodes))
+        for componentID, componentInfo in componentsInfo.items():
+            typeName = componentInfo.get("type")
+            spec = builder.spec(typeName)
+            terminals = spec.terminals if spec is not None else 2
+            builder.addRow(
+                componentID,
+                typeName,
+                [componentInfo.get(f"node{index + 1}") for index in range(terminals)],
+                componentInfo.get("data"),
+            )
+        return builder.build()
+
+    def terminalCounts(self) -> np.ndarray:
+        """
+        A function that returns the number of terminals of every row
+        """
+        counts = np.array(
+            [spec.terminals if spec is not None else 2 for spec in self.specs] or [0],
+            dtype=np.int32,
+        )
+        return counts[self.types]
+
+    def iterElements(self) -> Iterator[Tuple[str, str, List[Optional[str]]]]:
+        """
+        A generator that yields the uniqueID, the type name and the node of every terminal of every row.
+        Unconnected terminals are `None`.
+        """
+        typeNames = self.typeNames
+        width = self.nodes.shape[1]
+        # an unconnected terminal, -1, picks the None at the end
+        nodeNames = np.array(self.nodeNames + [None], dtype=object)
+        counts = self.terminalCounts()
+        for componentID, typeIndex, row, count, _ in self.iterChunkedRows(
+            counts, nodeNames
+        ):
+            yield componentID, typeNames[typeIndex], row if count == width else row[
+                :count
+            ]
+
+    def iterChunkedRows(
+        self, counts: np.ndarray, nodeNames: Optional[np.ndarray] = None
+    ) -> Iterator[Tuple[str, int, list, int, float]]:
+        """
+        A generator that yields the uniqueID, type index, nodes, number of terminals and value of every row.
+        The rows are turned into Python objects a chunk at a time, so a list per row of the whole table is never held.
+
+        Params:
+            counts: the number of terminals of every row
+            nodeNames: the names to look the nodes up in. The node indices are yielded when not given
+        """
+        for start in range(0, len(self), self.CHUNK_SIZE):
+            stop = start + self.CHUNK_SIZE
+            nodes = self.nodes[start:stop]
+            yield from zip(
+                self.componentIDs[start:stop],
+                self.types[start:stop].tolist(),
+                (nodeNames[nodes] if nodeNames is not None else nodes).tolist(),
+                counts[start:stop].tolist(),
+                self.values[start:stop].tolist(),
+            )
+
+    def iterElementLines(self, currentProbes: bool) -> Iterator[str]:
+        """
+        A generator that yields the element lines of the circuit. The lines are the same as the ones
+        `iterElementLines` of the netlist writer yields for the same circuit.
+
+        Params:
+            currentProbes: add a zero volt source in series with every element that asks for one
+        """
+        nodeNames = self.nodeNames
+        # type index to (element letter, probe the element, name of the block) tuples
+        stamps = [
+            (
+                spec.spicePrefix,
+                spec.currentProbe and currentProbes,
+                spec.subcircuit.name if spec.subcircuit is not None else None,
+            )
+            if spec is not None and spec.spicePrefix is not None
+            else None
+            for spec in self.specs
+        ]
+        counts = self.terminalCounts()
+        for componentID, typeIndex, row, count, value in self.iterChunkedRows(counts):
+            stamp = stamps[typeIndex]
+            if stamp is None:
+                # component is not a SPICE element. eg: GND
+                continue
+            row = row[:count]
+            if UNCONNECTED in row:
+                continue
+            prefix, probe, blockName = stamp
+            elementName = f"{prefix}{componentID}"
+            if blockName is not None:
+                nodes = " ".join(nodeNames[node] for node in row)
+                yield f"{elementName} {nodes} {blockName}"
+                continue
+            node1, node2 = nodeNames[row[0]], nodeNames[row[1]]
+            if probe:
+                probeNode = f"{elementName}_plus"
+                yield f"{elementName} {probeNode} {node2} {value}"
+                yield f"V{probeNode} {node1} {probeNode} 0"
+            else:
+                yield f"{elementName} {node1} {node2} {value}"
+
+    def subcircuits(self) -> List[SubcircuitDefinition]:
+        """
+        A function that returns the definitions of all the blocks used in the circuit. See `collectSubcircuits`
+        """
+        return collectSubcircuits(
+            {typeName: {"type": typeName} for typeName in self.typeNames}
+        )
+
+    def toComponentsInfo(self) -> componentsInfoType:
+        """
+        A function that turns the table back into components information, for the parts of the simulator that work on it.
+        The first parameter of every component is written in its base unit. Ground nodes are written as SPICE's ground node.
+        """
+        # type index to (key of the first parameter, its base unit) pairs
+        parameters: List[Optional[Tuple[str, str]]] = []
+        for spec in self.specs:
+            if spec is None or not spec.parameters:
+                parameters.append(None)
+                continue
+            parameter = spec.parameters[0]
+            unit = parameter.default[1]
+            baseUnit = next((base for base in BASE_UNITS if unit.endswith(base)), "")
+            parameters.append((parameter.key, baseUnit))
+
+        componentsInfo: componentsInfoType = {}
+        values = self.values.tolist()
+        for (componentID, typeName, nodes), typeIndex, value in zip(
+            self.iterElements(), self.types.tolist(), values
+        ):
+            parameter = parameters[typeIndex]
+            componentInfo = {
+                "type": typeName,
+                "data": {parameter[0]: Quantity(repr(value), parameter[1], value)}
+                if parameter
+                else {},
+            }
+            for index, node in enumerate(nodes):
+                if node is not None:
+                    componentInfo[f"node{index + 1}"] = node
+            componentsInfo[componentID] = componentInfo
+        return componentsInfo
+
+    def resistorCurrents(self, nodeVoltages: Dict[str, float]) -> Dict[str, float]:
+        """
+        A function that computes the current through every connected resistor, (V1 - V2) / R, with one vectorised operation.
+
+        Params:
+            nodeVoltages: a dictionary of the lower case node names from the analysis and their voltages
+
+        Returns:
+            A dictionary of the resistor element names as ngspice would report them (eg: rresistor-0) and their currents
+        """
+        resistorTypes = [
+            index
+            for index, spec in enumerate(self.specs)
+            if spec is not None and spec.spicePrefix == "R"
+        ]
+        if not resistorTypes or len(self) == 0:
+            return {}
+        rows = np.isin(self.types, resistorTypes)
+        rows &= (self.nodes[:, 0] != UNCONNECTED) & (self.nodes[:, 1] != UNCONNECTED)
+        indices = np.flatnonzero(rows)
+        if len(indices) == 0:
+            return {}
+
+        # the ground node is not part of the analysis nodes. its voltage is 0
+        voltages = np.fromiter(
+            (nodeVoltages.get(node.lower(), 0.0) for node in self.nodeNames),
+            dtype=np.float64,
+            count=len(self.nodeNames),
+        )
+        voltages[GND_INDEX] = 0.0
+        nodes = self.nodes[indices]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            I = (voltages[nodes[:, 0]] - voltages[nodes[:, 1]]) / self.values[indices]
+
+        componentIDs = self.componentIDs
+        names = [f"r{componentIDs[index]}".lower() for index in indices.tolist()]
+        return dict(zip(names, I.tolist()))
+
+    def save(self, path: str) -> None:
+        """
+        A function that saves the table into the directory at the given path. The directory is created if needed.
+        Every array is written as its own .npy file so it can be memory mapped on its own.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in self.ARRAY_NAMES:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "names.json"), "w") as f:
+            json.dump(
+                {
+                    "componentIDs": self.componentIDs,
+                    "typeNames": self.typeNames,
+                    "nodeNames": self.nodeNames,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NetlistTable":
+        """
+        A function that loads a table saved with `save`.
+
+        Params:
+            path: the directory the table was saved into
+            mmap: memory map the arrays read only instead of reading them into memory
+
+        Returns:
+            A `NetlistTable` instance
+        """
+        arrays = {
+            name: np.load(
+                os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None
+            )
+            for name in cls.ARRAY_NAMES
+        }
+        with open(os.path.join(path, "names.json")) as f:
+            names = json.load(f)
+        return cls(
+            componentIDs=[sys.intern(name) for name in names["componentIDs"]],
+            typeNames=names["typeNames"],
+            nodeNames=[sys.intern(name) for name in names["nodeNames"]],
+            **arrays,
+        )
+
+
+class _TableBuilder:
+    """
+    Collects the rows of a table and interns the names in them
+    """
+
+    def __init__(self, GNDNodes: set) -> None:
+        self.GNDNodes = GNDNodes
+        self.componentIDs: List[str] = []
+        self.typeNames: List[str] = []
+        self.typeIndices: Dict[str, int] = {}
+        self.specs: Dict[str, Optional[ComponentSpec]] = {}
+        self.nodeNames: List[str] = [SPICE_GND]
+        self.nodeIndices: Dict[str, int] = {SPICE_GND: GND_INDEX}
+        self.types: List[int] = []
+        self.rows: List[List[int]] = []
+        self.values: List[float] = []
+        self.width = 1
+
+    def spec(self, typeName: str) -> Optional[ComponentSpec]:
+        if typeName not in self.specs:
+            self.specs[typeName] = getComponentSpec(typeName)
+        return self.specs[typeName]
+
+    def nodeIndex(self, nodeID: Optional[str]) -> int:
+        if nodeID is None:
+            return UNCONNECTED
+        if nodeID in self.GNDNodes:
+            return GND_INDEX
+        index = self.nodeIndices.get(nodeID)
+        if index is None:
+            index = self.nodeIndices[nodeID] = len(self.nodeNames)
+            self.nodeNames.append(sys.intern(nodeID))
+        return index
+
+    def addRow(
+        self,
+        componentID: str,
+        typeName: str,
+        nodes: List[Optional[str]],
+        data: Optional[Dict[str, List[str]]],
+    ) -> None:
+        typeIndex = self.typeIndices.get(typeName)
+        if typeIndex is None:
+            typeIndex = self.typeIndices[typeName] = len(self.typeNames)
+            self.typeNames.append(typeName)
+
+        value = float("nan")
+        spec = self.spec(typeName)
+        if spec is not None and spec.parameters and data:
+            parameter = data.get(spec.parameters[0].key)
+            if parameter is not None:
+                value = siValue(parameter)
+
+        self.componentIDs.append(sys.intern(componentID))
+        self.types.append(typeIndex)
+        self.rows.append([self.nodeIndex(node) for node in nodes])
+        self.values.append(value)
+        self.width = max(self.width, len(nodes))
+
+    def build(self) -> NetlistTable:
+        width = self.width
+        nodes = np.array(
+            [row + [UNCONNECTED] * (width - len(row)) for row in self.rows],
+            dtype=np.int32,
+        ).reshape(len(self.rows), width)
+        return NetlistTable(
+            componentIDs=self.componentIDs,
+            typeNames=self.typeNames,
+            nodeNames=self.nodeNames,
+            types=np.array(self.types, dtype=np.int16),
+            nodes=nodes,
+            values=np.array(self.values, dtype=np.float64),
+        )
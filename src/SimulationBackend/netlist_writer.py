@@ -0,0 +1,212 @@
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    TextIO,
+    Union,
+    Optional,
+    TYPE_CHECKING,
+)
+
+from components.registry import getComponentSpec
+from components.subcircuit import collectSubcircuits
+from components.types import componentDataType
+from components.types.quantity import siValue
+
+if TYPE_CHECKING:
+    from .netlist_table import NetlistTable
+
+
+# component uniqueID to its "type", "data" and the node of each of its terminals: "node1", "node2", ... "nodeN"
+componentsInfoType = Dict[str, Dict[str, Union[componentDataType, str]]]
+
+# the name SPICE uses for the ground node
+SPICE_GND = "0"
+
+
+def getTerminalNodes(componentInfo: Dict, terminals: int) -> Optional[List[str]]:
+    """
+    A function that returns the nodes the terminals of a component are connected to, in terminal order.
+
+    Params:
+        componentInfo: the information of the component
+        terminals: int - the number of terminals the component has
+
+    Returns:
+        The nodes, or `None` if any terminal is not connected
+    """
+    nodes = [componentInfo.get(f"node{index + 1}") for index in range(terminals)]
+    if any(node is None for node in nodes):
+        return None
+    return nodes
+
+
+def iterElementLines(
+    componentsInfo: componentsInfoType,
+    spiceNode: Callable[[str], str],
+    currentProbes: bool,
+) -> Iterator[str]:
+    """
+    A generator that yields the element lines of the given components.
+
+    Each element is stamped from the spec of its component type, looked up by the type in the componentsInfo.
+    Components that do not have all of their terminals connected are skipped, just like in the PySpice path.
+
+    Params:
+        componentsInfo: the components of a circuit or of a block
+        spiceNode: a function that returns the name a node should be written with
+        currentProbes: add a zero volt source in series with every element that asks for one
+    """
+    for componentID, componentInfo in componentsInfo.items():
+        spec = getComponentSpec(componentInfo.get("type"))
+        if spec is None or spec.spicePrefix is None:
+            # component is not a SPICE element. eg: GND
+            continue
+        nodes = getTerminalNodes(componentInfo, spec.terminals)
+        if nodes is None:
+            continue
+        nodes = [spiceNode(node) for node in nodes]
+
+        # eg: RResistor-0
+        elementName = f"{spec.spicePrefix}{componentID}"
+        if spec.subcircuit is not None:
+            # an instance of a block refers to the block's definition by name
+            yield f"{elementName} {' '.join(nodes)} {spec.subcircuit.name}"
+            continue
+
+        node1, node2 = nodes
+        value = siValue(componentInfo.get("data").get(spec.parameters[0].key))
+        if spec.currentProbe and currentProbes:
+            # the element's plus pin is moved to an internal node and a zero volt source is used as a current probe
+            probeNode = f"{elementName}_plus"
+            yield f"{elementName} {probeNode} {node2} {value}"
+            yield f"V{probeNode} {node1} {probeNode} 0"
+        else:
+            yield f"{elementName} {node1} {node2} {value}"
+
+
+class NetlistWriter:
+    """
+    A class that writes the SPICE netlist of a circuit straight from the extracted components information.
+
+    It produces the same deck PySpice would generate from a `Circuit` built with `CircuitSimulator.createPySpiceCircuit`,
+    but does it in a single streaming pass without building the intermediate PySpice object graph.
+    """
+
+    def __init__(
+        self,
+        componentsInfo: componentsInfoType,
+        GNDNodes: Iterable[str],
+        title: str = "Circuit",
+        temperature: float = 25,
+        nominalTemperature: float = 25,
+        currentProbes: bool = True,
+    ) -> None:
+        self.componentsInfo = componentsInfo
+        # a set makes the ground lookup for each terminal constant time
+        self.GNDNodes = set(GNDNodes)
+        self.title = title
+        self.temperature = temperature
+        self.nominalTemperature = nominalTemperature
+        # add a zero volt source in series with every resistor to measure its current when True
+        self.currentProbes = currentProbes
+        # the columnar table of the circuit, when the writer reads one instead of the components information
+        self.table: Optional["NetlistTable"] = None
+
+    @classmethod
+    def fromTable(cls, table: "NetlistTable", **kwargs) -> "NetlistWriter":
+        """
+        A function that creates a writer that reads the elements of the circuit from a `NetlistTable`.
+        The keyword arguments are the same as the ones of the constructor.
+        """
+        writer = cls({}, (), **kwargs)
+        writer.table = table
+        return writer
+
+    def spiceNode(self, nodeID: str) -> str:
+        """
+        A function that returns the name of a circuit node as it should appear in the netlist.
+        Ground nodes are all written as SPICE's ground node.
+        """
+        return SPICE_GND if nodeID in self.GNDNodes else nodeID
+
+    def iterSubcircuitLines(self) -> Iterator[str]:
+        """
+        A generator that yields a `.subckt` definition for every block used in the circuit.
+        Each block is defined once however many instances of it there are. Blocks are defined before the blocks that use them.
+        The elements inside a block are written without current probes.
+        """
+        if self.table is not None:
+            definitions = self.table.subcircuits()
+        else:
+            definitions = collectSubcircuits(self.componentsInfo)
+        for definition in definitions:
+            GNDNodes = set(definition.GNDNodes)
+            yield f".subckt {definition.name} {' '.join(definition.ports)}"
+            yield from iterElementLines(
+                definition.componentsInfo,
+                lambda node: SPICE_GND if node in GNDNodes else node,
+                currentProbes=False,
+            )
+            yield f".ends {definition.name}"
+
+    def iterCircuitLines(self) -> Iterator[str]:
+        """
+        A generator that yields the title line, the definitions of the blocks and the element lines of the circuit one after the other.
+        """
+        yield f".title {self.title}"
+        yield from self.iterSubcircuitLines()
+        if self.table is not None:
+            yield from self.table.iterElementLines(self.currentProbes)
+            return
+        yield from iterElementLines(
+            self.componentsInfo, self.spiceNode, self.currentProbes
+        )
+
+    def iterControlLines(self, analysis: str = ".op") -> Iterator[str]:
+        """
+        A generator that yields the simulator options, the analysis to run and the end of the deck.
+
+        Params:
+            analysis: string - the SPICE analysis card to run. eg: ".op"
+        """
+        yield f".options TEMP = {self.temperature}C"
+        yield f".options TNOM = {self.nominalTemperature}C"
+        yield f"{analysis} "
+        yield ".end"
+
+    def iterLines(self, analysis: str = ".op") -> Iterator[str]:
+        """
+        A generator that yields every line of the full simulation deck
+        """
+        yield from self.iterCircuitLines()
+        yield from self.iterControlLines(analysis)
+
+    def write(self, stream: TextIO, analysis: str = ".op") -> None:
+        """
+        A function that streams the full simulation deck into a text stream, one line at a time.
+
+        Params:
+            stream: a writable text stream. eg: an open file
+            analysis: string - the SPICE analysis card to run
+        """
+        for line in self.iterLines(analysis):
+            stream.write(line)
+            stream.write("\n")
+
+    def writeToFile(self, path: str, analysis: str = ".op") -> None:
+        """
+        A function that writes the full simulation deck to the file at the given path
+        """
+        with open(path, "w") as f:
+            self.write(f, analysis)
+
+    def toString(self, analysis: str = ".op") -> str:
+        """
+        A function that returns the full simulation deck as one string, ready to be loaded into ngspice
+        """
+        lines: List[str] = list(self.iterLines(analysis))
+        lines.append("")
+        return "\n".join(lines)
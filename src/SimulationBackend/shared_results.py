@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# arrays in the block are aligned to this many bytes
+ALIGNMENT = 8
+
+
+@dataclass(frozen=True)
+class SharedResultsDescriptor:
+    """
+    Where to find results in shared memory. It's all a worker process sends back, however large the results are.
+
+    Attributes:
+        name: the name of the shared memory block
+        arrays: (array name, byte offset, shape) of every float64 array in the block
+        labels: (label name, byte offset, byte length) of every list of labels in the block.
+            The labels are stored as newline separated utf-8 text
+    """
+
+    name: str
+    arrays: Tuple[Tuple[str, int, Tuple[int, ...]], ...]
+    labels: Tuple[Tuple[str, int, int], ...]
+
+
+class SharedResults:
+    """
+    Simulation results in a block of shared memory: named float64 arrays and the lists of labels they are indexed by.
+    eg: the "nodeVoltages" array holds the voltage of every node in the "nodes" labels, in the same order.
+
+    The process that creates the results writes them once. Any other process attaches to them by their descriptor
+    and reads the arrays in place, without the results being pickled or copied.
+    The process that's done with the results last unlinks the block.
+    """
+
+    def __init__(
+        self, memory: SharedMemory, descriptor: SharedResultsDescriptor
+    ) -> None:
+        self.memory = memory
+        self.descriptor = descriptor
+
+        # views into the shared memory block
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.ndarray(shape, dtype=np.float64, buffer=memory.buf, offset=offset)
+            for name, offset, shape in descriptor.arrays
+        }
+        self.labels: Dict[str, List[str]] = {
+            name: self._decodeLabels(offset, length)
+            for name, offset, length in descriptor.labels
+        }
+        # label name to (label to index pairs). built the first time a label is looked up
+        self._indices: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def create(
+        cls, arrays: Dict[str, np.ndarray], labels: Dict[str, Sequence[str]]
+    ) -> "SharedResults":
+        """
+        A function that writes the given arrays and labels into a new block of shared memory.
+
+        Params:
+            arrays: array name to array pairs. The arrays are stored as float64
+            labels: label name to labels pairs. A label can not contain a newline
+
+        Returns:
+            A `SharedResults` instance over the new block
+        """
+        encodedLabels = {
+            name: "\n".join(values).encode() for name, values in labels.items()
+        }
+
+        size = 0
+        arrayLayout: List[Tuple[str, int, Tuple[int, ...]]] = []
+        for name, array in arrays.items():
+            arrayLayout.append((name, size, tuple(np.shape(array))))
+            size += _aligned(int(np.prod(np.shape(array))) * 8)
+        labelLayout: List[Tuple[str, int, int]] = []
+        for name, encoded in encodedLabels.items():
+            labelLayout.append((name, size, len(encoded)))
+            size += _aligned(len(encoded))
+
+        # a block can not be empty
+        memory = SharedMemory(create=True, size=max(size, 1))
+        for (name, offset, shape), array in zip(arrayLayout, arrays.values()):
+            view = np.ndarray(shape, dtype=np.float64, buffer=memory.buf, offset=offset)
+            view[...] = array
+        for (name, offset, length), encoded in zip(labelLayout, encodedLabels.values()):
+            memory.buf[offset : offset + length] = encoded
+
+        descriptor = SharedResultsDescriptor(
+            name=memory.name, arrays=tuple(arrayLayout), labels=tuple(labelLayout)
+        )
+        return cls(memory, descriptor)
+
+    @classmethod
+    def attach(cls, descriptor: SharedResultsDescriptor) -> "SharedResults":
+        """
+        A function that opens results written by another process
+        """
+        return cls(SharedMemory(name=descriptor.name), descriptor)
+
+    def _decodeLabels(self, offset: int, length: int) -> List[str]:
+        if length == 0:
+            return []
+        return bytes(self.memory.buf[offset : offset + length]).decode().split("\n")
+
+    def index(self, labelName: str) -> Dict[str, int]:
+        """
+        A function that returns the position of every label in the arrays indexed by the given labels
+        """
+        index = self._indices.get(labelName)
+        if index is None:
+            index = {label: i for i, label in enumerate(self.labels[labelName])}
+            self._indices[labelName] = index
+        return index
+
+    def value(self, arrayName: str, labelName: str, label: str) -> Optional[float]:
+        """
+        A function that returns the value of the given label in an array, or `None` if the label is not there or has no value.
+        eg: value("nodeVoltages", "nodes", "circuitnode-1")
+        """
+        position = self.index(labelName).get(label)
+        if position is None:
+            return None
+        value = float(self.arrays[arrayName][position])
+        return None if np.isnan(value) else value
+
+    def close(self) -> None:
+        """
+        A function that detaches this process from the block. The arrays can not be used after.
+        """
+        self.arrays.clear()
+        self.memory.close()
+
+    def unlink(self) -> None:
+        """
+        A function that detaches from the block and frees it. Only called once, by the last process to use the results.
+        """
+        self.close()
+        self.memory.unlink()
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,297 @@
+import logging
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from logger import logger
+from model import CircuitModel
+
+if TYPE_CHECKING:
+    from .shared_results import SharedResultsDescriptor
+
+# (level, message) pairs of the records logged while simulating in a worker process
+logRecordsType = List[Tuple[int, str]]
+
+
+class _RecordingHandler(logging.Handler):
+    """
+    Keeps the records logged in a worker process so they can be logged again in the app
+    """
+
+    def __init__(self) -> None:
+        super().__init__(logging.INFO)
+        self.records: logRecordsType = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, record.getMessage()))
+
+
+def simulateInWorker(
+    tablePath: str, options: Dict
+) -> Tuple[Optional["SharedResultsDescriptor"], logRecordsType]:
+    """
+    A function that simulates a circuit in a worker process and leaves the results in shared memory.
+
+    Params:
+        tablePath: the directory the app saved the `NetlistTable` of the circuit into. The table is memory mapped
+        options: the keyword arguments of the `CircuitSimulator`. eg: {"currentProbes": False}
+
+    Returns:
+        A tuple of the descriptor of the results, or `None` if the circuit could not be simulated,
+        and the records logged while simulating
+    """
+    from .circuit_simulator import CircuitSimulator
+    from .netlist_table import NetlistTable
+
+    # only record what's logged. the app logs it again, to its own console and file
+    handler = _RecordingHandler()
+    handlers = logger.handlers
+    logger.handlers = [handler]
+    try:
+        table = NetlistTable.load(tablePath, mmap=True)
+        results = CircuitSimulator.fromTable(table, **options).simulateShared()
+        if results is None:
+            return None, handler.records
+        # the app unlinks the block once it's done with the results
+        descriptor = results.descriptor
+        results.close()
+        return descriptor, handler.records
+    finally:
+        logger.handlers = handlers
+
+
+def simulateTransientInWorker(
+    tablePath: str, step: float, stop: float, path: str, options: Dict
+) -> Tuple[Optional[str], logRecordsType]:
+    """
+    A function that runs a transient analysis in a worker process. The waveforms are streamed to disk and the
+    pyramids the waveform viewer draws them from are built before the app is told, so it never builds them itself.
+
+    Params:
+        tablePath: the directory the app saved the `NetlistTable` of the circuit into
+        step: the suggested time step, in seconds
+        stop: the time the analysis ends at, in seconds
+        path: the directory the waveforms are written to
+        options: the keyword arguments of the `CircuitSimulator`
+
+    Returns:
+        A tuple of the directory of the waveforms, or `None` if the circuit could not be simulated,
+        and the records logged while simulating
+    """
+    from .circuit_simulator import CircuitSimulator
+    from .netlist_table import NetlistTable
+    from .waveform_pyramid import WaveformPyramid
+
+    handler = _RecordingHandler()
+    handlers = logger.handlers
+    logger.handlers = [handler]
+    try:
+        table = NetlistTable.load(tablePath, mmap=True)
+        store = CircuitSimulator.fromTable(table, **options).simulateTransient(
+            step, stop, path
+        )
+        if store is None:
+            return None, handler.records
+        for name in store.names():
+            WaveformPyramid.build(store, name)
+        store.close()
+        return path, handler.records
+    finally:
+        logger.handlers = handlers
+
+
+class SimulationWorker:
+    """
+    Runs simulations in a worker process, one at a time, so the app stays responsive while ngspice runs.
+
+    The netlist table of the circuit is saved to a temporary directory when the simulation is submitted and
+    the worker memory maps it, and the results come back in shared memory. Only the paths and the small descriptor
+    of the results cross the process boundary, however large the circuit is.
+    The worker process is started with the first simulation and kept for the next ones.
+    If it dies, eg: ngspice crashes, the simulation fails and a new worker process is started for the next one.
+    """
+
+    class Signals(QObject):
+        # sends the results, or None if the circuit could not be simulated
+        simulationFinished = pyqtSignal(object)
+        # sends the waveforms of a transient analysis, or None if the circuit could not be simulated
+        transientFinished = pyqtSignal(object)
+        # sends (descriptor, log records). emitted from the thread of the process pool
+        _workerDone = pyqtSignal(object, object)
+        # sends (waveforms directory, log records). emitted from the thread of the process pool
+        _transientDone = pyqtSignal(object, object)
+
+    def __init__(self) -> None:
+        self.signals = self.Signals()
+        # the results are opened in the app's thread
+        self.signals._workerDone.connect(self.onWorkerDone)
+        self.signals._transientDone.connect(self.onTransientDone)
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # True once the worker process of the executor died. the executor can not run anything after that
+        self.executorBroken = False
+        self.future: Optional[Future] = None
+
+    def isRunning(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def submit(self, model: CircuitModel, **options) -> bool:
+        """
+        A function that starts simulating the circuit in the worker process.
+        `simulationFinished` is emitted when it's done.
+
+        Params:
+            model: the circuit to simulate. Its table is saved right away, so it can be edited while the simulation runs
+            options: the keyword arguments of the `CircuitSimulator`
+
+        Returns:
+            `False` if a simulation is already running, `True` otherwise
+        """
+        if self.isRunning():
+            return False
+        self._start(
+            self.signals._workerDone, simulateInWorker, self._saveTable(model), options
+        )
+        return True
+
+    def submitTransient(
+        self, model: CircuitModel, step: float, stop: float, path: str, **options
+    ) -> bool:
+        """
+        A function that starts a transient analysis of the circuit in the worker process.
+        `transientFinished` is emitted with the waveforms when it's done.
+
+        Params:
+            model: the circuit to simulate
+            step: the suggested time step, in seconds
+            stop: the time the analysis ends at, in seconds
+            path: the directory the waveforms are written to
+            options: the keyword arguments of the `CircuitSimulator`
+
+        Returns:
+            `False` if a simulation is already running, `True` otherwise
+        """
+        if self.isRunning():
+            return False
+        self._start(
+            self.signals._transientDone,
+            simulateTransientInWorker,
+            self._saveTable(model),
+            step,
+            stop,
+            path,
+            options,
+        )
+        return True
+
+    def _saveTable(self, model: CircuitModel) -> str:
+        """
+        A function that saves the netlist table of the circuit to a new temporary directory for the worker to load
+
+        Returns:
+            The path of the directory
+        """
+        # numpy is only imported once the first simulation is submitted
+        from .netlist_table import NetlistTable
+
+        tablePath = tempfile.mkdtemp(prefix="simit-table-")
+        NetlistTable.fromModel(model).save(tablePath)
+        return tablePath
+
+    def _getExecutor(self) -> ProcessPoolExecutor:
+        """
+        A function that returns the executor of the worker process. A new one is created if there's none or it's broken
+        """
+        if self.executorBroken:
+            self._discardExecutor()
+        if self.executor is None:
+            # spawn a fresh interpreter instead of forking the app with all of its Qt state
+            self.executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.executor
+
+    def _discardExecutor(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.executorBroken = False
+
+    def _start(self, doneSignal, function, tablePath: str, *args) -> None:
+        # the table of this simulation is deleted by its own callback, as the callback of the previous
+        # simulation may still be running on the thread of the process pool when the next one is submitted
+        try:
+            self.future = self._getExecutor().submit(function, tablePath, *args)
+        except BrokenProcessPool:
+            # the worker process died since the last simulation. try once more with a new one
+            logger.warning("Simulation worker process died. Starting a new one")
+            self._discardExecutor()
+            try:
+                self.future = self._getExecutor().submit(function, tablePath, *args)
+            except BrokenProcessPool as e:
+                self._discardExecutor()
+                self.future = Future()
+                self.future.set_exception(e)
+                # reported from the event loop, like any other simulation, once the caller has returned
+                QTimer.singleShot(
+                    0,
+                    lambda future=self.future: self._onFutureDone(
+                        future, doneSignal, tablePath
+                    ),
+                )
+                return
+        self.future.add_done_callback(
+            lambda future: self._onFutureDone(future, doneSignal, tablePath)
+        )
+
+    def _onFutureDone(self, future: Future, doneSignal, tablePath: str) -> None:
+        # the worker has let go of the table by now
+        shutil.rmtree(tablePath, ignore_errors=True)
+        try:
+            result, records = future.result()
+        except BrokenProcessPool as e:
+            # the worker process died while simulating. the next simulation starts a new one
+            self.executorBroken = True
+            result, records = (
+                None,
+                [(logging.ERROR, f"Simulation worker process died. {e!r}")],
+            )
+        except Exception as e:
+            # the worker process died or the results could not be sent back
+            result, records = (
+                None,
+                [(logging.ERROR, f"Simulation worker failed. {e!r}")],
+            )
+        doneSignal.emit(result, records)
+
+    def onWorkerDone(
+        self, descriptor: Optional["SharedResultsDescriptor"], records: logRecordsType
+    ) -> None:
+        # numpy is only imported once the first results come back
+        from .shared_results import SharedResults
+
+        for level, message in records:
+            logger.log(level, message)
+        results = SharedResults.attach(descriptor) if descriptor is not None else None
+        self.signals.simulationFinished.emit(results)
+
+    def onTransientDone(self, path: Optional[str], records: logRecordsType) -> None:
+        from .waveform_store import WaveformStore
+
+        for level, message in records:
+            logger.log(level, message)
+        store = WaveformStore(path) if path is not None else None
+        self.signals.transientFinished.emit(store)
+
+    def shutdown(self) -> None:
+        """
+        A function that stops the worker process. A running simulation is waited for.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,44 @@
+from typing import Dict, Optional
+
+from PySpice.Spice.NgSpice.Shared import NgSpiceShared
+
+from .waveform_store import WaveformWriter
+
+
+class StreamingNgSpice(NgSpiceShared):
+    """
+    The shared ngspice instance of the app. ngspice sends every point it computes to `send_data`,
+    which hands it to the waveform writer of the running simulation, if there is one.
+
+    There's only one instance: ngspice registers its callbacks once per process.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        # the writer of the simulation being streamed. None when the points are not wanted. eg: an operating point
+        self.writer: Optional[WaveformWriter] = None
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def instance(cls) -> "StreamingNgSpice":
+        """
+        A function that returns the shared instance, created the first time it's needed.
+        PySpice simulators reuse it too, as they look for an instance with the same ngspice id.
+        """
+        if not isinstance(cls._instances.get(0), cls):
+            # an instance created by PySpice does not stream. ngspice keeps the callbacks of the last initialisation
+            cls._instances.pop(0, None)
+        return cls.new_instance(send_data=True)
+
+    def send_data(
+        self,
+        actual_vector_values: Dict[str, complex],
+        number_of_vectors: int,
+        ngspice_id: int,
+    ) -> int:
+        writer = self.writer
+        if writer is not None:
+            # transient and sweep vectors are real
+            writer.append(
+                {name: value.real for name, value in actual_vector_values.items()}
+            )
+        return 0
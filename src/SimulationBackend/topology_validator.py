@@ -0,0 +1,272 @@
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from components.registry import ComponentSpec, getComponentSpec
+from .netlist_writer import componentsInfoType, SPICE_GND
+
+if TYPE_CHECKING:
+    from .netlist_table import NetlistTable
+
+
+class IssueSeverity(Enum):
+    # the circuit can not be simulated
+    ERROR = "ERROR"
+    # the circuit can be simulated but part of it will be left out
+    WARNING = "WARNING"
+
+
+@dataclass(frozen=True)
+class TopologyIssue:
+    """
+    A problem found in the topology of a circuit.
+
+    Attributes:
+        severity: whether the problem stops the circuit from being simulated
+        code: a short name of the kind of problem. eg: "FLOATING_NODE"
+        message: a description of the problem that can be shown to the user
+        componentID: the uniqueID of the component the problem is about, if any
+        nodeID: the uniqueID of the node the problem is about, if any
+    """
+
+    severity: IssueSeverity
+    code: str
+    message: str
+    componentID: Optional[str] = None
+    nodeID: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.code}: {self.message}"
+
+
+class UnionFind:
+    """
+    A disjoint set over hashable items, with path halving and union by size
+    """
+
+    def __init__(self) -> None:
+        self.parents: Dict[str, str] = {}
+        self.sizes: Dict[str, int] = {}
+
+    def find(self, item: str) -> str:
+        parents = self.parents
+        if item not in parents:
+            parents[item] = item
+            self.sizes[item] = 1
+            return item
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    def union(self, a: str, b: str) -> bool:
+        """
+        A function that joins the sets of the two items
+
+        Returns:
+            `False` if the items were already in the same set, `True` otherwise
+        """
+        rootA, rootB = self.find(a), self.find(b)
+        if rootA == rootB:
+            return False
+        if self.sizes[rootA] < self.sizes[rootB]:
+            rootA, rootB = rootB, rootA
+        self.parents[rootB] = rootA
+        self.sizes[rootA] += self.sizes[rootB]
+        return True
+
+
+class TopologyValidator:
+    """
+    A class that checks the topology of a circuit before it's handed to ngspice.
+
+    The circuit is looked at as a graph with the nodes as vertices and the elements as edges. The checks are:
+        - the circuit has elements and a ground
+        - every terminal of every element is connected. Elements with unconnected terminals are left out of the netlist
+        - every node has a DC path to ground, found with a breadth first search from ground
+        - voltage sources do not form loops, found with a union find over the voltage sources.
+          A loop of voltage sources, or a voltage source shorted by its own terminals, has no solution
+
+    All the checks run in a single pass over the components and a single pass over the nodes.
+    """
+
+    # the SPICE elements that force the voltage between their terminals
+    VOLTAGE_SOURCE_PREFIXES = ("V",)
+
+    def __init__(
+        self, componentsInfo: componentsInfoType, GNDNodes: Iterable[str]
+    ) -> None:
+        self.componentsInfo = componentsInfo
+        self.GNDNodes: Set[str] = set(GNDNodes)
+        # the columnar table of the circuit, when the validator reads one instead of the components information
+        self.table: Optional["NetlistTable"] = None
+
+        # component type name to spec pairs. looked up once per type
+        self.specs: Dict[str, Optional[ComponentSpec]] = {}
+
+    @classmethod
+    def fromTable(cls, table: "NetlistTable") -> "TopologyValidator":
+        """
+        A function that creates a validator that reads the elements of the circuit from a `NetlistTable`
+        """
+        validator = cls({}, (SPICE_GND,))
+        validator.table = table
+        return validator
+
+    def spec(self, typeName: str) -> Optional[ComponentSpec]:
+        if typeName not in self.specs:
+            self.specs[typeName] = getComponentSpec(typeName)
+        return self.specs[typeName]
+
+    def iterElements(self) -> Iterator[Tuple[str, str, List[Optional[str]]]]:
+        """
+        A generator that yields the uniqueID, the type name and the node of every terminal of every component.
+        Unconnected terminals are `None`.
+        """
+        if self.table is not None:
+            return self.table.iterElements()
+        return self.iterComponentsInfoElements()
+
+    def iterComponentsInfoElements(
+        self
+    ) -> Iterator[Tuple[str, str, List[Optional[str]]]]:
+        # component type name to keys of the nodes of its terminals
+        nodeKeys: Dict[str, Tuple[str, ...]] = {}
+        for componentID, componentInfo in self.componentsInfo.items():
+            typeName = componentInfo.get("type")
+            keys = nodeKeys.get(typeName)
+            if keys is None:
+                spec = self.spec(typeName)
+                keys = nodeKeys[typeName] = (
+                    tuple(f"node{index + 1}" for index in range(spec.terminals))
+                    if spec is not None
+                    else ()
+                )
+            yield componentID, typeName, [componentInfo.get(key) for key in keys]
+
+    def validate(self) -> List[TopologyIssue]:
+        """
+        A function that runs all the checks on the circuit.
+
+        Returns:
+            The issues found. Errors come before warnings
+        """
+        errors: List[TopologyIssue] = []
+        warnings: List[TopologyIssue] = []
+
+        # node to nodes it shares an element with. a node can be listed more than once
+        adjacency: Dict[str, List[str]] = {}
+        voltageSources = UnionFind()
+        elementCount = 0
+        GNDNodes = self.GNDNodes
+
+        specs = self.specs
+        for componentID, typeName, nodes in self.iterElements():
+            spec = specs[typeName] if typeName in specs else self.spec(typeName)
+            if spec is None:
+                warnings.append(
+                    TopologyIssue(
+                        IssueSeverity.WARNING,
+                        "UNKNOWN_COMPONENT",
+                        f"{componentID} is of an unknown type and will be left out",
+                        componentID=componentID,
+                    )
+                )
+                continue
+            if spec.spicePrefix is None:
+                # not a SPICE element. eg: GND
+                continue
+
+            if None in nodes:
+                unconnected = [
+                    str(index + 1) for index, node in enumerate(nodes) if node is None
+                ]
+                warnings.append(
+                    TopologyIssue(
+                        IssueSeverity.WARNING,
+                        "UNCONNECTED_TERMINAL",
+                        f"terminal {', '.join(unconnected)} of {componentID} is not connected. "
+                        f"{componentID} will be left out",
+                        componentID=componentID,
+                    )
+                )
+                continue
+
+            elementCount += 1
+            # ground nodes are all the same node. the ports of a block are all taken to be connected through it
+            nodes = [SPICE_GND if node in GNDNodes else node for node in nodes]
+            for node in nodes:
+                neighbours = adjacency.get(node)
+                if neighbours is None:
+                    adjacency[node] = list(nodes)
+                else:
+                    neighbours.extend(nodes)
+
+            if spec.spicePrefix in self.VOLTAGE_SOURCE_PREFIXES:
+                if not voltageSources.union(nodes[0], nodes[1]):
+                    if nodes[0] == nodes[1]:
+                        message = (
+                            f"both terminals of {componentID} are on the same node"
+                        )
+                    else:
+                        message = (
+                            f"{componentID} forms a loop with other voltage sources"
+                        )
+                    errors.append(
+                        TopologyIssue(
+                            IssueSeverity.ERROR,
+                            "VOLTAGE_SOURCE_LOOP",
+                            message,
+                            componentID=componentID,
+                        )
+                    )
+
+        if elementCount == 0:
+            errors.insert(
+                0,
+                TopologyIssue(
+                    IssueSeverity.ERROR,
+                    "EMPTY_CIRCUIT",
+                    "there are no connected components to simulate",
+                ),
+            )
+            return errors + warnings
+
+        if SPICE_GND not in adjacency:
+            errors.insert(
+                0,
+                TopologyIssue(
+                    IssueSeverity.ERROR,
+                    "NO_GROUND",
+                    "the circuit is not connected to ground",
+                ),
+            )
+            return errors + warnings
+
+        for node in sorted(self.floatingNodes(adjacency)):
+            errors.append(
+                TopologyIssue(
+                    IssueSeverity.ERROR,
+                    "FLOATING_NODE",
+                    f"{node} has no path to ground",
+                    nodeID=node,
+                )
+            )
+
+        return errors + warnings
+
+    def floatingNodes(self, adjacency: Dict[str, List[str]]) -> Set[str]:
+        """
+        A function that returns the nodes that can not be reached from ground by a breadth first search through the elements
+        """
+        reached = {SPICE_GND}
+        queue = deque([SPICE_GND])
+        while queue:
+            for neighbour in adjacency[queue.popleft()]:
+                if neighbour not in reached:
+                    reached.add(neighbour)
+                    queue.append(neighbour)
+        if len(reached) == len(adjacency):
+            return set()
+        return adjacency.keys() - reached
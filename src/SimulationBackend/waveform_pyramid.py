@@ -0,0 +1,153 @@
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .waveform_store import WaveformStore, vectorName
+
+# every level summarises this many blocks of the level below it
+FACTOR = 8
+# no level is built once a level has fewer blocks than this
+MIN_BLOCKS = 512
+# blocks of the lower level reduced at a time while building. a multiple of FACTOR
+BUILD_CHUNK = FACTOR * 8192
+PYRAMID_DIR = "pyramid"
+
+
+def _reduce(mins: np.ndarray, maxs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # the min and max of every group of FACTOR points. NaN points are skipped
+    padding = -len(mins) % FACTOR
+    if padding:
+        mins = np.concatenate((mins, np.full(padding, np.nan)))
+        maxs = np.concatenate((maxs, np.full(padding, np.nan)))
+    return (
+        np.fmin.reduce(mins.reshape(-1, FACTOR), axis=1),
+        np.fmax.reduce(maxs.reshape(-1, FACTOR), axis=1),
+    )
+
+
+class WaveformPyramid:
+    """
+    A multi-resolution summary of a waveform for drawing it. Level L holds the min and max of every block
+    of FACTOR ** L points, level 0 being the points themselves.
+
+    A view asks for the level whose blocks are about as wide as a pixel, so drawing a window of the waveform
+    reads O(pixels) values from disk however many points the window covers. The levels are built once,
+    in one pass over the waveform, and saved next to it as memory-mapped `.npy` files.
+    """
+
+    def __init__(
+        self, store: WaveformStore, name: str, levels: List[np.ndarray]
+    ) -> None:
+        """
+        Params:
+            store: the waveforms the pyramid summarises
+            name: the name of the vector in the store
+            levels: the (blocks, 2) min and max arrays of level 1 upwards
+        """
+        self.store = store
+        self.name = vectorName(name)
+        self.levels = levels
+
+    @staticmethod
+    def levelPath(store: WaveformStore, name: str, level: int) -> str:
+        fileName = os.path.splitext(store.files[vectorName(name)])[0]
+        return os.path.join(store.path, PYRAMID_DIR, f"{fileName}.{level}.npy")
+
+    @classmethod
+    def build(cls, store: WaveformStore, name: str) -> "WaveformPyramid":
+        """
+        A function that builds the levels of a vector and saves them. Only a chunk of the vector is in memory at a time.
+        """
+        os.makedirs(os.path.join(store.path, PYRAMID_DIR), exist_ok=True)
+        levels: List[np.ndarray] = []
+        values = store.vector(name)
+        lower: Optional[np.ndarray] = None
+        count = len(values)
+        level = 1
+        while count > MIN_BLOCKS:
+            blocks = -(-count // FACTOR)
+            path = cls.levelPath(store, name, level)
+            summary = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float64, shape=(blocks, 2)
+            )
+            for start in range(0, count, BUILD_CHUNK):
+                stop = min(start + BUILD_CHUNK, count)
+                if lower is None:
+                    points = np.asarray(values[start:stop])
+                    mins, maxs = _reduce(points, points)
+                else:
+                    mins, maxs = _reduce(lower[start:stop, 0], lower[start:stop, 1])
+                summary[start // FACTOR : start // FACTOR + len(mins), 0] = mins
+                summary[start // FACTOR : start // FACTOR + len(maxs), 1] = maxs
+            summary.flush()
+            # read back as a read-only map. the next level is built from it
+            del summary
+            lower = np.load(path, mmap_mode="r")
+            levels.append(lower)
+            count = blocks
+            level += 1
+        return cls(store, name, levels)
+
+    @classmethod
+    def open(cls, store: WaveformStore, name: str) -> "WaveformPyramid":
+        """
+        A function that opens the saved levels of a vector, or builds them if they were not saved yet
+        """
+        levels: List[np.ndarray] = []
+        expected = len(store)
+        while expected > MIN_BLOCKS:
+            path = cls.levelPath(store, name, len(levels) + 1)
+            expected = -(-expected // FACTOR)
+            if not os.path.exists(path):
+                return cls.build(store, name)
+            level = np.load(path, mmap_mode="r")
+            if len(level) != expected:
+                # saved for fewer points, while the simulation was still running
+                return cls.build(store, name)
+            levels.append(level)
+        return cls(store, name, levels)
+
+    def levelFor(self, points: int, pixels: int) -> int:
+        """
+        A function that returns the coarsest level that still has at least two blocks per pixel for the given points
+        """
+        level = 0
+        while (
+            level < len(self.levels) and points // FACTOR ** (level + 1) >= 2 * pixels
+        ):
+            level += 1
+        return level
+
+    def query(
+        self, start: Optional[float], stop: Optional[float], pixels: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        A function that returns a window of the waveform summarised for the given width.
+        One point more is included on each side, so lines reach the edges of the window.
+
+        Params:
+            start: the start of the window on the scale. `None` for the start of the waveform
+            stop: the end of the window on the scale. `None` for the end of the waveform
+            pixels: the width the window is drawn in
+
+        Returns:
+            The scale, minimum and maximum of every block of the window. At level 0 the minimum and maximum are the points
+        """
+        first, last = self.store.indexRange(start, stop)
+        first = max(first - 1, 0)
+        last = min(last + 1, len(self.store))
+        level = self.levelFor(last - first, max(pixels, 1))
+        scale = self.store.scale()
+        if level == 0:
+            values = np.asarray(self.store.vector(self.name)[first:last])
+            return np.asarray(scale[first:last]), values, values
+        blockSize = FACTOR ** level
+        firstBlock = first // blockSize
+        lastBlock = -(-last // blockSize)
+        summary = np.asarray(self.levels[level - 1][firstBlock:lastBlock])
+        # every block is drawn at the time of its first point
+        times = np.asarray(
+            scale[firstBlock * blockSize : lastBlock * blockSize : blockSize]
+        )
+        return times, summary[:, 0], summary[:, 1]
@@ -0,0 +1,316 @@
+import io
+import json
+import os
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# points buffered in memory before they are appended to the vector files
+CHUNK_SIZE = 4096
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+
+
+def vectorName(name: str) -> str:
+    """
+    A function that returns the name a vector is stored under. ngspice names are case insensitive and
+    node voltages are stored under the node name. eg: "V(CircuitNode-1)" -> "circuitnode-1"
+    """
+    name = name.lower()
+    if name.startswith("v(") and name.endswith(")"):
+        return name[2:-1]
+    return name
+
+
+def _npyHeader(length: int) -> bytes:
+    # numpy leaves room in the header for the shape to grow, so the header of a vector
+    # keeps its size however many points are appended and can be rewritten in place
+    header = {"descr": "<f8", "fortran_order": False, "shape": (length,)}
+    stream = io.BytesIO()
+    np.lib.format.write_array_header_1_0(stream, header)
+    return stream.getvalue()
+
+
+class WaveformWriter:
+    """
+    Writes the vectors of a simulation to a directory while the simulation runs, one `.npy` file per vector
+    and an index of the vectors. Points are buffered and appended to the files a chunk at a time,
+    so a simulation never holds more than one chunk of its waveforms in memory.
+
+    The files are valid after every chunk. A `WaveformStore` can read what's been written so far
+    while the simulation is still running.
+    """
+
+    def __init__(
+        self, path: str, scaleName: str = "time", chunkSize: int = CHUNK_SIZE
+    ) -> None:
+        """
+        Params:
+            path: the directory to write the waveforms to. It's created if it does not exist
+            scaleName: the name of the vector the others are plotted against. eg: "time"
+            chunkSize: the number of points buffered before they are written
+        """
+        self.path = path
+        self.scaleName = vectorName(scaleName)
+        self.chunkSize = chunkSize
+        os.makedirs(path, exist_ok=True)
+
+        # vector name to file name pairs, in the order of the columns of the buffer
+        self.files: Dict[str, str] = {}
+        self.columns: Dict[str, int] = {}
+        # the names of a point as they were sent to the columns of their vectors
+        self._rawColumns: Dict[Tuple[str, ...], List[Optional[int]]] = {}
+        self.streams: List[BinaryIO] = []
+        self.buffer: Optional[np.ndarray] = None
+        # points in the buffer and points already written
+        self.buffered = 0
+        self.length = 0
+        self.closed = False
+
+    def _defineVectors(self, names: List[str]) -> None:
+        names = [vectorName(name) for name in names]
+        # the scale always comes first
+        if self.scaleName in names:
+            names.remove(self.scaleName)
+        names.insert(0, self.scaleName)
+        for column, name in enumerate(names):
+            fileName = f"{column}.npy"
+            self.files[name] = fileName
+            self.columns[name] = column
+            stream = open(os.path.join(self.path, fileName), "wb")
+            stream.write(_npyHeader(0))
+            self.streams.append(stream)
+        self.headerSize = len(_npyHeader(0))
+        self.buffer = np.full((self.chunkSize, len(names)), np.nan)
+        self.writeIndex()
+
+    def append(self, values: Dict[str, float]) -> None:
+        """
+        A function that adds one point to every vector. The vectors are defined by the first point.
+        Vectors missing from a point are NaN at that point.
+
+        Params:
+            values: vector name to value pairs. The scale must be one of them. eg: {"time": 1e-6, "v(1)": 4.99}
+        """
+        if self.buffer is None:
+            self._defineVectors(list(values))
+        # ngspice sends the same names with every point, so their columns are looked up once
+        columns = self._rawColumns.get(tuple(values))
+        if columns is None:
+            columns = [self.columns.get(vectorName(name)) for name in values]
+            self._rawColumns[tuple(values)] = columns
+        row = [np.nan] * len(self.columns)
+        for column, value in zip(columns, values.values()):
+            if column is not None:
+                row[column] = value
+        self.buffer[self.buffered] = row
+        self.buffered += 1
+        if self.buffered == self.chunkSize:
+            self.flush()
+
+    def appendColumns(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        A function that adds many points at once. eg: the vectors of a finished analysis.
+
+        Params:
+            columns: vector name to values pairs. Every array must have the same length
+        """
+        if self.buffer is None:
+            self._defineVectors(list(columns))
+        length = len(next(iter(columns.values()), []))
+        start = 0
+        while start < length:
+            count = min(self.chunkSize - self.buffered, length - start)
+            rows = self.buffer[self.buffered : self.buffered + count]
+            rows[:] = np.nan
+            for name, values in columns.items():
+                column = self.columns.get(vectorName(name))
+                if column is not None:
+                    rows[:, column] = values[start : start + count]
+            self.buffered += count
+            start += count
+            if self.buffered == self.chunkSize:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        A function that appends the buffered points to the vector files and updates their headers and the index
+        """
+        if self.buffer is None or self.buffered == 0:
+            return
+        chunk = self.buffer[: self.buffered]
+        self.length += self.buffered
+        header = _npyHeader(self.length)
+        if len(header) != self.headerSize:
+            raise ValueError(
+                f"Waveform header outgrew its space at {self.length} points"
+            )
+        for column, stream in enumerate(self.streams):
+            stream.seek(0, os.SEEK_END)
+            stream.write(np.ascontiguousarray(chunk[:, column]).tobytes())
+            stream.seek(0)
+            stream.write(header)
+            stream.flush()
+        self.buffered = 0
+        self.writeIndex()
+
+    def writeIndex(self, complete: bool = False) -> None:
+        """
+        A function that writes the index of the vectors. It's replaced atomically, so readers never see half of it
+        """
+        index = {
+            "version": FORMAT_VERSION,
+            "scale": self.scaleName,
+            "length": self.length,
+            "chunkSize": self.chunkSize,
+            "vectors": self.files,
+            "complete": complete,
+        }
+        temporaryPath = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(temporaryPath, "w") as f:
+            json.dump(index, f)
+        os.replace(temporaryPath, os.path.join(self.path, INDEX_FILE))
+
+    def close(self) -> None:
+        """
+        A function that writes the last points and marks the waveforms as complete
+        """
+        if self.closed:
+            return
+        self.flush()
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
+        self.buffer = None
+        self.closed = True
+        self.writeIndex(complete=True)
+
+    def __enter__(self) -> "WaveformWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class WaveformStore:
+    """
+    Reads the waveforms written by a `WaveformWriter`. Nothing is read up front: the vector files are memory-mapped
+    when a vector is first asked for, and only the pages of the points that are used are read from disk.
+
+    A window of a vector is found with a binary search on the scale, so reading a few microseconds
+    of a long transient touches a handful of pages, however long the simulation was.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._vectors: Dict[str, np.ndarray] = {}
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        A function that reads the index again, to see the points written since the store was opened
+
+        Returns:
+            `True` if there are new points
+        """
+        with open(os.path.join(self.path, INDEX_FILE)) as f:
+            index = json.load(f)
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported waveform format: {index.get('version')}")
+        previousLength = getattr(self, "length", None)
+        self.scaleName: str = index["scale"]
+        self.length: int = index["length"]
+        self.chunkSize: int = index["chunkSize"]
+        self.files: Dict[str, str] = index["vectors"]
+        self.complete: bool = index["complete"]
+        if self.length != previousLength:
+            # the maps only cover the points that were there when they were opened
+            self._vectors.clear()
+        return previousLength is not None and self.length != previousLength
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, name: str) -> bool:
+        return vectorName(name) in self.files
+
+    def names(self) -> List[str]:
+        """
+        A function that returns the names of the node and branch vectors, without the scale
+        """
+        return [name for name in self.files if name != self.scaleName]
+
+    def vector(self, name: str) -> np.ndarray:
+        """
+        A function that returns a read-only memory-mapped view of every point of a vector.
+
+        Raises:
+            KeyError: if there's no vector with the given name
+        """
+        name = vectorName(name)
+        vector = self._vectors.get(name)
+        if vector is None:
+            if name not in self.files:
+                raise KeyError(f"No waveform named {name!r}")
+            if self.length == 0:
+                vector = np.empty(0)
+            else:
+                # map only the points listed in the index. the file may already hold more
+                vector = np.load(
+                    os.path.join(self.path, self.files[name]), mmap_mode="r"
+                )[: self.length]
+            self._vectors[name] = vector
+        return vector
+
+    def scale(self) -> np.ndarray:
+        return self.vector(self.scaleName)
+
+    def indexRange(
+        self, start: Optional[float] = None, stop: Optional[float] = None
+    ) -> Tuple[int, int]:
+        """
+        A function that returns the range of points between two values of the scale, ends included.
+        `None` leaves that end of the range open.
+        """
+        scale = self.scale()
+        first = 0 if start is None else int(np.searchsorted(scale, start, side="left"))
+        last = (
+            len(scale)
+            if stop is None
+            else int(np.searchsorted(scale, stop, side="right"))
+        )
+        return first, max(first, last)
+
+    def window(
+        self, name: str, start: Optional[float] = None, stop: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        A function that returns the points of a vector between two values of the scale.
+        eg: window("circuitnode-1", 1e-3, 2e-3) for the voltage of the node between 1ms and 2ms
+
+        Returns:
+            The scale and the values of the points. Both are memory-mapped views, only read when they are used
+        """
+        first, last = self.indexRange(start, stop)
+        return self.scale()[first:last], self.vector(name)[first:last]
+
+    def iterChunks(
+        self, name: str, start: Optional[float] = None, stop: Optional[float] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        A generator that yields the points of a window one chunk at a time, for post-processing waveforms
+        larger than memory. The chunks are copies, so the pages they come from can be dropped.
+        """
+        first, last = self.indexRange(start, stop)
+        scale, values = self.scale(), self.vector(name)
+        for chunkStart in range(first, last, self.chunkSize):
+            chunkStop = min(chunkStart + self.chunkSize, last)
+            yield np.array(scale[chunkStart:chunkStop]), np.array(
+                values[chunkStart:chunkStop]
+            )
+
+    def close(self) -> None:
+        """
+        A function that drops the memory maps of the vectors
+        """
+        self._vectors.clear()
@@ -1,11 +1,35 @@
+import sys
+import time
+
+# taken before anything else is imported to measure the cold start of the app
+START_TIME = time.perf_counter()
+
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from MainWindow import MainWindow
 
+from logger import logger
+from utils.resources import loadStyleSheet
+
+
+def logStartupTime():
+    """Log how long it took from the start of the app to the first interactive window"""
+    startupTime = time.perf_counter() - START_TIME
+    logger.info(f"Time to first interactive window: {startupTime:.3f}s")
+
+
 if __name__ == "__main__":
     app = QApplication([])
+    # setting the stylesheet before the window is shown saves re-polishing every widget after it is shown
+    app.setStyleSheet(loadStyleSheet("app"))
     window = MainWindow()
     window.show()
-    with open("src/styles/app.stylesheet.qss", "r") as f:
-        styles = f.read()
-        app.setStyleSheet(styles)
+    # runs as soon as the event loop starts processing events, after the window has been shown
+    QTimer.singleShot(0, logStartupTime)
+    if "--measure-startup" in sys.argv:
+        # quit right after the measurement. useful for timing the cold start from a script
+        QTimer.singleShot(0, app.quit)
+    else:
+        # after the window is shown, so the recovery question shows over it
+        QTimer.singleShot(0, window.startAutosave)
     app.exec()
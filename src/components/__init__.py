@@ -1,28 +1,40 @@
-from .resistor import Resistor
-from .voltage_source import VoltageSource
-from .ground import Ground
-from .wire import Wire
+from typing import List
 
-COMPONENT_CLASSES = sorted(
-    [Resistor, VoltageSource, Ground], key=lambda cls: cls.__name__
+from .types import ComponentCategory
+from .registry import (
+    ComponentSpec,
+    ComponentParameter,
+    COMPONENT_REGISTRY,
+    registerComponent,
+    registerSubcircuit,
+    getComponentSpec,
+    getComponentSpecs,
+    getComponentSearchIndex,
 )
+from .search_index import ComponentSearchIndex
+from .subcircuit import SubcircuitDefinition, collectSubcircuits
 
+# component classes are imported lazily, the first time they are accessed on the package
+_LAZY_CLASSES = {
+    "Resistor": "Resistor",
+    "VoltageSource": "VoltageSource",
+    "Ground": "GND",
+}
 
-from .types import ComponentCategory
+
+def __getattr__(name: str):
+    if name in _LAZY_CLASSES:
+        return getComponentSpec(_LAZY_CLASSES[name]).loadClass()
+    if name == "Wire":
+        from .wire import Wire
+
+        return Wire
+    if name == "COMPONENT_CLASSES":
+        return [spec.loadClass() for spec in getComponentSpecs()]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def getComponentClasses(
+def filterComponentSpecs(
     category: ComponentCategory | None = None, searchText: str | None = None
-):
-    result = COMPONENT_CLASSES
-    if category:
-        result = list(filter(lambda compCls: compCls.category == category, result))
-    if searchText:
-        result = list(
-            filter(
-                lambda compCls: (searchText.lower() in compCls.name.lower())
-                or (searchText.lower() in compCls.category.value.lower()),
-                result,
-            )
-        )
-    return result
+) -> List[ComponentSpec]:
+    return getComponentSearchIndex().search(searchText=searchText, category=category)
@@ -1,2 +1,3 @@
 from .general_component import GeneralComponent, componentDataType
 from .component_and_terminal_index import ComponentAndTerminalIndex
+from .lod_text_item import LODTextItem, levelOfDetail
@@ -1,18 +1,25 @@
-from typing import Tuple, Optional, List, Dict, Union
+from typing import Tuple, Optional, List, Dict, Sequence, Union
 
 from PyQt6.QtWidgets import (
     QGraphicsItem,
-    QGraphicsTextItem,
     QGraphicsObject,
     QGraphicsSceneHoverEvent,
     QGraphicsSceneMouseEvent,
 )
-from PyQt6.QtCore import pyqtSignal, QPointF, QLineF, Qt
-from PyQt6.QtGui import QPainter, QPen, QFont
+from PyQt6.QtCore import pyqtSignal, QPointF, QLineF, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QFont, QPicture
 
 from SimulationBackend.middleware import CircuitNode
+from model import ComponentModel, ComponentRecord
 
-from ..types import ComponentCategory, componentDataType, simulationResultsType
+from ..types import (
+    ComponentCategory,
+    Quantity,
+    componentDataType,
+    simulationResultsType,
+)
+from ..registry import getComponentSpec
+from .lod_text_item import LODTextItem, levelOfDetail
 
 import constants
 
@@ -23,6 +30,10 @@ class GeneralComponent(QGraphicsItem):
     name: str = ...
     category: ComponentCategory = ...
 
+    # the static symbols of the component types, recorded once and replayed on every paint.
+    # component type name to QPicture pairs
+    _symbolPictures: Dict[str, QPicture] = {}
+
     class Signals(QGraphicsObject):
         # signal sends (uniqueID, terminalIndex) as arguments.
         terminalClicked = pyqtSignal(str, int)
@@ -41,9 +52,8 @@ class GeneralComponent(QGraphicsItem):
         self.w: Union[float, int] = ...
         self.h: Union[float, int] = ...
 
-        # component data attribute
-        self.data: componentDataType = {}
-        self.simulationResults: simulationResultsType = {}
+        # the data and simulation results of the component. the item is a view over it
+        self.model = ComponentModel(self.uniqueID, self.name)
 
         # a signals object attribute of the instance to send appropriate signals from different resistors
         self.signals = self.Signals()
@@ -56,24 +66,41 @@ class GeneralComponent(QGraphicsItem):
         # - Component selectable on scene
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
 
+        # - Component rendered into a pixmap cache in device coordinates, only repainted when it changes
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
         # Custom flags to help highlight terminal on hovered upon
         self.hoveredTerminal = None
         self.setAcceptHoverEvents(True)
+        # indices of the terminals on the highlighted node
+        self.highlightedTerminals: Tuple[int, ...] = ()
 
         # initialize text item for displaying component information on component
-        self.textItem = QGraphicsTextItem(self)
+        self.textItem = LODTextItem(self)
         self.textItem.setDefaultTextColor(Qt.GlobalColor.white)
         self.textItem.setFont(QFont("Arial", 8))
+        self.textItem.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
         # initialize component name and ID text item
-        self.uniqueIDTextItem = QGraphicsTextItem(self)
+        self.uniqueIDTextItem = LODTextItem(self)
         self.uniqueIDTextItem.setDefaultTextColor(Qt.GlobalColor.white)
         self.uniqueIDTextItem.setFont(QFont("Arial", 8))
+        self.uniqueIDTextItem.setCacheMode(
+            QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
 
         # keep track of the node each terminal is connected to.
         # terminalIndex to CircuitNode pairs
         self.terminalNodes: Dict[int, CircuitNode] = {}
 
+    @property
+    def data(self) -> componentDataType:
+        return self.model.data
+
+    @property
+    def simulationResults(self) -> simulationResultsType:
+        return self.model.results
+
     def setTerminalNode(self, terminalIndex: int, node: CircuitNode) -> None:
         self.terminalNodes[terminalIndex] = node
 
@@ -92,13 +119,64 @@ class GeneralComponent(QGraphicsItem):
         except Exception as e:
             logger.exception("Unable to write uniqueID on component")
 
-    def setComponentData(self, key: str, value: List[str]):
+    def setDefaultData(self):
+        """
+        A function that sets the component data to the default values declared for the component type in the registry
+        """
+        spec = getComponentSpec(self.name)
+        if spec is None:
+            return
+        for parameter in spec.parameters:
+            self.setComponentData(parameter.key, list(parameter.default))
+
+    def setComponentData(
+        self, key: str, value: Sequence[str], notify: bool = True
+    ) -> bool:
+        """
+        A function that sets a property of the component. A plain [value, unit] pair is parsed into a `Quantity` here,
+        once, so the value is never parsed again when the circuit is simulated.
+
+        Params:
+            key: string - the key of the property. eg: "R"
+            value: the new value and unit of the property, as a `Quantity` or a [value, unit] pair
+            notify: emit componentDataChanged when the value changes. Bulk edits pass `False` and notify once for all components
+
+        Returns:
+            `True` if the value changed, `False` otherwise
+        """
+        value = Quantity.fromPair(value)
+        if self.data.get(key) == value:
+            return False
         self.data[key] = value
-        # emit data changed signals to trigger text update
-        self.signals.componentDataChanged.emit()
+        if notify:
+            # emit data changed signals to trigger text update
+            self.signals.componentDataChanged.emit()
+        return True
+
+    def record(self) -> ComponentRecord:
+        """
+        A function that returns the state of the component as it's saved. The record does not change with the component
+        """
+        pos = self.pos()
+        return ComponentRecord(
+            self.uniqueID,
+            self.name,
+            tuple((key, value[0], value[1]) for key, value in self.data.items()),
+            (pos.x(), pos.y()),
+            self.rotation(),
+        )
 
-    def setSimulationResults(self, key: str, value: List[str]):
+    def setSimulationResults(self, key: str, value: List[str]) -> bool:
+        """
+        A function that sets a simulation result of the component.
+
+        Returns:
+            `True` if the value changed, `False` otherwise
+        """
+        if self.simulationResults.get(key) == value:
+            return False
         self.simulationResults[key] = value
+        return True
 
     def updateText(self):
         ...
@@ -113,14 +191,68 @@ class GeneralComponent(QGraphicsItem):
         return super().itemChange(change, value)
 
     def paint(self, painter: QPainter, option, widget) -> None:
+        if levelOfDetail(self, option, painter) < constants.LOD_SYMBOLS:
+            # zoomed too far out to make out the symbol. draw a plain rectangle instead
+            if self.isSelected():
+                pen = QPen(Qt.GlobalColor.red)
+            elif self.highlightedTerminals:
+                pen = QPen(QColor(constants.NET_HIGHLIGHT_COLOR))
+            else:
+                pen = QPen(Qt.GlobalColor.white)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawRect(QRectF(0, 0, self.w, self.h))
+            return
         if self.hoveredTerminal is not None:
             painter.setPen(QPen(Qt.GlobalColor.white, 1))
             radius = 3
             painter.drawEllipse(self.hoveredTerminal, radius, radius)
+        if self.highlightedTerminals:
+            color = QColor(constants.NET_HIGHLIGHT_COLOR)
+            painter.setPen(QPen(color, 1))
+            painter.setBrush(color)
+            terminalPositions = self.getTerminalPositions()
+            for terminalIndex in self.highlightedTerminals:
+                painter.drawEllipse(
+                    self.mapFromScene(terminalPositions[terminalIndex]), 3, 3
+                )
+            painter.setBrush(Qt.BrushStyle.NoBrush)
         # draw a selection rectangle around the component when selected
         if self.isSelected():
             painter.setPen(QPen(Qt.GlobalColor.red, 0.3, Qt.PenStyle.DashLine))
             painter.drawRect(self.boundingRect())
+        # replay the recorded symbol of the component type
+        painter.drawPicture(0, 0, self.symbolPicture())
+
+    def setHighlightedTerminals(self, terminalIndices: Tuple[int, ...]) -> None:
+        """
+        A function that sets the terminals drawn highlighted, as part of the highlighted node
+        """
+        if self.highlightedTerminals != terminalIndices:
+            self.highlightedTerminals = terminalIndices
+            self.update()
+
+    def drawSymbol(self, painter: QPainter) -> None:
+        """
+        A function that draws the static symbol of the component in item coordinates.
+        It's only called once per component type to record the symbol, so it must not depend on the state of the instance.
+        """
+        ...
+
+    def symbolPicture(self) -> QPicture:
+        """
+        A function that returns the recorded symbol of the component type. The symbol is recorded into a
+        QPicture the first time it's needed. The picture holds vector drawing commands, so the same recording
+        is replayed at every rotation and zoom level.
+        """
+        picture = GeneralComponent._symbolPictures.get(self.name)
+        if picture is None:
+            picture = QPicture()
+            recorder = QPainter(picture)
+            self.drawSymbol(recorder)
+            recorder.end()
+            GeneralComponent._symbolPictures[self.name] = picture
+        return picture
 
     def getTerminalPositions(self) -> Tuple[QPointF, QPointF]:
         ...
@@ -0,0 +1,38 @@
+from PyQt6.QtWidgets import (
+    QGraphicsItem,
+    QGraphicsTextItem,
+    QGraphicsView,
+    QStyleOptionGraphicsItem,
+)
+from PyQt6.QtGui import QPainter
+
+import constants
+
+
+def levelOfDetail(
+    item: QGraphicsItem,
+    option: QStyleOptionGraphicsItem,
+    painter: QPainter,
+    widget=None,
+) -> float:
+    """
+    A function that returns the level of detail an item is being painted at. 1 means the view is not zoomed.
+
+    Items that ignore transformations are always painted unscaled, so the scale of the view they are painted in is used instead.
+    """
+    if item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIgnoresTransformations:
+        view = widget.parentWidget() if widget is not None else None
+        if isinstance(view, QGraphicsView):
+            return option.levelOfDetailFromTransform(view.transform())
+    return option.levelOfDetailFromTransform(painter.worldTransform())
+
+
+class LODTextItem(QGraphicsTextItem):
+    """
+    A text item that is not painted when the view is zoomed out below the level of detail for labels
+    """
+
+    def paint(self, painter: QPainter, option, widget) -> None:
+        if levelOfDetail(self, option, painter, widget) < constants.LOD_LABELS:
+            return
+        super().paint(painter, option, widget)
@@ -27,9 +27,7 @@ class Ground(GeneralComponent):
             self.h + (2 * self.padding),
         )
 
-    def paint(self, painter: QPainter, option, widget) -> None:
-        super().paint(painter, option, widget)
-
+    def drawSymbol(self, painter: QPainter) -> None:
         pen = QPen(Qt.GlobalColor.white, 2, Qt.PenStyle.SolidLine)
         painter.setPen(pen)
 
@@ -0,0 +1,218 @@
+import importlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type, TYPE_CHECKING
+
+from .types import ComponentCategory
+from .search_index import ComponentSearchIndex
+from .subcircuit import SubcircuitDefinition
+
+if TYPE_CHECKING:
+    from .general import GeneralComponent
+
+
+@dataclass(frozen=True)
+class ComponentParameter:
+    """
+    A declaration of a single property of a component type. eg: the resistance of a resistor.
+
+    Attributes:
+        key: the key of the property in the component data. eg: "R"
+        default: the default value and unit of the property. eg: ("100.00", "kOhm")
+        units: all the units the property can be expressed in. eg: ("Ohm", "kOhm")
+    """
+
+    key: str
+    default: Tuple[str, str]
+    units: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ComponentSpec:
+    """
+    A declaration of a component type. It holds everything the app needs to know about the component type
+    without importing the module that implements its graphics item.
+
+    Attributes:
+        name: the name of the component type. It matches the `name` attribute of the component class
+        category: the category the component type belongs to
+        module: the module that implements the component class. eg: "components.resistor"
+        className: the name of the component class in the module
+        terminals: the number of terminals the component has
+        spicePrefix: the SPICE element letter the component is stamped with, `None` if it's not a SPICE element
+        currentProbe: True if the element needs a zero volt source in series to measure its current
+        ground: True if the component ties the node it's connected to to ground
+        parameters: the properties of the component. The first one is the value stamped into the netlist
+        keywords: extra search terms the component type can be found with on the components pane
+        subcircuit: the definition of the block, for component types that are instances of a subcircuit
+    """
+
+    name: str
+    category: ComponentCategory
+    module: str
+    className: str
+    terminals: int
+    spicePrefix: Optional[str] = None
+    currentProbe: bool = False
+    ground: bool = False
+    parameters: Tuple[ComponentParameter, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    subcircuit: Optional[SubcircuitDefinition] = None
+
+    def loadClass(self) -> Type["GeneralComponent"]:
+        """
+        A function that imports the module of the component type the first time it's needed and returns the component class
+        """
+        componentClass = _loadedClasses.get(self.name)
+        if componentClass is None:
+            module = importlib.import_module(self.module)
+            componentClass = getattr(module, self.className)
+            if self.subcircuit is not None:
+                # every block gets its own class, named after the block
+                componentClass = componentClass.forDefinition(self.subcircuit)
+            _loadedClasses[self.name] = componentClass
+        return componentClass
+
+    def getParameter(self, key: str) -> Optional[ComponentParameter]:
+        """
+        A function that returns the declaration of the property with the given key, `None` if there isn't one
+        """
+        for parameter in self.parameters:
+            if parameter.key == key:
+                return parameter
+        return None
+
+
+# component type name to component spec pairs
+COMPONENT_REGISTRY: Dict[str, ComponentSpec] = {}
+
+# component classes that have already been imported. component type name to class pairs
+_loadedClasses: Dict[str, Type["GeneralComponent"]] = {}
+
+# search index over the registered component types. rebuilt the first time it's needed after a registration
+_searchIndex: Optional[ComponentSearchIndex] = None
+
+
+def registerComponent(spec: ComponentSpec) -> ComponentSpec:
+    """
+    A function that adds a component type to the registry
+
+    Params:
+        spec: the `ComponentSpec` of the component type
+
+    Returns:
+        The registered spec
+    """
+    global _searchIndex
+    COMPONENT_REGISTRY[spec.name] = spec
+    _searchIndex = None
+    return spec
+
+
+def registerSubcircuit(definition: SubcircuitDefinition) -> ComponentSpec:
+    """
+    A function that adds a subcircuit to the registry as a component type whose instances are blocks on the canvas
+
+    Params:
+        definition: the `SubcircuitDefinition` of the block
+
+    Returns:
+        The registered spec
+    """
+    return registerComponent(
+        ComponentSpec(
+            name=definition.name,
+            category=ComponentCategory.SUBCIRCUIT,
+            module="components.subcircuit_block",
+            className="SubcircuitBlock",
+            terminals=len(definition.ports),
+            spicePrefix="X",
+            subcircuit=definition,
+            keywords=("subcircuit", "block") + tuple(definition.description.split()),
+        )
+    )
+
+
+def getComponentSpec(name: str) -> Optional[ComponentSpec]:
+    """
+    A function that returns the spec of the component type with the given name, `None` if it's not registered
+    """
+    return COMPONENT_REGISTRY.get(name)
+
+
+def getComponentSpecs() -> List[ComponentSpec]:
+    """
+    A function that returns the specs of all registered component types sorted by name
+    """
+    return sorted(COMPONENT_REGISTRY.values(), key=lambda spec: spec.name)
+
+
+def getComponentSearchIndex() -> ComponentSearchIndex:
+    """
+    A function that returns the search index over all registered component types
+    """
+    global _searchIndex
+    if _searchIndex is None:
+        _searchIndex = ComponentSearchIndex(COMPONENT_REGISTRY.values())
+    return _searchIndex
+
+
+registerComponent(
+    ComponentSpec(
+        name="Resistor",
+        category=ComponentCategory.RESISTOR,
+        module="components.resistor",
+        className="Resistor",
+        terminals=2,
+        spicePrefix="R",
+        currentProbe=True,
+        parameters=(ComponentParameter("R", ("100.00", "kOhm"), ("Ohm", "kOhm")),),
+        keywords=("resistance", "ohm", "passive"),
+    )
+)
+
+registerComponent(
+    ComponentSpec(
+        name="VoltageSource",
+        category=ComponentCategory.SOURCE,
+        module="components.voltage_source",
+        className="VoltageSource",
+        terminals=2,
+        spicePrefix="V",
+        parameters=(ComponentParameter("V", ("10.00", "kV"), ("V", "kV")),),
+        keywords=("voltage", "dc", "battery", "supply"),
+    )
+)
+
+registerComponent(
+    ComponentSpec(
+        name="GND",
+        category=ComponentCategory.SOURCE,
+        module="components.ground",
+        className="Ground",
+        terminals=1,
+        ground=True,
+        keywords=("ground", "earth", "reference"),
+    )
+)
+
+registerSubcircuit(
+    SubcircuitDefinition(
+        name="VoltageDivider",
+        ports=("input", "output", "ref"),
+        componentsInfo={
+            "Top": {
+                "type": "Resistor",
+                "data": {"R": ["10.00", "kOhm"]},
+                "node1": "input",
+                "node2": "output",
+            },
+            "Bottom": {
+                "type": "Resistor",
+                "data": {"R": ["10.00", "kOhm"]},
+                "node1": "output",
+                "node2": "ref",
+            },
+        },
+        description="divider resistive",
+    )
+)
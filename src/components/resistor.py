@@ -21,7 +21,7 @@ class Resistor(GeneralComponent):
         self.padding = 7
 
         # update data attribute
-        self.setComponentData("R", ["100.00", "kOhm"])
+        self.setDefaultData()
 
         # call super initUI last after required attributes are set
         super().initUI()
@@ -37,8 +37,7 @@ class Resistor(GeneralComponent):
                 self.w / 2 - self.textItem.boundingRect().width() / 2, -20
             )
 
-    def paint(self, painter: QPainter, option, widget):
-        super().paint(painter, option, widget)
+    def drawSymbol(self, painter: QPainter) -> None:
         pen = QPen(Qt.GlobalColor.white, 2, Qt.PenStyle.SolidLine)
         painter.setPen(pen)
 
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, List, Set, TYPE_CHECKING
+
+from .types import ComponentCategory
+
+if TYPE_CHECKING:
+    from .registry import ComponentSpec
+
+
+class ComponentSearchIndex:
+    """
+    A prebuilt n-gram index over the name, category and keywords of component types.
+
+    Every 1, 2 and 3 character substring of every search term points to the component types that have it,
+    so a search looks up the grams of the query instead of scanning every component type.
+    A query of up to 3 characters is answered with a single lookup. A longer query intersects the
+    sets of its trigrams and then confirms the few remaining candidates with a substring check.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self, specs: Iterable["ComponentSpec"]) -> None:
+        # the specs sorted by name. the index refers to them by their position in this list
+        self.specs: List["ComponentSpec"] = sorted(specs, key=lambda spec: spec.name)
+        # the lower case search terms of each spec
+        self._terms: List[List[str]] = []
+        # gram to positions of the specs that have it
+        self._grams: Dict[str, Set[int]] = {}
+        # category to positions of the specs in the category
+        self._categories: Dict[ComponentCategory, Set[int]] = {}
+
+        for position, spec in enumerate(self.specs):
+            terms = [spec.name.lower(), spec.category.value.lower()]
+            terms.extend(keyword.lower() for keyword in spec.keywords)
+            self._terms.append(terms)
+            self._categories.setdefault(spec.category, set()).add(position)
+            for term in terms:
+                for gram in self._iterGrams(term):
+                    self._grams.setdefault(gram, set()).add(position)
+
+    def _iterGrams(self, term: str):
+        """
+        A generator that yields every substring of the term that is at most GRAM_SIZE characters long
+        """
+        for size in range(1, self.GRAM_SIZE + 1):
+            for start in range(len(term) - size + 1):
+                yield term[start : start + size]
+
+    def search(
+        self, searchText: str | None = None, category: ComponentCategory | None = None
+    ) -> List["ComponentSpec"]:
+        """
+        A function that returns the component types whose name, category or keywords contain the search text.
+
+        Params:
+            searchText: string - the text to search for. Every component type matches when it's empty
+            category: only return component types in this category when given
+
+        Returns:
+            The matching specs sorted by name
+        """
+        positions: Set[int] | None = None
+        if category is not None:
+            positions = set(self._categories.get(category, set()))
+
+        query = (searchText or "").strip().lower()
+        if query:
+            if len(query) <= self.GRAM_SIZE:
+                matches = self._grams.get(query, set())
+            else:
+                matches = None
+                for start in range(len(query) - self.GRAM_SIZE + 1):
+                    candidates = self._grams.get(query[start : start + self.GRAM_SIZE])
+                    if not candidates:
+                        matches = set()
+                        break
+                    matches = (
+                        set(candidates) if matches is None else matches & candidates
+                    )
+                # trigrams can match in different places. confirm the candidates
+                matches = {
+                    position
+                    for position in matches
+                    if any(query in term for term in self._terms[position])
+                }
+            positions = matches if positions is None else positions & matches
+
+        if positions is None:
+            return list(self.specs)
+        return [self.specs[position] for position in sorted(positions)]
@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Union
+
+from .types import componentDataType
+
+
+@dataclass(frozen=True)
+class SubcircuitDefinition:
+    """
+    A reusable block of a circuit. It's written into the netlist once as a SPICE `.subckt` and every instance
+    of it on the canvas becomes a single `X` line that refers to it.
+
+    Attributes:
+        name: the name of the block. It's also the name of the component type of its instances. eg: "VoltageDivider"
+        ports: the names of the internal nodes the terminals of an instance connect to, in terminal order
+        componentsInfo: the components inside the block, in the same format as the components information of a circuit.
+            Their nodes are port names or names of nodes internal to the block
+        GNDNodes: the internal nodes that are tied to ground
+        description: a short description of the block
+    """
+
+    name: str
+    ports: Tuple[str, ...]
+    componentsInfo: Dict[str, Dict[str, Union[componentDataType, str]]] = field(
+        hash=False, compare=False
+    )
+    GNDNodes: Tuple[str, ...] = ()
+    description: str = ""
+
+
+def collectSubcircuits(
+    componentsInfo: Dict[str, Dict[str, Union[componentDataType, str]]],
+) -> List[SubcircuitDefinition]:
+    """
+    A function that finds the definitions of all the blocks used by the components, including blocks used inside other blocks.
+
+    Params:
+        componentsInfo: the components information of a circuit or of a block
+
+    Returns:
+        Each definition once, with a block always after the blocks it uses
+    """
+    # imported here because the registry registers the built in blocks from this module
+    from .registry import getComponentSpec
+
+    ordered: Dict[str, SubcircuitDefinition] = {}
+    visiting: List[str] = []
+
+    def visit(info: Dict[str, Dict[str, Union[componentDataType, str]]]):
+        for componentInfo in info.values():
+            spec = getComponentSpec(componentInfo.get("type"))
+            if spec is None or spec.subcircuit is None:
+                continue
+            definition = spec.subcircuit
+            if definition.name in ordered:
+                continue
+            if definition.name in visiting:
+                raise ValueError(f"Subcircuit {definition.name} contains itself")
+            visiting.append(definition.name)
+            visit(definition.componentsInfo)
+            visiting.pop()
+            ordered[definition.name] = definition
+
+    visit(componentsInfo)
+    return list(ordered.values())
@@ -0,0 +1,104 @@
+from typing import Tuple, Type
+
+from PyQt6.QtGui import QPen, QPainter, QFont
+from PyQt6.QtCore import Qt, QRectF, QPointF
+
+from .general import GeneralComponent
+from .subcircuit import SubcircuitDefinition
+from .types import ComponentCategory
+
+
+class SubcircuitBlock(GeneralComponent):
+    """
+    An instance of a subcircuit on the canvas. It's drawn as a box with one terminal per port of the block:
+    the first half of the ports on the left side and the rest on the right side.
+    """
+
+    name = "Subcircuit"
+    category = ComponentCategory.SUBCIRCUIT
+    definition: SubcircuitDefinition = ...
+
+    @classmethod
+    def forDefinition(cls, definition: SubcircuitDefinition) -> Type["SubcircuitBlock"]:
+        """
+        A function that creates the component class of the given block
+        """
+        return type(
+            definition.name, (cls,), {"name": definition.name, "definition": definition}
+        )
+
+    def __init__(self, compCount: int, parent=None):
+        super(SubcircuitBlock, self).__init__(compCount, parent)
+
+        ports = len(self.definition.ports)
+        # the number of terminals on the left side. the rest are on the right side
+        self.leftTerminals = (ports + 1) // 2
+        rows = max(self.leftTerminals, ports - self.leftTerminals, 1)
+
+        # Geometric specifications of the component. Used in drawing too
+        self.terminalSpacing = 20
+        self.terminalLength = 10
+        self.w = 80
+        self.h = rows * self.terminalSpacing
+        self.padding = 7
+
+        # call super initUI last after required attributes are set
+        super().initUI()
+
+    def updateText(self):
+        ...
+
+    def terminalPoints(self) -> Tuple[QPointF, ...]:
+        """
+        A function that returns the positions of the terminals of the block in item coordinates
+        """
+        points = []
+        for index in range(len(self.definition.ports)):
+            if index < self.leftTerminals:
+                x, row = 0, index
+            else:
+                x, row = self.w, index - self.leftTerminals
+            points.append(QPointF(x, (row + 0.5) * self.terminalSpacing))
+        return tuple(points)
+
+    def drawSymbol(self, painter: QPainter) -> None:
+        pen = QPen(Qt.GlobalColor.white, 2, Qt.PenStyle.SolidLine)
+        painter.setPen(pen)
+
+        # draw the body of the block
+        body = QRectF(self.terminalLength, 0, self.w - 2 * self.terminalLength, self.h)
+        painter.drawRect(body)
+
+        # draw the terminals and the names of the ports next to them
+        painter.setFont(QFont("Arial", 6))
+        for index, point in enumerate(self.terminalPoints()):
+            if point.x() == 0:
+                inner = QPointF(self.terminalLength, point.y())
+                labelRect = QRectF(inner.x() + 2, point.y() - 5, body.width() / 2, 10)
+                alignment = Qt.AlignmentFlag.AlignLeft
+            else:
+                inner = QPointF(self.w - self.terminalLength, point.y())
+                labelRect = QRectF(
+                    inner.x() - body.width() / 2 - 2,
+                    point.y() - 5,
+                    body.width() / 2,
+                    10,
+                )
+                alignment = Qt.AlignmentFlag.AlignRight
+            painter.drawLine(point, inner)
+            painter.drawText(
+                labelRect,
+                alignment | Qt.AlignmentFlag.AlignVCenter,
+                self.definition.ports[index],
+            )
+
+    def boundingRect(self):
+        return QRectF(
+            -self.padding,
+            -self.padding,
+            self.w + (2 * self.padding),
+            self.h + (2 * self.padding),
+        )
+
+    def getTerminalPositions(self) -> Tuple[QPointF, ...]:
+        return tuple(self.mapToScene(point) for point in self.terminalPoints())
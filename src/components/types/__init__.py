@@ -1,11 +1,15 @@
 from enum import Enum
 from typing import Dict, List
 
+from .quantity import Quantity
+
 
 class ComponentCategory(Enum):
     RESISTOR = "RESISTOR"
     SOURCE = "SOURCE"
+    SUBCIRCUIT = "SUBCIRCUIT"
 
 
+# property to value pairs. the values of component data are `Quantity` instances, [value, unit] pairs that keep their SI float
 componentDataType = Dict[str, List[str]]
 simulationResultsType = Dict[str, List[str]]
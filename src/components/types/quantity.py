@@ -0,0 +1,167 @@
+import re
+from typing import Dict, Optional, Sequence
+
+# SI prefixes used by the units on the attributes pane and the multiplier each one stands for
+SI_PREFIXES: Dict[str, float] = {
+    "T": 1e12,
+    "G": 1e9,
+    "M": 1e6,
+    "k": 1e3,
+    "": 1.0,
+    "m": 1e-3,
+    "u": 1e-6,
+    "n": 1e-9,
+    "p": 1e-12,
+}
+
+# base units a component property can be expressed in
+BASE_UNITS = ("Ohm", "V", "A")
+
+# a number as it can be typed: plain ("100", "0.5"), in scientific notation ("1e3")
+# or in engineering notation with an SI prefix, the prefix standing in for the decimal point or following it ("4k7", "2.2u")
+QUANTITY_PATTERN = r"[+-]?(\d+(\.\d*)?|\.\d+)([TGMkmunp]\d*|[eE][+-]?\d+)?"
+_QUANTITY_RE = re.compile(
+    r"\s*(?P<number>[+-]?(?:\d+(?:\.\d*)?|\.\d+))"
+    r"(?:(?P<prefix>[TGMkmunp])(?P<digits>\d*)|(?P<exponent>[eE][+-]?\d+))?\s*"
+)
+
+
+def parseNumber(text: str) -> float:
+    """
+    A function that parses a number typed with an optional SI prefix or exponent into a float.
+    An empty text is zero.
+
+    Params:
+        text: string - the number. eg: "100", "1e3", "4k7" or "2.2u"
+
+    Returns:
+        The number as a float. eg: 4700.0 for "4k7"
+
+    Raises:
+        ValueError: if the text is not a number
+    """
+    if not text.strip():
+        return 0.0
+    match = _QUANTITY_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Not a number: {text!r}")
+    number, prefix, digits, exponent = match.group(
+        "number", "prefix", "digits", "exponent"
+    )
+    if exponent:
+        return float(number + exponent)
+    if digits:
+        # the prefix is the decimal point. eg: "4k7" is 4.7k
+        if "." in number:
+            raise ValueError(f"Not a number: {text!r}")
+        number = f"{number}.{digits}"
+    return float(number) * SI_PREFIXES[prefix or ""]
+
+
+def unitMultiplier(unit: str) -> float:
+    """
+    A function that returns what a unit stands for in its base unit. eg: 1000.0 for "kOhm"
+    """
+    for baseUnit in BASE_UNITS:
+        if unit.endswith(baseUnit):
+            return SI_PREFIXES[unit[: -len(baseUnit)]]
+    return SI_PREFIXES[unit]
+
+
+def toSIValue(value: str, unit: str) -> float:
+    """
+    A function that converts a value and unit pair from the component data into a plain SI float.
+
+    Params:
+        value: string - the value of the property. eg: "100.00" or "4k7"
+        unit: string - the unit of the property. eg: "kOhm"
+
+    Returns:
+        The value as a float in the base unit. eg: 100000.0
+    """
+    return parseNumber(value) * unitMultiplier(unit)
+
+
+def formatNumberText(text: str) -> str:
+    """
+    A function that formats a typed number the way it's stored in the component data.
+    Plain numbers are written with two decimals, numbers typed with a prefix or an exponent are kept as typed.
+
+    Raises:
+        ValueError: if the text is not a number
+    """
+    text = text.strip()
+    value = parseNumber(text)
+    if not text or re.fullmatch(r"[+-]?(\d+(\.\d*)?|\.\d+)", text):
+        return f"{value:.2f}"
+    return text
+
+
+class Quantity(list):
+    """
+    The value of a component property: the [value text, unit] pair it's shown and saved as,
+    and the SI float it stands for. eg: Quantity("4k7", "Ohm").value == 4700.0
+
+    The text is parsed once, when the quantity is created from an edit, and the float is kept with it,
+    so netlisting reads `value` without parsing any strings.
+    A quantity is a list so everything that reads component data as [value, unit] pairs keeps working,
+    but it can not be changed: a new quantity is created for every edit.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, text: str, unit: str, value: Optional[float] = None) -> None:
+        """
+        Params:
+            text: string - the value as it's shown. eg: "100.00" or "4k7"
+            unit: string - the unit. eg: "kOhm"
+            value: the SI float the text and unit stand for, if it's already known. Parsed from them otherwise
+
+        Raises:
+            ValueError: if the text is not a number or the unit is not known
+        """
+        super().__init__((text, unit))
+        self.value = toSIValue(text, unit) if value is None else value
+
+    @classmethod
+    def fromPair(cls, pair: Sequence[str]) -> "Quantity":
+        """
+        A function that returns a [value, unit] pair as a quantity. A quantity is returned as it is
+        """
+        if isinstance(pair, Quantity):
+            return pair
+        text, unit = pair
+        return cls(text, unit)
+
+    @property
+    def text(self) -> str:
+        return self[0]
+
+    @property
+    def unit(self) -> str:
+        return self[1]
+
+    def __repr__(self) -> str:
+        return f"Quantity({self[0]!r}, {self[1]!r}, {self.value!r})"
+
+    def __reduce__(self):
+        return Quantity, (self[0], self[1], self.value)
+
+    def copy(self) -> "Quantity":
+        return self
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("A Quantity can not be changed. Create a new one instead")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+
+def siValue(pair: Sequence[str]) -> float:
+    """
+    A function that returns the SI float of a property of the component data. Quantities are not parsed again,
+    plain [value, unit] pairs are. eg: the pairs of the built-in block definitions
+    """
+    if isinstance(pair, Quantity):
+        return pair.value
+    return toSIValue(*pair)
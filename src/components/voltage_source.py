@@ -21,7 +21,7 @@ class VoltageSource(GeneralComponent):
         self.padding = 7
 
         # update data attribute
-        self.setComponentData("V", ["10.00", "kV"])
+        self.setDefaultData()
 
         super().initUI()
 
@@ -44,8 +44,7 @@ class VoltageSource(GeneralComponent):
             self.h + (2 * self.padding),
         )
 
-    def paint(self, painter: QPainter, option, widget) -> None:
-        super().paint(painter, option, widget)
+    def drawSymbol(self, painter: QPainter) -> None:
         pen = QPen(Qt.GlobalColor.white, 2, Qt.PenStyle.SolidLine)
         painter.setPen(pen)
 
@@ -1,19 +1,24 @@
 from typing import List, Tuple, Union, Type
 
 from PyQt6 import QtCore
-from PyQt6.QtWidgets import (
-    QGraphicsItem,
-    QGraphicsSceneMouseEvent,
-    QGraphicsTextItem,
-    QGraphicsObject,
-)
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsSceneMouseEvent, QGraphicsObject
 from PyQt6.QtCore import QPointF, QRectF, Qt, pyqtSignal
-from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QPainterPath, QPainterPathStroker
+from PyQt6.QtGui import (
+    QPainter,
+    QPen,
+    QColor,
+    QFont,
+    QPainterPath,
+    QPainterPathStroker,
+    QPolygonF,
+)
 
 import constants
-from components.general import ComponentAndTerminalIndex
+from utils.subscriptions import SignalSubscriptions
+from components.general import ComponentAndTerminalIndex, LODTextItem, levelOfDetail
 
 from SimulationBackend.middleware import CircuitNode
+from model import WireRecord
 
 
 class Wire(QGraphicsItem):
@@ -34,6 +39,8 @@ class Wire(QGraphicsItem):
         self.setZValue(1)
         # create a signals class to keep track of signals
         self.signals = self.Signals()
+        # keep track of the signals the wire is connected to so that they are never connected twice
+        self.subscriptions = SignalSubscriptions()
 
         # create uniqueID of wire
         self.uniqueID = f"{self.name}-{wireCount}"
@@ -44,7 +51,12 @@ class Wire(QGraphicsItem):
             ]
             self._start = start
             # connecting componentMoved signal from start component
-            start.component.signals.componentMoved.connect(self._onStartComponentMoved)
+            self.subscriptions.subscribe(
+                "startComponentMoved",
+                start.component.signals,
+                "componentMoved",
+                self._onStartComponentMoved,
+            )
         elif type(start) == tuple:
             self._start: Wire = start[0]
             self._startPoint: QPointF = start[1]
@@ -56,9 +68,13 @@ class Wire(QGraphicsItem):
         self._refPoint = self._startPoint
         self._points = [self._refPoint]
         self._endPoint: QPointF | None = None
+        # the path of the wire is built from the points once and reused until the points change
+        self._path: QPainterPath | None = None
 
         # keeping track of the circuit node that a particular wire forms
         self.circuitNode: CircuitNode | None = None
+        # True while the node of the wire is highlighted on the canvas
+        self.highlighted = False
 
         self.initUI()
 
@@ -67,7 +83,7 @@ class Wire(QGraphicsItem):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
 
         # initialise text item to write node labels and node voltages
-        self.textItem = QGraphicsTextItem(self)
+        self.textItem = LODTextItem(self)
         self.textItem.setDefaultTextColor(Qt.GlobalColor.yellow)
         self.textItem.setFont(QFont("Arial", 10))
         self.textItem.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIgnoresTransformations)
@@ -96,6 +112,10 @@ class Wire(QGraphicsItem):
                 # combine value and unit into one text
                 text = f"{text}\n{' '.join(nodeVoltage)}"
 
+            # nothing to lay out again if the text has not changed
+            if text == self.textItem.toPlainText():
+                return
+
             # set text and initial position
             self.textItem.setPlainText(text)
             self.textItem.setPos(midpoint)
@@ -112,9 +132,19 @@ class Wire(QGraphicsItem):
             return self.circuitNode.data.get("V")
         return None
 
-    def setCircuitNode(self, circuitNode: CircuitNode) -> None:
+    def setCircuitNode(self, circuitNode: CircuitNode | None) -> None:
         self.circuitNode = circuitNode
-        self.circuitNode.signals.nodeDataChanged.connect(self.handleNodeDataChange)
+        if circuitNode is None:
+            # the wire is no longer part of a node. stop listening to the old node
+            self.subscriptions.unsubscribe("nodeDataChanged")
+            return
+        # replaces the connection to any previous node and does nothing if already connected to this one
+        self.subscriptions.subscribe(
+            "nodeDataChanged",
+            circuitNode.signals,
+            "nodeDataChanged",
+            self.handleNodeDataChange,
+        )
         # write node ID on wire
         self.updateWireText()
 
@@ -125,11 +155,48 @@ class Wire(QGraphicsItem):
         if type(end) == ComponentAndTerminalIndex:
             self._end = end
             self._endPoint = end.component.getTerminalPositions()[end.terminalIndex]
-            end.component.signals.componentMoved.connect(self._onEndComponentMoved)
+            self.subscriptions.subscribe(
+                "endComponentMoved",
+                end.component.signals,
+                "componentMoved",
+                self._onEndComponentMoved,
+            )
         elif type(end) == tuple:
             self._end = end[0]
             self._endPoint = end[1]
 
+    def record(self) -> WireRecord:
+        """
+        A function that returns the state of the wire as it's saved. The record does not change with the wire
+        """
+        return WireRecord(
+            self.uniqueID,
+            tuple((point.x(), point.y()) for point in self._points),
+            self._endRecord(self._start, self._startPoint),
+            self._endRecord(self._end, self._endPoint),
+            self.circuitNode.uniqueID if self.circuitNode is not None else None,
+        )
+
+    @staticmethod
+    def _endRecord(
+        end: ComponentAndTerminalIndex | Union["Wire", None], point: QPointF | None
+    ):
+        if isinstance(end, ComponentAndTerminalIndex):
+            return (end.component.uniqueID, end.terminalIndex)
+        if isinstance(end, Wire):
+            return (end.uniqueID, (point.x(), point.y()))
+        return None
+
+    def setPoints(self, points: List[QPointF]) -> None:
+        """
+        A function that sets the points the wire is drawn through. Used when a saved wire is loaded
+        """
+        self.prepareGeometryChange()
+        self._points = list(points)
+        self._refPoint = self._points[-1]
+        self._path = None
+        self.update()
+
     def _onStartComponentMoved(self):
         newStartPos = self._start.component.getTerminalPositions()[
             self._start.terminalIndex
@@ -171,6 +238,8 @@ class Wire(QGraphicsItem):
                     self.circuitNode.componentTerminals.append(componentTerminal)
 
     def addNewPoint(self, point: QPointF):
+        # the bounding rect changes with the points. the scene has to know to keep its index right
+        self.prepareGeometryChange()
         # if point is already in _points, remove all other points after it to clear the wire after that point
         if point in self._points:
             id = self._points.index(point)
@@ -229,16 +298,32 @@ class Wire(QGraphicsItem):
             self._points.append(point)
         # update the reference point
         self._refPoint = self._points[-1]
+        # the points changed, the path has to be rebuilt
+        self._path = None
         self.update()
 
     def paint(self, painter: QPainter, option, widget) -> None:
         if self.isSelected():
             pen = QPen(QColor(50, 205, 50), 3)
+        elif self.highlighted:
+            pen = QPen(QColor(constants.NET_HIGHLIGHT_COLOR), 3)
         else:
             pen = QPen(Qt.GlobalColor.darkGray, 2)
 
+        lod = levelOfDetail(self, option, painter)
+        if lod < constants.LOD_SYMBOLS:
+            # zoomed too far out to make out the wire. draw it as a single hairline polyline
+            pen.setCosmetic(True)
+            pen.setWidth(0)
+            painter.setPen(pen)
+            painter.drawPolyline(QPolygonF(self._points))
+            return
+
         painter.setPen(pen)
         painter.drawPath(self.path())
+        if lod < constants.LOD_LABELS:
+            # the end dots would not be visible at this level of detail
+            return
         pen.setWidth(6)
         painter.setPen(pen)
 
@@ -250,6 +335,14 @@ class Wire(QGraphicsItem):
         if self._endPoint == self._points[-1]:
             painter.drawPoint(self._endPoint)
 
+    def setHighlighted(self, highlighted: bool) -> None:
+        """
+        A function that sets whether the wire is drawn highlighted, as part of the highlighted node
+        """
+        if self.highlighted != highlighted:
+            self.highlighted = highlighted
+            self.update()
+
     def path(self) -> QPainterPath:
         """
         This method creates a QPainterPath that describes the shape of the wire.
@@ -257,11 +350,13 @@ class Wire(QGraphicsItem):
         Returns:
             QPainterPath: A QPainterPath representing the shape of the wire.
         """
-        path = QPainterPath()
-        for i in range(len(self._points) - 1):
-            path.moveTo(self._points[i])
-            path.lineTo(self._points[i + 1])
-        return path
+        if self._path is None:
+            path = QPainterPath()
+            for i in range(len(self._points) - 1):
+                path.moveTo(self._points[i])
+                path.lineTo(self._points[i + 1])
+            self._path = path
+        return self._path
 
     def boundingRect(self) -> QRectF:
         if self._points:
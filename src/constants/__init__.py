@@ -1 +1,3 @@
 from .canvas_constants import *
+from .waveform_constants import *
+from .autosave_constants import *
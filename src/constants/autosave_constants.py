@@ -0,0 +1,4 @@
+# time between autosaves of the changes made to the design, in milliseconds
+AUTOSAVE_INTERVAL = 5000
+# number of entries the autosave journal takes before it's compacted into one
+AUTOSAVE_COMPACT_ENTRIES = 100
@@ -1 +1,34 @@
 GRID_SIZE = 10
+# smallest on-screen spacing, in pixels, at which the background grid is still drawn
+MIN_GRID_SPACING = 4
+
+# zoom limits of the canvas and the factor applied for each zoom step
+MIN_ZOOM = 0.02
+MAX_ZOOM = 10
+ZOOM_FACTOR = 1.15
+
+# level of detail (scale of the view) below which labels and wire end dots are not drawn
+LOD_LABELS = 0.5
+# level of detail below which component symbols collapse into rectangles and wires into plain polylines
+LOD_SYMBOLS = 0.25
+
+# color the wires and terminals of the highlighted node are drawn in
+NET_HIGHLIGHT_COLOR = "#ffc107"
+
+# space left between the components laid out from an imported netlist,
+# and the distance from a terminal on the ground node to the ground placed below it
+NETLIST_CELL_MARGIN = 60
+NETLIST_GROUND_DROP = 30
+
+# number of edits the canvas keeps on its undo stack
+UNDO_LIMIT = 200
+
+# number of components and wires on the canvas from which the scene is tuned for large designs,
+# and the number below which it goes back to the default tuning. the gap keeps it from switching back and forth
+LARGE_DESIGN_ITEMS = 2000
+SMALL_DESIGN_ITEMS = 1000
+# space kept around the design when the scene rect is fixed to it
+SCENE_MARGIN = 500
+# bounds of the depth of the BSP tree the scene indexes items with in large designs
+MIN_BSP_DEPTH = 6
+MAX_BSP_DEPTH = 18
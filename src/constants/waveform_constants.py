@@ -0,0 +1,7 @@
+# number of time steps ngspice is asked for over the length of a transient analysis
+TRANSIENT_STEPS = 1000
+
+# factor the time window of the waveform viewer is zoomed by for each wheel step
+WAVEFORM_ZOOM_FACTOR = 1.25
+# colours of the traces of the waveform viewer, used in turn
+TRACE_COLORS = ("#4fc3f7", "#ffb74d", "#81c784", "#e57373", "#ba68c8", "#fff176")
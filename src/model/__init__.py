@@ -0,0 +1,11 @@
+from .circuit_model import CircuitModel, ComponentModel, NetModel
+from .design_journal import (
+    ComponentRecord,
+    DesignJournal,
+    DesignState,
+    NodeRecord,
+    WireRecord,
+    designRecordType,
+    readJournal,
+)
+from .connectivity_index import ConnectivityIndex
@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from components.types import Quantity, componentDataType, simulationResultsType
+
+
+@dataclass(slots=True)
+class ComponentModel:
+    """
+    The state of a component that does not depend on how it's drawn.
+
+    Attributes:
+        uniqueID: the uniqueID of the component. eg: "Resistor-0"
+        type: the name of the component type in the registry. eg: "Resistor"
+        data: the properties of the component. eg: {"R": Quantity("100.00", "kOhm")}
+        results: the simulation results of the component. eg: {"I": ["0.0010", "A"]}
+    """
+
+    uniqueID: str
+    type: str
+    data: componentDataType = field(default_factory=dict)
+    results: simulationResultsType = field(default_factory=dict)
+
+    def __reduce__(self):
+        # pickled as the arguments of the constructor. much smaller and faster than the default state of a slots class
+        return ComponentModel, (self.uniqueID, self.type, self.data, self.results)
+
+
+@dataclass(slots=True)
+class NetModel:
+    """
+    The state of a circuit node that does not depend on the wires it's drawn with.
+
+    Attributes:
+        uniqueID: the uniqueID of the node. eg: "CircuitNode-0"
+        terminals: the (component uniqueID, terminalIndex) pairs connected to the node
+        data: the simulation results of the node. eg: {"V": ["10.0000", "V"]}
+    """
+
+    uniqueID: str
+    terminals: List[Tuple[str, int]] = field(default_factory=list)
+    data: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __reduce__(self):
+        return NetModel, (self.uniqueID, self.terminals, self.data)
+
+
+@dataclass(slots=True)
+class CircuitModel:
+    """
+    The components and nodes of a circuit, without any Qt objects.
+
+    The items on the canvas are views over the component and node models, so a circuit model collected from the canvas
+    shares them instead of copying them. Everything in the model is plain Python, so it can be pickled and
+    handed to a worker process or built without a canvas at all.
+
+    Attributes:
+        components: component uniqueID to component model pairs
+        nets: node uniqueID to node model pairs
+    """
+
+    components: Dict[str, ComponentModel] = field(default_factory=dict)
+    nets: Dict[str, NetModel] = field(default_factory=dict)
+
+    @classmethod
+    def fromModels(
+        cls, components: Iterable[ComponentModel], nets: Iterable[NetModel]
+    ) -> "CircuitModel":
+        """
+        A function that creates a circuit model from the given component and node models
+        """
+        return cls(
+            components={component.uniqueID: component for component in components},
+            nets={net.uniqueID: net for net in nets},
+        )
+
+    def addComponent(
+        self, uniqueID: str, type: str, data: Optional[componentDataType] = None
+    ) -> ComponentModel:
+        """
+        A function that adds a new component to the circuit. [value, unit] pairs in the data are parsed into quantities
+
+        Returns:
+            The model of the new component
+        """
+        data = (
+            {key: Quantity.fromPair(value) for key, value in data.items()}
+            if data
+            else {}
+        )
+        component = ComponentModel(uniqueID, type, data)
+        self.components[uniqueID] = component
+        return component
+
+    def connect(self, uniqueID: str, terminalIndex: int, netID: str) -> NetModel:
+        """
+        A function that connects a terminal of a component to a node. The node is created if it does not exist yet.
+
+        Returns:
+            The model of the node
+        """
+        net = self.nets.get(netID)
+        if net is None:
+            net = self.nets[netID] = NetModel(netID)
+        terminal = (uniqueID, terminalIndex)
+        if terminal not in net.terminals:
+            net.terminals.append(terminal)
+        return net
+
+    def removeComponent(self, uniqueID: str) -> None:
+        """
+        A function that removes a component and its terminals from the circuit. Nodes left empty are removed too.
+        """
+        self.components.pop(uniqueID, None)
+        for netID in list(self.nets):
+            net = self.nets[netID]
+            net.terminals = [
+                terminal for terminal in net.terminals if terminal[0] != uniqueID
+            ]
+            if not net.terminals:
+                del self.nets[netID]
+
+    def terminalNets(self) -> Dict[Tuple[str, int], str]:
+        """
+        A function that returns the node every connected terminal is on
+
+        Returns:
+            (component uniqueID, terminalIndex) to node uniqueID pairs
+        """
+        terminalNets: Dict[Tuple[str, int], str] = {}
+        for net in self.nets.values():
+            for terminal in net.terminals:
+                terminalNets[terminal] = net.uniqueID
+        return terminalNets
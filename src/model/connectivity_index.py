@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .circuit_model import NetModel
+
+# (component uniqueID, terminalIndex)
+terminalType = Tuple[str, int]
+
+
+class ConnectivityIndex:
+    """
+    The adjacency of a circuit, kept in both directions: the terminals of every node, the node of every terminal
+    and the nodes of every component. Connectivity queries are dictionary lookups instead of scans over every node.
+
+    The index is updated one node at a time, with the terminals the node has after an edit,
+    so keeping it up to date costs as much as the nodes an edit touches, whatever the size of the design.
+    """
+
+    def __init__(self) -> None:
+        # node uniqueID to the terminals connected to it
+        self.netTerminals: Dict[str, Tuple[terminalType, ...]] = {}
+        # terminal to the uniqueID of the node it's connected to
+        self.terminalNets: Dict[terminalType, str] = {}
+        # component uniqueID to terminalIndex to node uniqueID pairs
+        self.componentNets: Dict[str, Dict[int, str]] = {}
+
+    @classmethod
+    def fromNets(cls, nets: Iterable[NetModel]) -> "ConnectivityIndex":
+        """
+        A function that builds the index of the given nodes
+        """
+        index = cls()
+        for net in nets:
+            index.updateNet(net.uniqueID, net.terminals)
+        return index
+
+    def updateNet(
+        self, netID: str, terminals: Optional[Iterable[terminalType]]
+    ) -> None:
+        """
+        A function that sets the terminals of a node.
+
+        Params:
+            netID: the uniqueID of the node
+            terminals: the terminals connected to the node now. `None` if the node was removed
+        """
+        for terminal in self.netTerminals.pop(netID, ()):
+            # the terminal may have been moved to another node already. eg: when two nodes were merged
+            if self.terminalNets.get(terminal) != netID:
+                continue
+            del self.terminalNets[terminal]
+            componentID, terminalIndex = terminal
+            nets = self.componentNets[componentID]
+            del nets[terminalIndex]
+            if not nets:
+                del self.componentNets[componentID]
+
+        if terminals is None:
+            return
+        terminals = tuple(
+            dict.fromkeys(
+                (componentID, terminalIndex) for componentID, terminalIndex in terminals
+            )
+        )
+        self.netTerminals[netID] = terminals
+        for terminal in terminals:
+            componentID, terminalIndex = terminal
+            previousNetID = self.terminalNets.get(terminal)
+            if previousNetID is not None and previousNetID != netID:
+                # moved from a node that's not updated yet. it's no longer one of the terminals of that node
+                self.netTerminals[previousNetID] = tuple(
+                    t for t in self.netTerminals[previousNetID] if t != terminal
+                )
+            self.terminalNets[terminal] = netID
+            self.componentNets.setdefault(componentID, {})[terminalIndex] = netID
+
+    def netOf(self, componentID: str, terminalIndex: int) -> Optional[str]:
+        """
+        A function that returns the uniqueID of the node a terminal is connected to, or `None` if it's not connected
+        """
+        return self.terminalNets.get((componentID, terminalIndex))
+
+    def terminalsOf(self, netID: str) -> Tuple[terminalType, ...]:
+        """
+        A function that returns the terminals connected to a node
+        """
+        return self.netTerminals.get(netID, ())
+
+    def netsOf(self, componentID: str) -> Dict[int, str]:
+        """
+        A function that returns the nodes the terminals of a component are connected to
+
+        Returns:
+            terminalIndex to node uniqueID pairs of the connected terminals
+        """
+        return dict(self.componentNets.get(componentID, {}))
+
+    def connectedTerminals(
+        self, componentID: str, terminalIndex: int
+    ) -> List[terminalType]:
+        """
+        A function that returns the other terminals on the node of a terminal. Empty if the terminal is not connected
+        """
+        netID = self.netOf(componentID, terminalIndex)
+        if netID is None:
+            return []
+        return [
+            terminal
+            for terminal in self.netTerminals[netID]
+            if terminal != (componentID, terminalIndex)
+        ]
+
+    def neighbours(self, componentID: str) -> Set[str]:
+        """
+        A function that returns the uniqueIDs of the components that share a node with a component
+        """
+        return {
+            otherID
+            for netID in self.componentNets.get(componentID, {}).values()
+            for otherID, _ in self.netTerminals[netID]
+            if otherID != componentID
+        }
@@ -0,0 +1,296 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# first line of every journal. a journal with another version is not read
+JOURNAL_HEADER = {"journal": "simit-design", "version": 1}
+
+# the other end of a wire: (component uniqueID, terminalIndex) or (wire uniqueID, (x, y) of the point on the wire)
+wireEndType = Tuple[str, Union[int, Tuple[float, float]]]
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentRecord:
+    """
+    The saved state of a component.
+
+    Attributes:
+        uniqueID: the uniqueID of the component. eg: "Resistor-0"
+        type: the name of the component type in the registry. eg: "Resistor"
+        data: (key, value text, unit) of every property. eg: (("R", "4k7", "Ohm"),)
+        pos: the position of the component on the canvas
+        rotation: the rotation of the component, in degrees
+    """
+
+    uniqueID: str
+    type: str
+    data: Tuple[Tuple[str, str, str], ...]
+    pos: Tuple[float, float]
+    rotation: float
+
+    kind = "component"
+
+    def toJSON(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "id": self.uniqueID,
+            "type": self.type,
+            "data": [list(item) for item in self.data],
+            "pos": list(self.pos),
+            "rotation": self.rotation,
+        }
+
+    @classmethod
+    def fromJSON(cls, record: Dict[str, Any]) -> "ComponentRecord":
+        return cls(
+            record["id"],
+            record["type"],
+            tuple(tuple(item) for item in record["data"]),
+            tuple(record["pos"]),
+            record["rotation"],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WireRecord:
+    """
+    The saved state of a wire.
+
+    Attributes:
+        uniqueID: the uniqueID of the wire. eg: "Wire-0"
+        points: the points the wire is drawn through
+        start: what the wire starts on. `None` if it does not start on anything
+        end: what the wire ends on. `None` if it's not finished
+        node: the uniqueID of the node of the wire. `None` if it's not part of one
+    """
+
+    uniqueID: str
+    points: Tuple[Tuple[float, float], ...]
+    start: Optional[wireEndType]
+    end: Optional[wireEndType]
+    node: Optional[str]
+
+    kind = "wire"
+
+    def toJSON(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "id": self.uniqueID,
+            "points": [list(point) for point in self.points],
+            "start": _wireEndToJSON(self.start),
+            "end": _wireEndToJSON(self.end),
+            "node": self.node,
+        }
+
+    @classmethod
+    def fromJSON(cls, record: Dict[str, Any]) -> "WireRecord":
+        return cls(
+            record["id"],
+            tuple(tuple(point) for point in record["points"]),
+            _wireEndFromJSON(record["start"]),
+            _wireEndFromJSON(record["end"]),
+            record["node"],
+        )
+
+
+def _wireEndToJSON(end: Optional[wireEndType]) -> Optional[list]:
+    if end is None:
+        return None
+    uniqueID, terminal = end
+    return [uniqueID, list(terminal) if isinstance(terminal, tuple) else terminal]
+
+
+def _wireEndFromJSON(end: Optional[list]) -> Optional[wireEndType]:
+    if end is None:
+        return None
+    uniqueID, terminal = end
+    return (uniqueID, tuple(terminal) if isinstance(terminal, list) else terminal)
+
+
+@dataclass(frozen=True, slots=True)
+class NodeRecord:
+    """
+    The saved state of a circuit node.
+
+    Attributes:
+        uniqueID: the uniqueID of the node. eg: "CircuitNode-0"
+        terminals: the (component uniqueID, terminalIndex) pairs connected to the node
+        wires: the uniqueIDs of the wires the node is drawn with
+    """
+
+    uniqueID: str
+    terminals: Tuple[Tuple[str, int], ...]
+    wires: Tuple[str, ...]
+
+    kind = "node"
+
+    def toJSON(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "id": self.uniqueID,
+            "terminals": [list(terminal) for terminal in self.terminals],
+            "wires": list(self.wires),
+        }
+
+    @classmethod
+    def fromJSON(cls, record: Dict[str, Any]) -> "NodeRecord":
+        return cls(
+            record["id"],
+            tuple(tuple(terminal) for terminal in record["terminals"]),
+            tuple(record["wires"]),
+        )
+
+
+designRecordType = Union[ComponentRecord, WireRecord, NodeRecord]
+RECORD_TYPES = {
+    recordType.kind: recordType
+    for recordType in (ComponentRecord, WireRecord, NodeRecord)
+}
+
+
+@dataclass(slots=True)
+class DesignState:
+    """
+    The saved state of a whole design: the records of its components, wires and nodes by uniqueID
+    """
+
+    components: Dict[str, ComponentRecord] = field(default_factory=dict)
+    wires: Dict[str, WireRecord] = field(default_factory=dict)
+    nodes: Dict[str, NodeRecord] = field(default_factory=dict)
+
+    def apply(
+        self, records: Iterable[designRecordType], deleted: Iterable[str]
+    ) -> None:
+        """
+        A function that applies an entry of the journal: the records replace the ones with the same uniqueID
+        and the deleted uniqueIDs are removed
+        """
+        for uniqueID in deleted:
+            self.components.pop(uniqueID, None)
+            self.wires.pop(uniqueID, None)
+            self.nodes.pop(uniqueID, None)
+        for record in records:
+            if isinstance(record, ComponentRecord):
+                self.components[record.uniqueID] = record
+            elif isinstance(record, WireRecord):
+                self.wires[record.uniqueID] = record
+            else:
+                self.nodes[record.uniqueID] = record
+
+    def records(self) -> Iterator[designRecordType]:
+        yield from self.components.values()
+        yield from self.wires.values()
+        yield from self.nodes.values()
+
+    def isEmpty(self) -> bool:
+        return not (self.components or self.wires or self.nodes)
+
+
+def _entryLine(records: Iterable[designRecordType], deleted: Iterable[str]) -> str:
+    return (
+        json.dumps(
+            {
+                "records": [record.toJSON() for record in records],
+                "deleted": list(deleted),
+            }
+        )
+        + "\n"
+    )
+
+
+def readJournal(path: str) -> DesignState:
+    """
+    A function that replays a journal into the state of the design it was written for.
+    The journal is read a line at a time. An entry cut short by a crash, always the last one, is skipped.
+
+    Params:
+        path: the path of the journal
+
+    Returns:
+        The state of the design after the last complete entry
+
+    Raises:
+        ValueError: if the file is not a journal of a version that can be read
+    """
+    state = DesignState()
+    with open(path, encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            header = None
+        if header != JOURNAL_HEADER:
+            raise ValueError(f"Not a design journal: {path}")
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            state.apply(
+                (
+                    RECORD_TYPES[record["kind"]].fromJSON(record)
+                    for record in entry["records"]
+                ),
+                entry["deleted"],
+            )
+    return state
+
+
+class DesignJournal:
+    """
+    An append-only JSON lines file the changes of a design are saved to.
+
+    The first line is the header and every other line is an entry: the records of the components, wires and nodes
+    changed since the entry before it and the uniqueIDs of the ones deleted. Replaying the entries in order gives
+    the state of the design. Compacting the journal replaces the entries with a single one holding that state.
+
+    The journal is not thread-safe. The autosave only uses it from its one background thread.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # number of entries appended since the journal was created or last compacted
+        self.entryCount = 0
+
+    def append(
+        self, records: Iterable[designRecordType], deleted: Iterable[str]
+    ) -> None:
+        """
+        A function that appends an entry to the journal and flushes it to disk. The journal is created if needed
+        """
+        line = _entryLine(records, deleted)
+        exists = os.path.exists(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if not exists:
+                f.write(json.dumps(JOURNAL_HEADER) + "\n")
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entryCount += 1
+
+    def compact(self) -> None:
+        """
+        A function that replaces the entries of the journal with one entry of the state they add up to.
+        The compacted journal is written next to the journal and moved over it, so a crash leaves one of the two intact
+        """
+        if not os.path.exists(self.path):
+            return
+        state = readJournal(self.path)
+        temporaryPath = f"{self.path}.tmp"
+        with open(temporaryPath, "w", encoding="utf-8") as f:
+            f.write(json.dumps(JOURNAL_HEADER) + "\n")
+            if not state.isEmpty():
+                f.write(_entryLine(state.records(), ()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaryPath, self.path)
+        self.entryCount = 0
+
+    def remove(self) -> None:
+        """
+        A function that deletes the journal
+        """
+        for path in (self.path, f"{self.path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+        self.entryCount = 0
@@ -1 +1 @@
-from .QHLine import QHLine
\ No newline at end of file
+from .QHLine import QHLine
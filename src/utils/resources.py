@@ -0,0 +1,41 @@
+import os
+from functools import lru_cache
+
+from PyQt6.QtGui import QIcon
+
+
+# absolute paths to the resource directories so that loading does not depend on the working directory
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STYLES_DIR = os.path.join(SRC_DIR, "styles")
+ASSETS_DIR = os.path.join(SRC_DIR, "assets")
+
+
+@lru_cache(maxsize=None)
+def loadStyleSheet(name: str) -> str:
+    """
+    A function that reads a QSS stylesheet from the styles directory. The file is only read from disk once,
+    every other call returns the cached text.
+
+    Params:
+        name: string - the name of the stylesheet without the extension. eg: "attributes_pane"
+
+    Returns:
+        The content of the `<name>.stylesheet.qss` file
+    """
+    with open(os.path.join(STYLES_DIR, f"{name}.stylesheet.qss"), "r") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def loadIcon(name: str) -> QIcon:
+    """
+    A function that loads an icon from the assets directory. The icon is only created once,
+    every other call returns the cached icon.
+
+    Params:
+        name: string - the name of the icon file without the extension. eg: "bin-icon"
+
+    Returns:
+        A `QIcon` of the `<name>.png` file
+    """
+    return QIcon(os.path.join(ASSETS_DIR, f"{name}.png"))
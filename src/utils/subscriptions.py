@@ -0,0 +1,95 @@
+from typing import Callable, Dict, Tuple
+
+from PyQt6.QtCore import QObject, QMetaObject
+
+
+def signalFanOut(sender: QObject, signalName: str) -> int:
+    """
+    A function that returns the number of slots a signal is connected to. Used to check for leaking connections.
+
+    Params:
+        sender: the QObject that owns the signal
+        signalName: string - the name of the signal. eg: "nodeDataChanged"
+
+    Returns:
+        The number of connections of the signal
+    """
+    return sender.receivers(getattr(sender, signalName))
+
+
+class SignalSubscriptions:
+    """
+    A class that keeps track of the signal connections an object makes, one connection per subscription key.
+
+    Subscribing again with a key replaces the old connection instead of adding another one,
+    and subscribing again to the same sender and slot is a no-op. That keeps the number of slots a signal
+    fans out to from growing every time an object is re-attached.
+    """
+
+    def __init__(self) -> None:
+        # subscription key to (sender, signal name, slot, connection) pairs
+        self._subscriptions: Dict[
+            str, Tuple[QObject, str, Callable, QMetaObject.Connection]
+        ] = {}
+
+    def subscribe(
+        self, key: str, sender: QObject, signalName: str, slot: Callable
+    ) -> bool:
+        """
+        A function that connects the signal of the sender to the slot under the given key.
+        Any other connection held under the key is disconnected first.
+
+        Params:
+            key: string - the name of the subscription. eg: "nodeDataChanged"
+            sender: the QObject that owns the signal
+            signalName: string - the name of the signal on the sender
+            slot: the callable to connect the signal to
+
+        Returns:
+            `True` if a new connection was made, `False` if the same subscription was already there
+        """
+        current = self._subscriptions.get(key)
+        if current is not None:
+            currentSender, currentSignalName, currentSlot, _ = current
+            if (
+                currentSender is sender
+                and currentSignalName == signalName
+                and currentSlot == slot
+            ):
+                return False
+            self.unsubscribe(key)
+
+        connection = getattr(sender, signalName).connect(slot)
+        self._subscriptions[key] = (sender, signalName, slot, connection)
+        return True
+
+    def unsubscribe(self, key: str) -> bool:
+        """
+        A function that disconnects the connection held under the given key
+
+        Returns:
+            `True` if there was a connection to disconnect, `False` otherwise
+        """
+        current = self._subscriptions.pop(key, None)
+        if current is None:
+            return False
+        sender, signalName, _, connection = current
+        try:
+            getattr(sender, signalName).disconnect(connection)
+        except (TypeError, RuntimeError):
+            # the connection or the sender is already gone
+            pass
+        return True
+
+    def unsubscribeAll(self) -> None:
+        """
+        A function that disconnects every connection held
+        """
+        for key in list(self._subscriptions.keys()):
+            self.unsubscribe(key)
+
+    def isSubscribed(self, key: str) -> bool:
+        return key in self._subscriptions
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)